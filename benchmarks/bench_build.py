@@ -0,0 +1,73 @@
+"""Compare the fused project graph builder with the two-pass pipeline.
+
+The toy project is copied many times side by side, each copy with its own
+package names, to get a large project with resolvable cross-module calls.
+
+Example:
+    python benchmarks/bench_build.py --copies 500
+
+"""
+
+import argparse
+import re
+import tempfile
+import time
+from pathlib import Path
+
+from byparse.project_crawl import ProjectCrawler
+
+TOY_PROJECT = Path(__file__).parent.parent / "tests" / "toy_project"
+TOP_LEVEL_NAMES = ("package", "scripts")
+
+
+def replicate_toy_project(destination: Path, copies: int):
+    for copy_index in range(copies):
+        for source_path in TOY_PROJECT.rglob("*.py"):
+            relative_path = source_path.relative_to(TOY_PROJECT)
+            top_level, *rest = relative_path.parts
+            target_path = Path(destination, f"{top_level}{copy_index}", *rest)
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+
+            source = source_path.read_text(encoding="utf8")
+            for name in TOP_LEVEL_NAMES:
+                source = re.sub(rf"\b{name}\b", f"{name}{copy_index}", source)
+            target_path.write_text(source, encoding="utf8")
+
+
+def best_time(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--copies", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        replicate_toy_project(Path(tmp_dir), args.copies)
+        project = ProjectCrawler(tmp_dir)
+
+        def two_passes():
+            graph = project.build_contexts_graph()
+            return project.build_call_graph(graph)
+
+        two_passes_time = best_time(two_passes, args.repeat)
+        fused_time = best_time(project.build_project_graph, args.repeat)
+        graph = project.build_project_graph()
+
+    print(
+        f"{len(project.modules)} modules, {graph.number_of_nodes()} nodes,"
+        f" {graph.number_of_edges()} edges"
+    )
+    print(f"two passes: {two_passes_time:.3f}s")
+    print(f"fused:      {fused_time:.3f}s ({two_passes_time / fused_time:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""Measure the memory used by byparse on synthetic projects of increasing size.
+
+Each phase of a run (`parse_project`, `build_contexts_graph`,
+`build_call_graph` and `export`) is traced with tracemalloc, giving its peak
+memory above the memory held when it started, and the memory it retained once
+done. Both are reported per module and per edge of the final graph.
+
+The benchmark fails if, for a phase, the bytes per module of the largest
+project exceed the ones of the smallest by more than `--max-scaling` times, as
+memory should grow linearly with the project, or if they exceed the ones of
+`memory_baseline.json` by more than its threshold. Allocations only depend on
+the Python and library versions, update the baseline with `--update-baseline`
+after upgrading them. Before Python 3.9, tracemalloc is restarted for each
+phase, which ignores what it frees of the memory allocated before it.
+
+Example:
+    python benchmarks/memory.py --sizes 100,200,400,800
+
+"""
+
+import argparse
+import gc
+import json
+import multiprocessing
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from synthetic import generate_project
+
+from byparse.exporters.cytoscape_json import write_cytoscape_json
+from byparse.path_resolvers.imports import resolve_installed_path
+from byparse.project_crawl import ProjectCrawler
+
+BASELINE_PATH = Path(__file__).parent / "memory_baseline.json"
+DEFAULT_THRESHOLD = 0.1
+DEFAULT_MAX_SCALING = 1.5
+# Phases allocating less than this per module are too small to be compared
+MIN_BYTES_PER_MODULE = 1024
+PHASES = ("parse_project", "build_contexts_graph", "build_call_graph", "export")
+
+
+class PhaseTracer:
+    """Peak and retained memory of successive phases, traced with tracemalloc."""
+
+    def __init__(self) -> None:
+        self.memory: Dict[str, Dict[str, int]] = {}
+
+    def __enter__(self):
+        gc.collect()
+        tracemalloc.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        tracemalloc.stop()
+
+    def run(self, name: str, function, *args):
+        gc.collect()
+        if hasattr(tracemalloc, "reset_peak"):
+            start, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+        else:
+            # Python < 3.9, memory allocated before the phase is no longer traced,
+            # so the memory it frees is not subtracted from the retained memory
+            tracemalloc.stop()
+            tracemalloc.start()
+            start = 0
+        result = function(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        gc.collect()
+        end, _ = tracemalloc.get_traced_memory()
+        self.memory[name] = {"peak": peak - start, "retained": end - start}
+        return result
+
+
+def measure(root: Path, output: Path) -> Tuple[int, int, Dict[str, Dict[str, int]]]:
+    """Numbers of modules and edges of a project and the memory of each phase."""
+    resolve_installed_path.cache_clear()
+    with PhaseTracer() as tracer:
+        project = tracer.run("parse_project", ProjectCrawler, str(root))
+        graph = tracer.run("build_contexts_graph", project.build_contexts_graph)
+        graph = tracer.run("build_call_graph", project.build_call_graph, graph)
+        tracer.run("export", write_cytoscape_json, graph, output)
+    return len(project.modules), graph.number_of_edges(), tracer.memory
+
+
+def measure_size(tmp_dir: Path, size: int, depth: int, fanout: int) -> dict:
+    """Memory of each phase on a synthetic project of the given size."""
+    output = tmp_dir / "graph.json"
+    # One-time allocations, as imported modules, would count in the first run
+    warm_up_root = tmp_dir / f"warm_up_{size}"
+    generate_project(warm_up_root, modules=10, depth=depth)
+    measure(warm_up_root, output)
+
+    root = tmp_dir / f"synthetic_{size}"
+    generate_project(root, modules=size, depth=depth, fanout=fanout)
+    modules, edges, memory = measure(root, output)
+    return {
+        "modules": modules,
+        "edges": edges,
+        "memory": memory,
+        "phases": per_unit(modules, edges, memory),
+    }
+
+
+def per_unit(modules: int, edges: int, memory: Dict[str, Dict[str, int]]) -> dict:
+    return {
+        name: {
+            "peak_per_module": values["peak"] / modules,
+            "retained_per_module": values["retained"] / modules,
+            "peak_per_edge": values["peak"] / edges if edges else 0.0,
+            "retained_per_edge": values["retained"] / edges if edges else 0.0,
+        }
+        for name, values in memory.items()
+    }
+
+
+def check_scaling(results: Dict[str, dict], max_scaling: float) -> List[str]:
+    """Phases whose peak bytes per module grow too much with the project size."""
+    sizes = sorted(results, key=lambda size: results[size]["modules"])
+    if len(sizes) < 2:
+        return []
+    smallest, largest = results[sizes[0]], results[sizes[-1]]
+    failures = []
+    for name in PHASES:
+        small = smallest["phases"][name]["peak_per_module"]
+        large = largest["phases"][name]["peak_per_module"]
+        if small >= MIN_BYTES_PER_MODULE and large > small * max_scaling:
+            failures.append(
+                f"{name}: {large:.0f} peak bytes per module for"
+                f" {largest['modules']} modules, {small:.0f} for"
+                f" {smallest['modules']} modules"
+            )
+    return failures
+
+
+def check_baseline(results: Dict[str, dict], baseline: dict) -> List[str]:
+    """Phases using more bytes per module than their baseline plus threshold."""
+    threshold = baseline.get("threshold", DEFAULT_THRESHOLD)
+    failures = []
+    for size, result in results.items():
+        size_baseline = baseline.get("sizes", {}).get(size)
+        if size_baseline is None:
+            continue
+        for name, phase_baseline in size_baseline["phases"].items():
+            for key in ("peak_per_module", "retained_per_module"):
+                value = result["phases"][name][key]
+                expected = phase_baseline[key]
+                too_small = expected < MIN_BYTES_PER_MODULE
+                if not too_small and value > expected * (1 + threshold):
+                    failures.append(
+                        f"{name} on {size} modules: {value:.0f} {key},"
+                        f" baseline {expected:.0f}"
+                    )
+    return failures
+
+
+def print_results(results: Dict[str, dict]):
+    for size, result in results.items():
+        print(
+            f"\n{size} modules: {result['modules']} crawled,"
+            f" {result['edges']} edges"
+        )
+        print(
+            f"{'phase':<22}{'peak (MB)':>11}{'kept (MB)':>11}"
+            f"{'peak/module':>13}{'kept/module':>13}{'peak/edge':>11}"
+        )
+        for name, values in result["phases"].items():
+            memory = result["memory"][name]
+            print(
+                f"{name:<22}{memory['peak'] / 1e6:>11.1f}"
+                f"{memory['retained'] / 1e6:>11.1f}"
+                f"{values['peak_per_module']:>13.0f}"
+                f"{values['retained_per_module']:>13.0f}"
+                f"{values['peak_per_edge']:>11.0f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        help="Comma separated numbers of modules of the synthetic projects.",
+        default="100,200,400,800",
+    )
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--fanout", type=int, default=5)
+    parser.add_argument("--max-scaling", type=float, default=DEFAULT_MAX_SCALING)
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument(
+        "--update-baseline",
+        help="Save the results as the new baseline instead of comparing them.",
+        action="store_true",
+    )
+    parser.add_argument("--output", help="Also save the results as JSON there.")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in (int(size) for size in args.sizes.split(",") if size):
+            # Interpreter tables, as the one of interned strings, only grow, a
+            # new process keeps the results from depending on the previous runs
+            with multiprocessing.Pool(1) as pool:
+                results[str(size)] = pool.apply(
+                    measure_size, (Path(tmp_dir), size, args.depth, args.fanout)
+                )
+
+    if args.output is not None:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf8")
+    print_results(results)
+
+    baseline_path = Path(args.baseline)
+    baseline = {}
+    if baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text(encoding="utf8"))
+    failures = check_scaling(results, args.max_scaling)
+
+    if args.update_baseline:
+        baseline = {
+            "threshold": baseline.get("threshold", DEFAULT_THRESHOLD),
+            "sizes": {**baseline.get("sizes", {}), **results},
+        }
+        baseline_path.write_text(json.dumps(baseline, indent=2) + "\n", encoding="utf8")
+        print(f"\nBaseline saved to {baseline_path}")
+    else:
+        failures += check_baseline(results, baseline)
+
+    if failures:
+        print()
+        for failure in failures:
+            print(f"Memory regression, {failure}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
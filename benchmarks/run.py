@@ -0,0 +1,210 @@
+"""Benchmark byparse on synthetic projects and on the standard library.
+
+Each corpus is crawled, built into a graph and exported `--repeat` times in
+this process, the cache of installed packages being cleared before each run,
+and the fastest time of each phase is kept. Throughputs in modules per second
+are compared to `baseline.json`: the benchmark fails if a phase is slower than
+its baseline by more than the baseline threshold. Phases too short to be
+measured reliably, under `min_seconds` in the baseline, are not compared.
+
+Baselines depend on the machine, update them on the machine running the
+benchmark with `--update-baseline`.
+
+Example:
+    python benchmarks/run.py --sizes 200,1000 --repeat 3
+    python benchmarks/run.py --no-stdlib --update-baseline
+
+"""
+
+import argparse
+import json
+import sysconfig
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from synthetic import generate_project
+
+from byparse.exporters.cytoscape_json import write_cytoscape_json
+from byparse.graphs.level_of_detail import aggregate_graph
+from byparse.path_resolvers.imports import resolve_installed_path
+from byparse.profiling import phase, recording
+from byparse.project_crawl import ProjectCrawler
+from byparse.visualisation.graph_vis import color_context_graph, compute_parents
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+DEFAULT_THRESHOLD = 0.3
+DEFAULT_MIN_SECONDS = 0.05
+
+# Folders of the standard library that are not part of the library itself
+STDLIB_EXCLUDE = ["test", "tests", "idlelib", "lib2to3", "site-packages", "__pycache__"]
+
+
+def build_and_export(root: Path, exclude: Optional[List[str]], output: Path):
+    project = ProjectCrawler(str(root), exclude=exclude)
+    graph = project.build_project_graph()
+    with phase("aggregate"):
+        graph = aggregate_graph(graph, "function")
+        color_context_graph(graph)
+        compute_parents(graph)
+    with phase("export"):
+        write_cytoscape_json(graph, output)
+
+
+def measure(
+    root: Path, exclude: Optional[List[str]], output: Path, repeat: int
+) -> Tuple[int, Dict[str, float]]:
+    """Number of modules of a corpus and the best seconds of each phase.
+
+    Phases times exclude the ones of the phases they contain, 'total' is the
+    time of the whole run.
+
+    """
+    best: Dict[str, float] = {}
+    modules = 0
+    for _ in range(repeat):
+        resolve_installed_path.cache_clear()
+        with recording() as report:
+            build_and_export(root, exclude, output)
+        modules = report.counts["modules"]
+        seconds = {
+            name: stats.to_dict()["self_wall_seconds"]
+            for name, stats in report.phases.items()
+        }
+        seconds["total"] = report.total_wall
+        for name, value in seconds.items():
+            best[name] = min(best.get(name, value), value)
+    return modules, best
+
+
+def compare(
+    results: Dict[str, dict], baseline: dict
+) -> List[Tuple[str, str, float, float]]:
+    """Phases slower than their baseline by more than the threshold.
+
+    Returns:
+        List[Tuple[str, str, float, float]]: Corpus, phase, throughput and
+            baseline throughput of each regression.
+
+    """
+    threshold = baseline.get("threshold", DEFAULT_THRESHOLD)
+    min_seconds = baseline.get("min_seconds", DEFAULT_MIN_SECONDS)
+    regressions = []
+    for corpus, result in results.items():
+        corpus_baseline = baseline.get("corpora", {}).get(corpus)
+        if corpus_baseline is None:
+            continue
+        for name, phase_baseline in corpus_baseline["phases"].items():
+            if name not in result["phases"] or phase_baseline["seconds"] < min_seconds:
+                continue
+            throughput = result["phases"][name]["modules_per_second"]
+            expected = phase_baseline["modules_per_second"]
+            if throughput < expected * (1 - threshold):
+                regressions.append((corpus, name, throughput, expected))
+    return regressions
+
+
+def print_results(results: Dict[str, dict], baseline: dict):
+    corpora_baseline = baseline.get("corpora", {})
+    for corpus, result in results.items():
+        print(f"\n{corpus}: {result['modules']} modules")
+        print(f"{'phase':<20}{'seconds':>10}{'modules/s':>12}{'baseline':>12}")
+        phases_baseline = corpora_baseline.get(corpus, {}).get("phases", {})
+        for name, measures in result["phases"].items():
+            expected = phases_baseline.get(name, {}).get("modules_per_second")
+            expected = "-" if expected is None else f"{expected:.0f}"
+            print(
+                f"{name:<20}{measures['seconds']:>10.3f}"
+                f"{measures['modules_per_second']:>12.0f}{expected:>12}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        help="Comma separated numbers of modules of the synthetic projects.",
+        default="200,1000",
+    )
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--fanout", type=int, default=5)
+    parser.add_argument("--reexport", type=float, default=0.3)
+    parser.add_argument("--calls", type=int, default=4)
+    parser.add_argument(
+        "--no-stdlib",
+        help="Do not benchmark the standard library of this interpreter.",
+        action="store_true",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument(
+        "--update-baseline",
+        help="Save the results as the new baseline instead of comparing them.",
+        action="store_true",
+    )
+    parser.add_argument("--output", help="Also save the results as JSON there.")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpora = {}
+        for size in (int(size) for size in args.sizes.split(",") if size):
+            root = Path(tmp_dir, f"synthetic_{size}")
+            generate_project(
+                root,
+                modules=size,
+                depth=args.depth,
+                fanout=args.fanout,
+                reexport=args.reexport,
+                calls=args.calls,
+            )
+            corpora[f"synthetic-{size}"] = (root, None)
+        if not args.no_stdlib:
+            corpora["stdlib"] = (Path(sysconfig.get_paths()["stdlib"]), STDLIB_EXCLUDE)
+
+        output = Path(tmp_dir, "graph.json")
+        for corpus, (root, exclude) in corpora.items():
+            modules, seconds = measure(root, exclude, output, args.repeat)
+            results[corpus] = {
+                "modules": modules,
+                "phases": {
+                    name: {
+                        "seconds": value,
+                        "modules_per_second": modules / value if value else 0.0,
+                    }
+                    for name, value in seconds.items()
+                },
+            }
+
+    if args.output is not None:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf8")
+
+    baseline_path = Path(args.baseline)
+    baseline = {}
+    if baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text(encoding="utf8"))
+    print_results(results, baseline)
+
+    if args.update_baseline:
+        baseline = {
+            "threshold": baseline.get("threshold", DEFAULT_THRESHOLD),
+            "min_seconds": baseline.get("min_seconds", DEFAULT_MIN_SECONDS),
+            "corpora": {**baseline.get("corpora", {}), **results},
+        }
+        baseline_path.write_text(json.dumps(baseline, indent=2) + "\n", encoding="utf8")
+        print(f"\nBaseline saved to {baseline_path}")
+        return
+
+    regressions = compare(results, baseline)
+    if regressions:
+        print()
+        for corpus, name, throughput, expected in regressions:
+            print(
+                f"Regression on {corpus} {name}: {throughput:.0f} modules/s,"
+                f" baseline {expected:.0f} modules/s"
+            )
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
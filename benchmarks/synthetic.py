@@ -0,0 +1,166 @@
+"""Generate synthetic projects shaped like real ones, to benchmark byparse at scale.
+
+Modules are spread over a tree of packages, each package `__init__.py`
+re-exporting the first function of every module below it, so that names
+imported from a package go through a chain of re-exports as deep as the package.
+Every module imports names from `fanout` other modules, either from their
+module or through the re-exports of the top package, and its functions and
+methods make `calls` calls each to local, imported and standard library names.
+
+Example:
+    python benchmarks/synthetic.py /tmp/synth --modules 2000 --depth 4
+
+"""
+
+import argparse
+import random
+from pathlib import Path
+from typing import Dict, List, Union
+
+TOP_PACKAGE = "synth"
+
+
+def packages_tree(depth: int, branching: int = 2) -> List[List[str]]:
+    """Packages as lists of names, from the top package to the deepest ones."""
+    packages = [[TOP_PACKAGE]]
+    level = [[TOP_PACKAGE]]
+    for level_index in range(1, depth):
+        level = [
+            parent + [f"p{level_index}_{index}_{child}"]
+            for index, parent in enumerate(level)
+            for child in range(branching)
+        ]
+        packages.extend(level)
+    return packages
+
+
+def generate_project(
+    destination: Union[str, Path],
+    modules: int = 100,
+    depth: int = 3,
+    fanout: int = 5,
+    reexport: float = 0.3,
+    calls: int = 4,
+    functions: int = 5,
+    seed: int = 0,
+) -> Dict[str, int]:
+    """Write a synthetic project in a folder.
+
+    Args:
+        destination (Union[str, Path]): Folder of the project, created if needed.
+        modules (int): Number of modules, besides the packages `__init__.py`.
+        depth (int): Depth of the packages tree, each package having two
+            subpackages until this depth.
+        fanout (int): Number of other modules each module imports a name from.
+        reexport (float): Share of the imported names imported from the top
+            package, resolved through the chain of `__init__.py` re-exports.
+        calls (int): Number of calls in each function and method.
+        functions (int): Number of functions in each module, besides one class
+            with two methods.
+        seed (int): Seed of the random choices.
+
+    Returns:
+        Dict[str, int]: Number of modules, packages and lines written.
+
+    """
+    rng = random.Random(seed)
+    destination = Path(destination)
+    packages = packages_tree(depth)
+    modules_packages = [packages[rng.randrange(len(packages))] for _ in range(modules)]
+
+    def module_chain(index: int) -> str:
+        return ".".join(modules_packages[index] + [f"m{index}"])
+
+    # Package re-exports of the first function of every module below them
+    reexports: Dict[tuple, List[str]] = {tuple(package): [] for package in packages}
+    for index, package in enumerate(modules_packages):
+        source = module_chain(index)
+        for level in range(len(package), 0, -1):
+            reexports[tuple(package[:level])].append(
+                f"from {source} import f{index}_0\n"
+            )
+            source = ".".join(package[:level])
+
+    n_lines = 0
+    for package, lines in reexports.items():
+        folder = destination.joinpath(*package)
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / "__init__.py").write_text("".join(lines), encoding="utf8")
+        n_lines += len(lines)
+
+    for index in range(modules):
+        others = rng.sample(range(modules), min(fanout + 1, modules))
+        others = [other for other in others if other != index][:fanout]
+        imported = []
+        lines = ["import json\n", "import os\n"]
+        for other in others:
+            if rng.random() < reexport:
+                name = f"f{other}_0"
+                lines.append(f"from {TOP_PACKAGE} import {name}\n")
+            else:
+                name = rng.choice([f"f{other}_{rng.randrange(functions)}", f"C{other}"])
+                lines.append(f"from {module_chain(other)} import {name}\n")
+            imported.append(name)
+        local = [f"f{index}_{function}" for function in range(functions)]
+        classes = [name for name in imported if name.startswith("C")]
+
+        def body(indent: str, exclude: str) -> List[str]:
+            candidates = imported + [name for name in local if name != exclude]
+            body_lines = [f"{indent}result = value\n"]
+            for _ in range(calls):
+                kind = rng.random()
+                if kind < 0.15:
+                    call = "json.dumps"
+                elif kind < 0.2:
+                    call = "os.path.join"
+                elif kind < 0.25:
+                    call = "result.copy"
+                else:
+                    call = rng.choice(candidates) if candidates else "json.dumps"
+                body_lines.append(f"{indent}result = {call}(result)\n")
+            body_lines.append(f"{indent}return result\n")
+            return body_lines
+
+        base = f"({classes[0]})" if classes else ""
+        lines.append(f"\n\nclass C{index}{base}:\n")
+        lines.append("    def run(self, value):\n")
+        lines.append(f"        return self.helper(f{index}_0(value))\n\n")
+        lines.append("    def helper(self, value):\n")
+        lines.extend(body(" " * 8, ""))
+        for name in local:
+            lines.append(f"\n\ndef {name}(value):\n")
+            lines.extend(body(" " * 4, name))
+
+        folder = destination.joinpath(*modules_packages[index])
+        (folder / f"m{index}.py").write_text("".join(lines), encoding="utf8")
+        n_lines += sum(line.count("\n") for line in lines)
+
+    return {"modules": modules, "packages": len(packages), "lines": n_lines}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("destination")
+    parser.add_argument("--modules", type=int, default=100)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--fanout", type=int, default=5)
+    parser.add_argument("--reexport", type=float, default=0.3)
+    parser.add_argument("--calls", type=int, default=4)
+    parser.add_argument("--functions", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sizes = generate_project(
+        args.destination,
+        modules=args.modules,
+        depth=args.depth,
+        fanout=args.fanout,
+        reexport=args.reexport,
+        calls=args.calls,
+        functions=args.functions,
+        seed=args.seed,
+    )
+    print(", ".join(f"{value} {name}" for name, value in sizes.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -38,6 +38,45 @@ let defaultStylesheet =  [
 			'target-arrow-color': 'data(color)',
 		}
 	},
+	{
+		'selector': 'edge[weight]',
+		'style': {
+			'width': 'mapData(weight, 1, 50, 1, 10)',
+		}
+	},
+	{
+		selector: 'node[diff = "added"]',
+		style: {
+			'border-color': '#22aa22',
+			'border-width': 4
+		}
+	},
+	{
+		selector: 'node[diff = "removed"]',
+		style: {
+			'border-color': '#dd2222',
+			'border-width': 4,
+			'border-style': 'dashed',
+			'background-opacity': 0.3
+		}
+	},
+	{
+		selector: 'edge[diff = "added"]',
+		style: {
+			'line-color': '#22aa22',
+			'target-arrow-color': '#22aa22',
+			'width': 4
+		}
+	},
+	{
+		selector: 'edge[diff = "removed"]',
+		style: {
+			'line-color': '#dd2222',
+			'target-arrow-color': '#dd2222',
+			'line-style': 'dashed',
+			'width': 4
+		}
+	},
 	{
 		selector: 'node:selected',
 		style: {
@@ -219,4 +258,51 @@ document.getElementById("fcoseButton").addEventListener("click", function(){
 
 cy.ready( function(event){
 	// do stuff here if you want
-});
\ No newline at end of file
+});
+// Sharded graphs, exported with `--format sharded`, are loaded on demand:
+// open demo-constraint.html?graph=path/to/export/ from a web server,
+// the overview is loaded first and a folder shard when its folder is tapped.
+let shardedRoot = new URLSearchParams(window.location.search).get("graph");
+let loadedShards = new Set();
+let pendingEdges = [];
+
+function addNewElements(elements) {
+	let newElements = elements.filter(element => cy.getElementById(element.data.id).empty());
+	// Edges to shards that are not loaded yet are kept for later
+	let added = cy.add(newElements.filter(element => !element.data.source));
+	for (let edge of newElements.filter(element => element.data.source)) {
+		if (cy.getElementById(edge.data.source).nonempty() && cy.getElementById(edge.data.target).nonempty()) {
+			added = added.union(cy.add(edge));
+		} else {
+			pendingEdges.push(edge);
+		}
+	}
+	return added;
+}
+
+function loadShard(shardPath) {
+	if (loadedShards.has(shardPath)) {
+		return Promise.resolve();
+	}
+	loadedShards.add(shardPath);
+	let crossPath = shardPath.replace(/\.json$/, ".cross.json");
+	return Promise.all([
+		fetch(shardedRoot + shardPath).then(response => response.json()),
+		fetch(shardedRoot + crossPath).then(response => response.json())
+	]).then(([shard, cross]) => {
+		let waitingEdges = pendingEdges;
+		pendingEdges = [];
+		let added = addNewElements(shard.nodes.concat(shard.edges, waitingEdges, cross.edges));
+		added.layout({name: 'fcose', randomize: false, fit: false}).run();
+	});
+}
+
+if (shardedRoot) {
+	if (!shardedRoot.endsWith("/")) {
+		shardedRoot += "/";
+	}
+	loadShard("overview.json");
+	cy.on("tap", "node[shard]", function (event) {
+		loadShard(event.target.data("shard"));
+	});
+}
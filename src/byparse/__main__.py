@@ -1,28 +1,107 @@
 import argparse
-import json
 import os
+import sys
 from pathlib import Path
 
-from byparse.visualisation.graph_vis import (
-    color_context_graph,
-    compute_parents_and_childs,
-)
-from byparse.project_crawl import ProjectCrawler
-from byparse.logging_utils import init_logger
-from byparse.visualisation.cytoscape_fcose import (
-    networkx_to_cytoscape_fcose,
-    networkx_to_cytoscape_fcose_constraints,
-)
+from byparse.abc import LEVELS, EdgeType
+from byparse.logging_utils import init_logger, set_trace_sampling
 
+# Commands import what they use, so that short invocations start quickly
+
+
+def add_project_arguments(parser: argparse.ArgumentParser, defaults: bool = True):
+    """Arguments selecting the project to parse, shared by all commands.
+
+    Subcommands are parsed after the main parser, so their arguments do not set
+    defaults that would override the ones given before the subcommand.
+
+    """
+
+    def default(value):
+        return value if defaults else argparse.SUPPRESS
 
-def cli_parser():
-    parser = argparse.ArgumentParser()
     parser.add_argument(
         "--root",
         "-r",
         help="Root directory of the project to parse. Defaults to toy_project.",
-        default="tests/integration/toy_project",
+        default=default("tests/integration/toy_project"),
+    )
+    parser.add_argument(
+        "--exclude",
+        "-x",
+        help="Ignored folders.",
+        default=default(None),
+    )
+    parser.add_argument(
+        "--log-level",
+        "-v",
+        help="Logging level. (DEBUG <= 10, INFO <= 20, WARNING <= 30)",
+        default=default(20),
+        type=int,
+    )
+    parser.add_argument(
+        "--trace-resolution",
+        help="Log at INFO level this share, between 0 and 1, of the name"
+        " resolutions with their candidates, to debug them on big projects.",
+        default=default(0.0),
+        type=sampling_rate,
+    )
+    parser.add_argument(
+        "--report",
+        help="Write a JSON report of the time, memory and counts of each phase.",
+        default=default(None),
+    )
+    parser.add_argument(
+        "--profile",
+        help="Profile the run with cProfile, writing its statistics at this path"
+        " and their collapsed stacks next to it, for flamegraphs.",
+        default=default(None),
+    )
+    parser.add_argument(
+        "--stats",
+        help="Print the time of each phase, the resolution counters and the"
+        " caches hit ratios at the end of the run.",
+        action="store_true",
+        default=default(False),
+    )
+
+
+def add_graph_argument(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--graph",
+        "-g",
+        help="Saved graph to analyse (.bpg, .db, .json, .ndjson)"
+        " instead of parsing the project root.",
+        default=None,
     )
+
+
+def sampling_rate(value: str) -> float:
+    """Share between 0 and 1, as given to `--trace-resolution`."""
+    try:
+        rate = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid rate {value}") from None
+    if not 0 <= rate <= 1:
+        raise argparse.ArgumentTypeError(f"Rate {value} is not between 0 and 1")
+    return rate
+
+
+def edge_types_list(value: str):
+    """Comma separated edge types, as given to `--edge-types`."""
+    edge_types = [edge_type.strip().upper() for edge_type in value.split(",")]
+    for edge_type in edge_types:
+        if edge_type not in EdgeType.__members__:
+            raise argparse.ArgumentTypeError(
+                f"Unknown edge type {edge_type},"
+                f" expected some of {', '.join(EdgeType.__members__)}"
+            )
+    return edge_types
+
+
+def cli_parser():
+    parser = argparse.ArgumentParser()
+    add_project_arguments(parser)
     parser.add_argument(
         "--output",
         "-o",
@@ -30,44 +109,711 @@ def cli_parser():
         default=None,
     )
     parser.add_argument(
-        "--exclude",
-        "-x",
-        help="Ignored folders.",
+        "--format",
+        "-f",
+        help="Format of the exported graph."
+        " 'sharded' writes a directory with one file per folder,"
+        " 'csv' a directory with nodes.csv and edges.csv.",
+        choices=("json", "ndjson", "sharded", "graphml", "dot", "csv"),
+        default="json",
+    )
+    parser.add_argument(
+        "--indent",
+        help="Indentation of the exported json. Compact if not given.",
         default=None,
+        type=int,
     )
     parser.add_argument(
-        "--log-level",
-        "-v",
-        help="Logging level. (DEBUG <= 10, INFO <= 20, WARNING <= 30)",
+        "--gzip",
+        "-z",
+        help="Compress the exported graph using gzip.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--level",
+        "-l",
+        help="Level of detail of the exported graph.",
+        choices=LEVELS,
+        default="function",
+    )
+    parser.add_argument(
+        "--layout",
+        help="Compute nodes positions instead of leaving the layout to the viewer."
+        " Requires numpy.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--snapshot",
+        help="Also save the graph as a binary snapshot (.bpg) at this path.",
+        default=None,
+    )
+    parser.add_argument(
+        "--sqlite",
+        help="Build the graph into this SQLite database instead of exporting it.",
+        default=None,
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+    report_parser = subparsers.add_parser(
+        "report", help="Write the graph as a single offline HTML file."
+    )
+    add_project_arguments(report_parser, defaults=False)
+    # Not to override the values given before the subcommand
+    report_parser.add_argument(
+        "--output",
+        "-o",
+        help="Output HTML file. Defaults to examples_graphs/<root name>.html.",
+        default=argparse.SUPPRESS,
+    )
+    report_parser.add_argument(
+        "--level",
+        "-l",
+        help="Level of detail of the reported graph.",
+        choices=LEVELS,
+        default=argparse.SUPPRESS,
+    )
+    report_parser.add_argument(
+        "--layout",
+        help="Compute nodes positions with forces instead of only packing them"
+        " in the browser. Requires numpy.",
+        action="store_true",
+        default=argparse.SUPPRESS,
+    )
+
+    diff_parser = subparsers.add_parser(
+        "diff",
+        help="Compare two graphs, given as snapshots (.bpg), SQLite stores,"
+        " cytoscape json or ndjson exports, or project directories.",
+    )
+    diff_parser.add_argument("old", help="Graph before the changes.")
+    diff_parser.add_argument("new", help="Graph after the changes.")
+    diff_parser.add_argument(
+        "--output",
+        "-o",
+        help="Write the added and removed nodes and edges to this json file.",
+        default=None,
+    )
+    diff_parser.add_argument(
+        "--highlight",
+        help="Write the new graph with the changes highlighted as cytoscape json.",
+        default=None,
+    )
+
+    query_parser = subparsers.add_parser(
+        "query", help="Find callers, callees or dependency paths of symbols."
+    )
+    add_project_arguments(query_parser, defaults=False)
+    add_graph_argument(query_parser)
+    query_parser.add_argument(
+        "relation",
+        help="'callers' or 'callees' of the node, or dependency 'path'"
+        " from the node to the target.",
+        choices=("callers", "callees", "path"),
+    )
+    query_parser.add_argument(
+        "node", help="Node id, as 'package/module.py>Class>method'."
+    )
+    query_parser.add_argument("target", help="Target of the path.", nargs="?")
+    query_parser.add_argument(
+        "--depth",
+        "-d",
+        help="Maximum depth of transitive callers or callees, 0 for no limit.",
+        default=1,
+        type=int,
+    )
+
+    impact_parser = subparsers.add_parser(
+        "impact", help="List the tests using changed files, folders or nodes."
+    )
+    add_project_arguments(impact_parser, defaults=False)
+    add_graph_argument(impact_parser)
+    impact_parser.add_argument(
+        "--changed",
+        "-c",
+        help="Changed files, folders or node ids, relative to the project root.",
+        nargs="+",
+        required=True,
+    )
+    impact_parser.add_argument(
+        "--select",
+        "-s",
+        help="Path prefix of the test files.",
+        default="tests/",
+    )
+    impact_parser.add_argument(
+        "--index",
+        help="Load the precomputed impact index from this file (.json.gz),"
+        " computing and saving it there if it does not exist.",
+        default=None,
+    )
+
+    cycles_parser = subparsers.add_parser(
+        "cycles", help="Find module dependency cycles and function call cycles."
+    )
+    add_project_arguments(cycles_parser, defaults=False)
+    add_graph_argument(cycles_parser)
+    cycles_parser.add_argument(
+        "--kind",
+        "-k",
+        help="Cycles of module dependencies, of function calls, or both.",
+        choices=("import", "call", "all"),
+        default="all",
+    )
+
+    dead_code_parser = subparsers.add_parser(
+        "dead-code",
+        help="List the classes and functions no entry point can reach.",
+    )
+    add_project_arguments(dead_code_parser, defaults=False)
+    add_graph_argument(dead_code_parser)
+    dead_code_parser.add_argument(
+        "--entry",
+        "-e",
+        help="Entry points files, folders or node ids, relative to the project root."
+        " Tests, '__main__.py' modules and module level code always are.",
+        nargs="*",
+        default=[],
+    )
+    dead_code_parser.add_argument(
+        "--tests",
+        help="Path prefix of the test files.",
+        default="tests/",
+    )
+
+    metrics_parser = subparsers.add_parser(
+        "metrics",
+        help="Compute fan-in, fan-out, PageRank and betweenness of every node.",
+    )
+    add_project_arguments(metrics_parser, defaults=False)
+    add_graph_argument(metrics_parser)
+    metrics_parser.add_argument(
+        "--edge-types",
+        "-t",
+        help="Comma separated types of the uses edges.",
+        type=edge_types_list,
+        default=[EdgeType.CALL.name],
+    )
+    metrics_parser.add_argument(
+        "--samples",
+        "-s",
+        help="Number of sources sampled to estimate betweenness, 0 to use all.",
+        default=32,
+        type=int,
+    )
+    metrics_parser.add_argument(
+        "--output",
+        "-o",
+        help="Write the metrics of every node to this CSV file.",
+        default=None,
+    )
+    metrics_parser.add_argument(
+        "--top",
+        help="Number of nodes printed, highest PageRank first.",
         default=20,
         type=int,
     )
+
+    focus_parser = subparsers.add_parser(
+        "focus",
+        help="Export the neighborhood of a node and its containers to cytoscape.",
+    )
+    add_project_arguments(focus_parser, defaults=False)
+    add_graph_argument(focus_parser)
+    focus_parser.add_argument("node", help="Id of the focused node.")
+    focus_parser.add_argument(
+        "--hops",
+        "-k",
+        help="Maximum number of edges between the focused node and the others.",
+        default=1,
+        type=int,
+    )
+    focus_parser.add_argument(
+        "--edge-types",
+        "-t",
+        help="Comma separated types of the followed edges."
+        " Defaults to CALL,INHERITANCE,TYPEHINT.",
+        type=edge_types_list,
+        default=None,
+    )
+    focus_parser.add_argument(
+        "--output",
+        "-o",
+        help="Path of the cytoscape json file to write.",
+        default=None,
+    )
+    focus_parser.add_argument(
+        "--indent",
+        help="Indent the json files instead of writing them compactly.",
+        default=None,
+        type=int,
+    )
+
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Keep project graphs in memory and answer queries over HTTP.",
+    )
+    add_project_arguments(serve_parser, defaults=False)
+    serve_parser.add_argument(
+        "--host", help="Interface to listen on.", default="127.0.0.1"
+    )
+    serve_parser.add_argument(
+        "--port", "-p", help="TCP port to listen on.", default=8765, type=int
+    )
+    serve_parser.add_argument(
+        "--socket",
+        help="Listen on this Unix socket instead of a TCP port.",
+        default=None,
+    )
+    serve_parser.add_argument(
+        "--interval",
+        help="Seconds between checks for changed files, 0 to only check on /refresh.",
+        default=1.0,
+        type=float,
+    )
+    serve_parser.add_argument(
+        "--max-elements",
+        help="Maximum total of nodes and edges of the projects kept in memory.",
+        default=5_000_000,
+        type=int,
+    )
+
+    batch_parser = subparsers.add_parser(
+        "batch",
+        help="Export many projects in one process, sharing resolution caches.",
+    )
+    add_project_arguments(batch_parser, defaults=False)
+    batch_parser.add_argument(
+        "projects",
+        help="File listing the projects roots, one per line,"
+        " relative to its folder. Lines starting with '#' are ignored.",
+    )
+    batch_parser.add_argument(
+        "--output-dir",
+        "-d",
+        help="Folder of the exported graphs, one per project named after its root.",
+        default="examples_graphs",
+    )
+    batch_parser.add_argument(
+        "--jobs",
+        "-j",
+        help="Number of worker processes, each crawling its share of the projects.",
+        default=1,
+        type=int,
+    )
+    batch_parser.add_argument(
+        "--snapshots",
+        help="Also save each graph as a binary snapshot in the output folder.",
+        action="store_true",
+    )
     return parser.parse_args()
 
 
 def main():
+    from byparse.profiling import profile_run
+
     args = cli_parser()
     init_logger(log_level=args.log_level, package_name=__package__)
+    if args.trace_resolution:
+        set_trace_sampling(args.trace_resolution)
+    with profile_run(args.report, args.profile, summary=args.stats):
+        run(args)
+
+
+def run(args: argparse.Namespace):
+    if args.command == "diff":
+        diff(args)
+        return
+    if args.command == "query":
+        query(args)
+        return
+    if args.command == "impact":
+        impact(args)
+        return
+    if args.command == "cycles":
+        cycles(args)
+        return
+    if args.command == "dead-code":
+        dead_code(args)
+        return
+    if args.command == "metrics":
+        metrics(args)
+        return
+    if args.command == "focus":
+        focus(args)
+        return
+    if args.command == "serve":
+        serve(args)
+        return
+    if args.command == "report":
+        report(args)
+        return
+    if args.command == "batch":
+        batch(args)
+        return
+    export(args)
+
+
+def export(args: argparse.Namespace):
+    from byparse.graphs.level_of_detail import aggregate_graph
+    from byparse.profiling import count, phase
+    from byparse.project_crawl import ProjectCrawler
+    from byparse.stores.snapshot import write_snapshot
+    from byparse.stores.sqlite_store import SqliteGraphStore
+    from byparse.visualisation.graph_vis import color_context_graph, compute_parents
+
     project = ProjectCrawler(args.root, exclude=args.exclude)
-    graph = project.build_contexts_graph()
-    graph = project.build_call_graph(graph)
+
+    if args.sqlite is not None:
+        with SqliteGraphStore(args.sqlite, mode="w") as store:
+            project.build_project_graph(store)
+        return
+
+    graph = project.build_project_graph()
+    count("nodes", graph.number_of_nodes())
+    count("edges", graph.number_of_edges())
+
+    if args.snapshot is not None:
+        with phase("snapshot"):
+            write_snapshot(graph, args.snapshot)
 
     output = args.output
     if args.output is None:
-        output = Path("examples_graphs", f"{Path(args.root).name}.json")
+        output = export_output(args, Path(args.root).name)
         os.makedirs(output.parent, exist_ok=True)
         output = str(output)
 
+    with phase("aggregate"):
+        graph = aggregate_graph(graph, args.level)
+        color_context_graph(graph)
+        hierarchy = compute_parents(graph)
+
+    if args.layout:
+        from byparse.visualisation.layout import compute_compound_layout
+
+        with phase("layout"):
+            compute_compound_layout(graph, hierarchy=hierarchy)
+
+    with phase("export"):
+        write_graph(graph, hierarchy, output, args)
+
+
+def write_graph(graph, hierarchy, output, args: argparse.Namespace):
+    """Write an aggregated graph in the export format given in the arguments."""
+    from byparse.exporters.csv_tables import write_csv_tables
+    from byparse.exporters.cytoscape_json import (
+        write_cytoscape_json,
+        write_cytoscape_ndjson,
+    )
+    from byparse.exporters.dot import write_dot
+    from byparse.exporters.graphml import write_graphml
+    from byparse.exporters.sharded import write_sharded_cytoscape
+
+    if args.format == "sharded":
+        write_sharded_cytoscape(graph, output, hierarchy=hierarchy, indent=args.indent)
+        return
+    if args.format == "graphml":
+        write_graphml(graph, output, compress=args.gzip or None)
+        return
+    if args.format == "dot":
+        write_dot(graph, output, name=Path(args.root).name, compress=args.gzip or None)
+        return
+    if args.format == "csv":
+        write_csv_tables(graph, output, compress=args.gzip)
+        return
+    if args.format == "ndjson":
+        write_cytoscape_ndjson(graph, output, compress=args.gzip or None)
+    else:
+        write_cytoscape_json(
+            graph, output, indent=args.indent, compress=args.gzip or None
+        )
+    write_constraints(graph, hierarchy, output, indent=args.indent)
+
+
+def export_output(
+    args: argparse.Namespace, name: str, folder: str = "examples_graphs"
+) -> Path:
+    """Default path of the exported graph of a project, given the export format."""
+    if args.format == "sharded":
+        return Path(folder, name)
+    if args.format == "csv":
+        return Path(folder, f"{name}_csv")
+    suffix = ".gz" if args.gzip else ""
+    return Path(folder, f"{name}.{args.format}{suffix}")
+
+
+def write_constraints(graph, hierarchy, output, indent=None):
+    """Write the fcose constraints next to the cytoscape elements file."""
+    from byparse.exporters.cytoscape_json import write_json
+    from byparse.visualisation.cytoscape_fcose import (
+        networkx_to_cytoscape_fcose_constraints,
+    )
+
+    cyto_graph_constraints = networkx_to_cytoscape_fcose_constraints(graph, hierarchy)
+    output_path = Path(output)
+    constraints_path = output_path.parent / (
+        output_path.name.split(".")[0] + "_constraints.json"
+    )
+    write_json(cyto_graph_constraints, constraints_path, indent=indent)
+
+
+def report(args: argparse.Namespace):
+    from byparse.graphs.hierarchy import HierarchyIndex
+    from byparse.graphs.level_of_detail import aggregate_graph
+    from byparse.project_crawl import ProjectCrawler
+    from byparse.visualisation.graph_vis import color_context_graph
+    from byparse.visualisation.html_report import write_html_report
+
+    project = ProjectCrawler(args.root, exclude=args.exclude)
+    output = args.output
+    if output is None:
+        output = Path("examples_graphs", f"{Path(args.root).name}.html")
+        os.makedirs(output.parent, exist_ok=True)
+
+    graph = aggregate_graph(project.build_project_graph(), args.level)
     color_context_graph(graph)
-    compute_parents_and_childs(graph)
+    hierarchy = HierarchyIndex(graph)
+
+    if args.layout:
+        from byparse.visualisation.layout import compute_compound_layout
+
+        compute_compound_layout(graph, hierarchy=hierarchy)
+
+    write_html_report(graph, output, title=Path(args.root).name, hierarchy=hierarchy)
+
+
+def diff(args: argparse.Namespace):
+    from byparse.analysis.diff import diff_graphs, write_diff_cytoscape
+    from byparse.exporters.cytoscape_json import write_json
+    from byparse.stores.loading import open_graph
+
+    with open_graph(args.old) as old_graph, open_graph(args.new) as new_graph:
+        graph_diff = diff_graphs(old_graph, new_graph)
+        if args.highlight is not None:
+            write_diff_cytoscape(new_graph, graph_diff, args.highlight)
+
+    if args.output is not None:
+        write_json(graph_diff.to_dict(), args.output, indent=2)
+    for elements, changes in graph_diff.to_dict().items():
+        for change, changed in changes.items():
+            print(f"{len(changed)} {elements} {change}")
+
+
+def open_analysed_graph(args: argparse.Namespace):
+    from byparse.stores.loading import NetworkxGraph, open_graph
+
+    if args.graph is not None:
+        return open_graph(args.graph)
+    from byparse.project_crawl import ProjectCrawler
+
+    project = ProjectCrawler(args.root, exclude=args.exclude)
+    return NetworkxGraph(project.build_project_graph())
+
+
+def query(args: argparse.Namespace):
+    from byparse.analysis.adjacency import AdjacencyIndex
+    from byparse.analysis.query import GraphQuery
+
+    with open_analysed_graph(args) as graph:
+        graph_query = GraphQuery(AdjacencyIndex.from_graph(graph))
+        try:
+            run_query(graph_query, args)
+        except ValueError as error:
+            raise SystemExit(str(error)) from error
+
+
+def run_query(graph_query, args: argparse.Namespace):
+    if args.relation == "path":
+        if args.target is None:
+            raise SystemExit("A target is needed to find a path")
+        path = graph_query.dependency_path(args.node, args.target)
+        if path is None:
+            raise SystemExit(f"{args.node} does not depend on {args.target}")
+        print("\n".join(path))
+        return
+
+    max_depth = args.depth if args.depth > 0 else None
+    if args.relation == "callers":
+        found = graph_query.transitive_callers(args.node, max_depth)
+    else:
+        found = graph_query.transitive_callees(args.node, max_depth)
+    for node, depth in found.items():
+        print(f"{depth}\t{node}" if max_depth != 1 else node)
+
+
+def impact(args: argparse.Namespace):
+    from byparse.analysis.adjacency import AdjacencyIndex
+    from byparse.analysis.impact import ImpactIndex
+
+    impact_index = None
+    if args.index is not None and Path(args.index).exists():
+        impact_index = ImpactIndex.load(args.index)
+    if impact_index is None:
+        with open_analysed_graph(args) as graph:
+            adjacency = AdjacencyIndex.from_graph(graph)
+            impact_index = ImpactIndex.build(adjacency, test_prefix=args.select)
+        if args.index is not None:
+            impact_index.save(args.index)
+
+    root = Path(args.root).resolve()
+    changed = []
+    for path in args.changed:
+        if Path(path).is_absolute():
+            try:
+                path = Path(path).resolve().relative_to(root).as_posix()
+            except ValueError:
+                raise SystemExit(
+                    f"Changed path {path} is not in the project root {root},"
+                    " give it relative to the root of the graph or set --root"
+                ) from None
+        changed.append(path)
+    for test in impact_index.affected_tests(changed):
+        print(test)
+
+
+def cycles(args: argparse.Namespace):
+    from byparse.analysis.adjacency import AdjacencyIndex
+    from byparse.analysis.cycles import (
+        find_call_cycles,
+        find_import_cycles,
+        import_dependencies,
+        module_dependencies,
+    )
+    from byparse.stores.loading import NetworkxGraph, open_graph
+
+    project = None
+    if args.graph is None:
+        from byparse.project_crawl import ProjectCrawler
+
+        project = ProjectCrawler(args.root, exclude=args.exclude)
+        graph = NetworkxGraph(project.build_project_graph())
+    else:
+        graph = open_graph(args.graph)
+
+    with graph:
+        adjacency = AdjacencyIndex.from_graph(graph)
+        found = {}
+        if args.kind in ("import", "all"):
+            if project is None:  # Saved graphs do not hold the import statements
+                modules = module_dependencies(adjacency)
+            else:
+                modules = import_dependencies(project)
+            found["import"] = find_import_cycles(modules)
+        if args.kind in ("call", "all"):
+            found["call"] = find_call_cycles(adjacency)
+
+    for kind, kind_cycles in found.items():
+        print(f"{len(kind_cycles)} {kind} cycles")
+        for cycle, component_size in kind_cycles:
+            print(f"  [{component_size} nodes] " + " -> ".join(cycle))
+
+
+def dead_code(args: argparse.Namespace):
+    from byparse.analysis.dead_code import find_dead_code
+
+    root = Path(args.root).absolute()
+    entries = []
+    for path in args.entry:
+        if Path(path).is_absolute():
+            path = Path(path).relative_to(root).as_posix()
+        entries.append(path)
+    with open_analysed_graph(args) as graph:
+        found = find_dead_code(graph, entries, test_prefix=args.tests)
+
+    total = sum(file_lines for _, file_lines, _ in found)
+    print(f"{total} dead lines in {len(found)} files")
+    for file, file_lines, definitions in found:
+        print(f"{file} ({file_lines} lines)")
+        for node, node_type, lines in definitions:
+            print(f"  {lines}\t{node_type.lower()}\t{node}")
+
+
+def metrics(args: argparse.Namespace):
+    from byparse.analysis.metrics import UsesMatrix, compute_metrics, write_metrics_csv
+
+    with open_analysed_graph(args) as graph:
+        uses = UsesMatrix.from_graph(graph, args.edge_types)
+    nodes_metrics = compute_metrics(uses, samples=args.samples or None)
+    if args.output is not None:
+        write_metrics_csv(uses.nodes, nodes_metrics, args.output)
+
+    order = nodes_metrics["pagerank"].argsort()[::-1][: args.top]
+    print("\t".join([*nodes_metrics, "node"]))
+    for position in order:
+        values = [values[position] for values in nodes_metrics.values()]
+        print("\t".join([f"{value:.6g}" for value in values] + [uses.nodes[position]]))
+
+
+def focus(args: argparse.Namespace):
+    from byparse.analysis.focus import focus_graph
+    from byparse.analysis.query import DEPENDENCY_EDGES
+    from byparse.exporters.cytoscape_json import write_cytoscape_json
+    from byparse.visualisation.graph_vis import color_context_graph, compute_parents
+
+    edge_types = args.edge_types or DEPENDENCY_EDGES
+    with open_analysed_graph(args) as graph:
+        try:
+            graph = focus_graph(graph, args.node, args.hops, edge_types)
+        except ValueError as error:
+            raise SystemExit(str(error)) from error
+
+    output = args.output
+    if output is None:
+        name = args.node.rsplit(">", 1)[-1].rsplit("/", 1)[-1].split(".")[0]
+        output = Path("examples_graphs", f"{name}_focus.json")
+        os.makedirs(output.parent, exist_ok=True)
+    color_context_graph(graph)
+    hierarchy = compute_parents(graph)
+    write_cytoscape_json(graph, output, indent=args.indent)
+    write_constraints(graph, hierarchy, output, indent=args.indent)
+    print(f"{len(graph)} nodes and {graph.number_of_edges()} edges written to {output}")
+
+
+def serve(args: argparse.Namespace):
+    from byparse.server import ProjectCache
+    from byparse.server import serve as serve_projects
+
+    projects = ProjectCache(args.max_elements, exclude=args.exclude, roots=[args.root])
+    projects.get(args.root)
+    serve_projects(projects, args.host, args.port, args.socket, args.interval or None)
+
+
+def batch_export(root: Path, args: argparse.Namespace):
+    """Export a project of a batch, with the export options of the batch."""
+    args = argparse.Namespace(**vars(args))
+    args.root = str(root)
+    export(args)
+
+
+def batch(args: argparse.Namespace):
+    from byparse.batch import output_names, read_roots, run_batch
+
+    # Imported once here, as forked workers inherit the modules of this process
+    import byparse.project_crawl  # noqa: F401
+    import byparse.visualisation.graph_vis  # noqa: F401
 
-    cyto_graph = networkx_to_cytoscape_fcose(graph)
-    with open(output, "w") as fp:
-        json.dump(cyto_graph, fp, indent=2)
+    roots = read_roots(args.projects)
+    os.makedirs(args.output_dir, exist_ok=True)
+    tasks_args = {}
+    for root, name in output_names(roots).items():
+        project_args = argparse.Namespace(**vars(args))
+        project_args.output = str(export_output(args, name, args.output_dir))
+        project_args.snapshot = None
+        project_args.sqlite = None
+        if args.snapshots:
+            project_args.snapshot = str(Path(args.output_dir, f"{name}.bpg"))
+        tasks_args[root] = (project_args,)
 
-    cyto_graph_constraints = networkx_to_cytoscape_fcose_constraints(graph)
-    with open(output.split(".")[0] + "_constraints.json", "w") as fp:
-        json.dump(cyto_graph_constraints, fp, indent=2)
+    failed = 0
+    for root, seconds, error in run_batch(batch_export, tasks_args, args.jobs):
+        if error is None:
+            print(f"{root}: {seconds:.2f}s")
+            continue
+        failed += 1
+        print(f"{root}: failed after {seconds:.2f}s")
+        print(error, file=sys.stderr)
+    print(f"{len(roots) - failed}/{len(roots)} projects exported to {args.output_dir}")
+    if failed:
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
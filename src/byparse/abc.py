@@ -15,3 +15,13 @@ class NodeType(Enum):
     CLASS = auto()
     FUNCTION = auto()
     LIBRAIRY = auto()
+
+
+# Rank of each node type from the coarsest to the finest level of detail
+LEVELS_RANKS = {
+    NodeType.FOLDER.name: 0,
+    NodeType.FILE.name: 1,
+    NodeType.CLASS.name: 2,
+    NodeType.FUNCTION.name: 3,
+}
+LEVELS = tuple(node_type.lower() for node_type in LEVELS_RANKS)
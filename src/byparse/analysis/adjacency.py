@@ -0,0 +1,155 @@
+"""Forward and reverse adjacency of a graph, split by edge type, in flat arrays."""
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from byparse.stores.snapshot import GraphSnapshot
+
+
+def _csr(
+    n_nodes: int, keys: Sequence[int], values: Sequence[int]
+) -> Tuple[array, array]:
+    """Counting sort of values by key, as (offsets, values) arrays."""
+    offsets = array("I", [0]) * (n_nodes + 1)
+    for key in keys:
+        offsets[key + 1] += 1
+    for i in range(n_nodes):
+        offsets[i + 1] += offsets[i]
+    sorted_values = array("I", [0]) * len(values)
+    filled = array("I", offsets[:-1])
+    for key, value in zip(keys, values):
+        sorted_values[filled[key]] = value
+        filled[key] += 1
+    return offsets, sorted_values
+
+
+class AdjacencyIndex:
+    """Neighbors of each node for each edge type, in both directions.
+
+    Edges keep the direction of the graph: CALL edges go from the callee to the
+    caller, so the callers of a node are its 'forward' CALL neighbors and its
+    callees are its 'reverse' ones.
+
+    Attributes:
+        nodes (Sequence[str]): Node ids, by node position.
+        edge_types (List[str]): Types of the indexed edges.
+        forward (Dict[str, Tuple[array, array]]): Offsets and targets positions
+            of the edges of each type, grouped by source.
+        reverse (Dict[str, Tuple[array, array]]): Offsets and sources positions
+            of the edges of each type, grouped by target.
+
+    """
+
+    def __init__(
+        self,
+        nodes: Sequence[str],
+        edges: Iterable[Tuple[int, int, Optional[str]]],
+        index: Optional[Dict[str, int]] = None,
+    ) -> None:
+        self.nodes = nodes
+        self._index = index
+        self._snapshot: Optional[GraphSnapshot] = None
+
+        edges_by_type: Dict[str, Tuple[array, array]] = {}
+        for source, target, edge_type in edges:
+            if edge_type is None:
+                continue  # Untyped edges can not be queried
+            if edge_type not in edges_by_type:
+                edges_by_type[edge_type] = (array("I"), array("I"))
+            sources, targets = edges_by_type[edge_type]
+            sources.append(source)
+            targets.append(target)
+
+        self.edge_types: List[str] = list(edges_by_type)
+        self.forward: Dict[str, Tuple[array, array]] = {}
+        self.reverse: Dict[str, Tuple[array, array]] = {}
+        for edge_type, (sources, targets) in edges_by_type.items():
+            self.forward[edge_type] = _csr(len(nodes), sources, targets)
+            self.reverse[edge_type] = _csr(len(nodes), targets, sources)
+
+    @classmethod
+    def from_graph(cls, graph) -> "AdjacencyIndex":
+        """Index a graph opened with `byparse.stores.loading.open_graph`.
+
+        Snapshots are indexed from their integer arrays, node ids being only
+        decoded when they are looked up or returned.
+
+        """
+        if isinstance(graph, GraphSnapshot):
+            return cls.from_snapshot(graph)
+        nodes = [node for node, _ in graph.iter_nodes()]
+        index = {node: i for i, node in enumerate(nodes)}
+        edges = (
+            (index[source], index[target], edge_attrs.get("type"))
+            for source, target, edge_attrs in graph.iter_edges()
+            if source in index and target in index
+        )
+        return cls(nodes, edges, index)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: GraphSnapshot) -> "AdjacencyIndex":
+        types_names: Dict[int, Optional[str]] = {}
+        for edge, code in enumerate(snapshot.edge_types):
+            if code not in types_names:
+                types_names[code] = snapshot.edge_type(edge)
+        edges = (
+            (source, target, types_names[code])
+            for source, target, code in zip(
+                snapshot.edge_sources, snapshot.edge_targets, snapshot.edge_types
+            )
+        )
+        adjacency = cls(_SnapshotNodes(snapshot), edges)
+        adjacency._snapshot = snapshot
+        return adjacency
+
+    def position(self, node: str) -> int:
+        """Position of a node given its id.
+
+        Raises:
+            ValueError: If the node is not in the graph.
+
+        """
+        if self._snapshot is not None:
+            position = self._snapshot.find_node(node)
+        else:
+            if self._index is None:
+                self._index = {node: i for i, node in enumerate(self.nodes)}
+            position = self._index.get(node)
+        if position is None:
+            raise ValueError(f"Unknown node {node}")
+        return position
+
+    def __contains__(self, node: str) -> bool:
+        try:
+            self.position(node)
+        except ValueError:
+            return False
+        return True
+
+    def neighbors(self, position: int, edge_type: str, reverse: bool = False) -> array:
+        """Positions of the neighbors of a node through edges of a type."""
+        csr = (self.reverse if reverse else self.forward).get(edge_type)
+        if csr is None:
+            return array("I")
+        offsets, neighbors = csr
+        return neighbors[offsets[position] : offsets[position + 1]]
+
+
+class _SnapshotNodes(Sequence[str]):
+    """Node ids of a snapshot, decoded on access."""
+
+    def __init__(self, snapshot: GraphSnapshot) -> None:
+        self.snapshot = snapshot
+
+    def __len__(self) -> int:
+        return self.snapshot.n_nodes
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self.snapshot.node_id(i) for i in range(len(self))[position]]
+        if not -len(self) <= position < len(self):
+            raise IndexError(position)
+        return self.snapshot.node_id(position % len(self))
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.snapshot.node_id(i) for i in range(len(self)))
@@ -0,0 +1,157 @@
+"""Module dependency cycles and function call cycles.
+
+Cycles are found as the strongly connected components of more than one node,
+each one being reported with the shortest cycle through its smallest node id.
+
+Module dependencies are given by the import statements at the module level of
+each crawled module, imports deferred in functions and methods, as done to break
+import cycles, being ignored. Saved graphs do not hold import statements, their
+module dependencies are derived from the symbol edges crossing files instead: a
+module depends on another one when one of its contexts calls, inherits from or
+is typed with a name defined in the other one, deferred imports included.
+
+"""
+
+from collections import deque
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Set, Tuple
+
+from byparse.abc import EdgeType
+from byparse.analysis.adjacency import AdjacencyIndex
+from byparse.analysis.query import DEPENDENCY_EDGES
+from byparse.analysis.scc import (
+    components_members,
+    iter_neighbors,
+    strongly_connected_components,
+)
+
+if TYPE_CHECKING:
+    from byparse.project_crawl import ProjectCrawler
+
+IMPORT_EDGE = "IMPORT"  # Module dependencies, from the used module to its user
+
+
+def module_of(node: str) -> Optional[str]:
+    """Module of a node id, as 'package/module.py' for 'package/module.py>func'."""
+    module = node.split(">", 1)[0]
+    return module if module.endswith(".py") else None
+
+
+def import_dependencies(project: "ProjectCrawler") -> AdjacencyIndex:
+    """Adjacency of the modules, with one IMPORT edge per module level import."""
+    modules: Dict[str, int] = {
+        str(path): position for position, path in enumerate(project.modules)
+    }
+    dependencies: Set[Tuple[int, int]] = set()
+    for path, module in project.modules.items():
+        module_level, _ = module.imported_modules()
+        for imported in module_level:
+            if str(imported) in modules and imported != path:
+                dependencies.add((modules[str(imported)], modules[str(path)]))
+
+    edges = ((source, target, IMPORT_EDGE) for source, target in dependencies)
+    return AdjacencyIndex(list(modules), edges, modules)
+
+
+def module_dependencies(
+    adjacency: AdjacencyIndex, edge_types: Sequence[str] = DEPENDENCY_EDGES
+) -> AdjacencyIndex:
+    """Adjacency of the modules, with one IMPORT edge per pair of dependent modules.
+
+    Derived from the uses of the names of other modules, for saved graphs.
+
+    """
+    modules: Dict[str, int] = {}
+    nodes_modules: List[int] = []
+    for node in adjacency.nodes:
+        module = module_of(node)
+        if module is None:
+            nodes_modules.append(-1)
+        else:
+            nodes_modules.append(modules.setdefault(module, len(modules)))
+
+    dependencies: Set[Tuple[int, int]] = set()
+    for edge_type in edge_types:
+        if edge_type not in adjacency.forward:
+            continue
+        offsets, targets = adjacency.forward[edge_type]
+        for source, source_module in enumerate(nodes_modules):
+            if source_module < 0:
+                continue
+            for target in targets[offsets[source] : offsets[source + 1]]:
+                target_module = nodes_modules[target]
+                if target_module >= 0 and target_module != source_module:
+                    dependencies.add((source_module, target_module))
+
+    edges = ((source, target, IMPORT_EDGE) for source, target in dependencies)
+    return AdjacencyIndex(list(modules), edges, modules)
+
+
+def shortest_cycle(
+    adjacency: AdjacencyIndex,
+    start: int,
+    members: Set[int],
+    edge_types: Sequence[str],
+    reverse: bool = False,
+) -> List[int]:
+    """Shortest cycle from a node back to itself, staying in its component."""
+    previous = {start: start}
+    queue = deque([start])
+    while queue:
+        position = queue.popleft()
+        for neighbor in iter_neighbors(adjacency, position, edge_types, reverse):
+            if neighbor == start:
+                cycle = [position]
+                while cycle[-1] != start:
+                    cycle.append(previous[cycle[-1]])
+                return cycle[::-1] + [start]
+            if neighbor in members and neighbor not in previous:
+                previous[neighbor] = position
+                queue.append(neighbor)
+    return []
+
+
+def find_cycles(
+    adjacency: AdjacencyIndex, edge_types: Sequence[str], reverse: bool = False
+) -> List[Tuple[List[str], int]]:
+    """Cycles of the graph, one per strongly connected component.
+
+    Args:
+        adjacency (AdjacencyIndex): Graph to search.
+        edge_types (Sequence[str]): Types of the followed edges.
+        reverse (bool): Follow the edges backward, as to list cycles in the
+            order of uses for edges going from the used node to its user.
+
+    Returns:
+        List[Tuple[List[str], int]]: Shortest cycle through the smallest node id
+            of each component, starting and ending with it, and the number of
+            nodes in the component. Biggest components first.
+
+    """
+    components, n_components = strongly_connected_components(
+        adjacency, edge_types, reverse
+    )
+    cycles = []
+    for members in components_members(components, n_components):
+        if len(members) < 2:
+            continue
+        start = min(members, key=adjacency.nodes.__getitem__)
+        cycle = shortest_cycle(adjacency, start, set(members), edge_types, reverse)
+        cycles.append(([adjacency.nodes[position] for position in cycle], len(members)))
+    cycles.sort(key=lambda cycle: (-cycle[1], cycle[0]))
+    return cycles
+
+
+def find_import_cycles(modules: AdjacencyIndex) -> List[Tuple[List[str], int]]:
+    """Cycles of modules, each module importing the next one.
+
+    Args:
+        modules (AdjacencyIndex): Modules, given by `import_dependencies` or
+            `module_dependencies`.
+
+    """
+    return find_cycles(modules, (IMPORT_EDGE,), reverse=True)
+
+
+def find_call_cycles(adjacency: AdjacencyIndex) -> List[Tuple[List[str], int]]:
+    """Cycles of functions, each function calling the next one."""
+    return find_cycles(adjacency, (EdgeType.CALL.name,), reverse=True)
@@ -0,0 +1,154 @@
+"""Dead code: classes and functions no entry point can reach.
+
+Entry points are the given files, folders or node ids, everything under the
+tests folder, every '__main__.py' module, and the module level code of every
+file, which runs as soon as the module is imported.
+
+A single breadth first traversal marks what entry points use, directly or
+transitively, through CALL, INHERITANCE and TYPEHINT edges. Using a class also
+uses its methods, which may be called on its instances, and using a method
+also uses its class.
+
+"""
+
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from byparse.abc import EdgeType, NodeType
+from byparse.analysis.adjacency import AdjacencyIndex
+from byparse.analysis.cycles import module_of
+from byparse.analysis.query import DEPENDENCY_EDGES
+from byparse.stores.snapshot import GraphSnapshot
+
+DEFINITION_TYPES = (NodeType.CLASS.name, NodeType.FUNCTION.name)
+
+
+def is_under(node: str, path: str) -> bool:
+    """True if the node is the given path or one of the nodes it contains."""
+    path = path.rstrip("/")
+    return node == path or node.startswith((path + "/", path + ">"))
+
+
+def nodes_types_and_lines(
+    graph,
+) -> Tuple[List[Optional[str]], List[Optional[int]]]:
+    """Type and number of lines of each node, in the order of `iter_nodes`."""
+    if isinstance(graph, GraphSnapshot):
+        nodes = range(graph.n_nodes)
+        return [graph.node_type(node) for node in nodes], [
+            graph.node_size(node) for node in nodes
+        ]
+    types, lines = [], []
+    for _, node_attrs in graph.iter_nodes():
+        types.append(node_attrs.get("type"))
+        lines.append(node_attrs.get("lines"))
+    return types, lines
+
+
+def entry_positions(
+    adjacency: AdjacencyIndex,
+    types: Sequence[Optional[str]],
+    entries: Iterable[str] = (),
+    test_prefix: str = "tests/",
+) -> List[int]:
+    """Positions of the entry points nodes."""
+    entries = [entry for entry in entries if entry]
+    roots = []
+    for position, node in enumerate(adjacency.nodes):
+        module = module_of(node)
+        if (
+            types[position] == NodeType.FILE.name
+            or node.startswith(test_prefix)
+            or (module is not None and module.rsplit("/", 1)[-1] == "__main__.py")
+            or any(is_under(node, entry) for entry in entries)
+        ):
+            roots.append(position)
+    return roots
+
+
+def reachable_from(
+    adjacency: AdjacencyIndex,
+    types: Sequence[Optional[str]],
+    roots: Iterable[int],
+    edge_types: Sequence[str] = DEPENDENCY_EDGES,
+) -> bytearray:
+    """Flags of the nodes used by the roots, roots included."""
+    context = EdgeType.CONTEXT.name
+    reached = bytearray(len(adjacency.nodes))
+    queue: Deque[int] = deque()
+    for root in roots:
+        if not reached[root]:
+            reached[root] = 1
+            queue.append(root)
+
+    while queue:
+        position = queue.popleft()
+        # Used names are the sources of the edges coming to their user
+        neighbors = [
+            adjacency.neighbors(position, edge_type, reverse=True)
+            for edge_type in edge_types
+        ]
+        if types[position] in DEFINITION_TYPES:
+            neighbors.append(adjacency.neighbors(position, context))
+        if types[position] == NodeType.CLASS.name:
+            neighbors.append(adjacency.neighbors(position, context, reverse=True))
+        for group in neighbors:
+            for neighbor in group:
+                if not reached[neighbor]:
+                    reached[neighbor] = 1
+                    queue.append(neighbor)
+    return reached
+
+
+def find_dead_code(
+    graph,
+    entries: Iterable[str] = (),
+    test_prefix: str = "tests/",
+    adjacency: Optional[AdjacencyIndex] = None,
+) -> List[Tuple[str, int, List[Tuple[str, str, int]]]]:
+    """Classes and functions unreachable from the entry points, by file.
+
+    Definitions nested in a dead one are counted in its lines, not listed.
+
+    Args:
+        graph: Graph opened with `byparse.stores.loading.open_graph`.
+        entries (Iterable[str]): Files, folders or node ids used as entry points.
+        test_prefix (str): Path prefix of the test files, all used as entry points.
+        adjacency (Optional[AdjacencyIndex]): Index of the graph, built if None.
+
+    Returns:
+        List[Tuple[str, int, List[Tuple[str, str, int]]]]: For each file with
+            dead code, its total of dead lines and its dead (node, type, lines),
+            biggest first.
+
+    """
+    if adjacency is None:
+        adjacency = AdjacencyIndex.from_graph(graph)
+    types, lines = nodes_types_and_lines(graph)
+    roots = entry_positions(adjacency, types, entries, test_prefix)
+    reached = reachable_from(adjacency, types, roots)
+
+    files: Dict[str, List[Tuple[str, str, int]]] = {}
+    for position, node in enumerate(adjacency.nodes):
+        node_type = types[position]
+        if reached[position] or node_type not in DEFINITION_TYPES:
+            continue
+        file = module_of(node)
+        if node_type is None or file is None:
+            continue  # Not a definition of a python module
+        parents = adjacency.neighbors(position, EdgeType.CONTEXT.name)
+        if any(
+            not reached[parent] and types[parent] in DEFINITION_TYPES
+            for parent in parents
+        ):
+            continue
+        dead = (node, node_type, lines[position] or 0)
+        files.setdefault(file, []).append(dead)
+
+    dead_code = []
+    for file, definitions in files.items():
+        definitions.sort(key=lambda definition: (-definition[2], definition[0]))
+        total = sum(definition[2] for definition in definitions)
+        dead_code.append((file, total, definitions))
+    dead_code.sort(key=lambda file: (-file[1], file[0]))
+    return dead_code
@@ -0,0 +1,193 @@
+"""Difference between two graphs, matched on node ids and typed edges.
+
+Both graphs are only iterated: the nodes and edges keys of the old graph are
+kept in hash sets, and the new graph is streamed against them. Hierarchy
+(CONTEXT and PATH) edges are not compared, as cytoscape exports do not hold
+them, node changes already showing the structural changes.
+
+"""
+
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Set, Tuple, Union
+
+from byparse.exporters.cytoscape_json import write_json_arrays
+from byparse.graphs.hierarchy import HIERARCHY_EDGES
+from byparse.visualisation.cytoscape_fcose import cytoscape_edge, cytoscape_node
+
+EdgeKey = Tuple[str, str, Optional[str]]
+
+ADDED = "added"
+REMOVED = "removed"
+
+
+class GraphDiff:
+    """Nodes and edges added to and removed from a graph.
+
+    Attributes:
+        added_nodes (Dict[str, Optional[str]]): Type of each added node.
+        removed_nodes (Dict[str, Optional[str]]): Type of each removed node.
+        added_edges (Set[EdgeKey]): Added (source, target, type) edges.
+        removed_edges (Set[EdgeKey]): Removed (source, target, type) edges.
+
+    """
+
+    def __init__(
+        self,
+        added_nodes: Dict[str, Optional[str]],
+        removed_nodes: Dict[str, Optional[str]],
+        added_edges: Set[EdgeKey],
+        removed_edges: Set[EdgeKey],
+    ) -> None:
+        self.added_nodes = added_nodes
+        self.removed_nodes = removed_nodes
+        self.added_edges = added_edges
+        self.removed_edges = removed_edges
+
+    def is_empty(self) -> bool:
+        return not (
+            self.added_nodes
+            or self.removed_nodes
+            or self.added_edges
+            or self.removed_edges
+        )
+
+    def to_dict(self) -> dict:
+        def nodes(nodes_types: Dict[str, Optional[str]]):
+            return [
+                {"id": node, "type": nodes_types[node]} for node in sorted(nodes_types)
+            ]
+
+        def edges(edges_keys: Set[EdgeKey]):
+            return [
+                {"source": source, "target": target, "type": edge_type}
+                for source, target, edge_type in sorted(edges_keys, key=str)
+            ]
+
+        return {
+            "nodes": {
+                ADDED: nodes(self.added_nodes),
+                REMOVED: nodes(self.removed_nodes),
+            },
+            "edges": {
+                ADDED: edges(self.added_edges),
+                REMOVED: edges(self.removed_edges),
+            },
+        }
+
+
+def diff_graphs(old_graph, new_graph) -> GraphDiff:
+    """Compare two graphs opened with `byparse.stores.loading.open_graph`.
+
+    Args:
+        old_graph: Graph before the changes, its keys are held in memory.
+        new_graph: Graph after the changes, only streamed.
+
+    Returns:
+        GraphDiff: Nodes and non hierarchy edges added and removed.
+
+    """
+    old_nodes: Dict[str, Optional[str]] = {
+        node: node_attrs.get("type") for node, node_attrs in old_graph.iter_nodes()
+    }
+    added_nodes: Dict[str, Optional[str]] = {}
+    kept_nodes: Set[str] = set()
+    for node, node_attrs in new_graph.iter_nodes():
+        if node in old_nodes:
+            kept_nodes.add(node)
+        else:
+            added_nodes[node] = node_attrs.get("type")
+    removed_nodes = {
+        node: node_type
+        for node, node_type in old_nodes.items()
+        if node not in kept_nodes
+    }
+
+    old_edges = set(_iter_edges_keys(old_graph))
+    added_edges: Set[EdgeKey] = set()
+    kept_edges: Set[EdgeKey] = set()
+    for edge_key in _iter_edges_keys(new_graph):
+        if edge_key in old_edges:
+            kept_edges.add(edge_key)
+        else:
+            added_edges.add(edge_key)
+    removed_edges = old_edges - kept_edges
+
+    return GraphDiff(added_nodes, removed_nodes, added_edges, removed_edges)
+
+
+def _iter_edges_keys(graph) -> Iterator[EdgeKey]:
+    for source, target, edge_attrs in graph.iter_edges():
+        edge_type = edge_attrs.get("type")
+        if edge_type not in HIERARCHY_EDGES:
+            yield source, target, edge_type
+
+
+def _parent_from_id(node: str) -> Optional[str]:
+    """Parent of a node from its id, as 'folder/module.py>Class>method'."""
+    for separator in (">", "/"):
+        if separator in node:
+            return node.rsplit(separator, 1)[0]
+    return None
+
+
+def write_diff_cytoscape(
+    new_graph,
+    diff: GraphDiff,
+    path: Union[str, Path],
+    indent: Optional[int] = None,
+    compress: Optional[bool] = None,
+):
+    """Write the new graph with the removed elements, highlighting the changes.
+
+    Changed elements get a 'diff' data attribute set to 'added' or 'removed'.
+    The new graph is streamed twice, once for its edges and once for its nodes.
+
+    Args:
+        new_graph: Graph after the changes, as given to `diff_graphs`.
+        diff (GraphDiff): Difference with the graph before the changes.
+        path (Union[str, Path]): Path of the cytoscape json file to write.
+        indent (Optional[int]): Indentation of the json, compact if None.
+        compress (Optional[bool]): Compress using gzip.
+            Defaults to True if the path ends with '.gz'.
+
+    """
+    parents: Dict[str, str] = {}
+    new_nodes: Set[str] = set()
+
+    def edges_elements() -> Iterator[dict]:
+        for source, target, edge_attrs in new_graph.iter_edges():
+            edge_type = edge_attrs.get("type")
+            if edge_type in HIERARCHY_EDGES:
+                parents[source] = target
+                continue
+            element = cytoscape_edge(source, target, edge_attrs)
+            if (source, target, edge_type) in diff.added_edges:
+                element["data"]["diff"] = ADDED
+            yield element
+        for source, target, edge_type in diff.removed_edges:
+            yield cytoscape_edge(source, target, {"type": edge_type, "diff": REMOVED})
+
+    def nodes_elements() -> Iterator[dict]:
+        for node, node_attrs in new_graph.iter_nodes():
+            if node in parents:
+                node_attrs = {**node_attrs, "parent": parents[node]}
+            new_nodes.add(node)
+            element = cytoscape_node(node, node_attrs)
+            if node in diff.added_nodes:
+                element["data"]["diff"] = ADDED
+            yield element
+        for node, node_type in diff.removed_nodes.items():
+            parent = _parent_from_id(node)
+            label = node if parent is None else node[len(parent) + 1 :]
+            node_attrs = {"label": label, "type": node_type, "diff": REMOVED}
+            if parent in new_nodes or parent in diff.removed_nodes:
+                node_attrs["parent"] = parent
+            yield cytoscape_node(node, node_attrs)
+
+    # Edges go first, to know the parents before writing the nodes
+    write_json_arrays(
+        {"edges": edges_elements(), "nodes": nodes_elements()},
+        path,
+        indent=indent,
+        compress=compress,
+    )
@@ -0,0 +1,174 @@
+"""Neighborhood of a single node, read from a saved graph without loading it.
+
+Snapshots are memory-mapped and SQLite stores are indexed, so only the edges
+of the visited nodes are read. Other graphs are loaded in memory first.
+
+"""
+
+from collections import deque
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+import networkx as nx
+
+from byparse.analysis.query import DEPENDENCY_EDGES
+from byparse.graphs.hierarchy import HIERARCHY_EDGES
+from byparse.stores.loading import NetworkxGraph
+from byparse.stores.snapshot import GraphSnapshot
+from byparse.stores.sqlite_store import SqliteGraphStore
+
+
+class _SnapshotLookup:
+    def __init__(self, snapshot: GraphSnapshot) -> None:
+        self.snapshot = snapshot
+
+    def node_attrs(self, node: str) -> Optional[dict]:
+        index = self.snapshot.find_node(node)
+        if index is None:
+            return None
+        node_attrs: dict = {
+            "label": self.snapshot.node_label(index),
+            "type": self.snapshot.node_type(index),
+        }
+        lines = self.snapshot.node_size(index)
+        if lines is not None:
+            node_attrs["lines"] = lines
+        return node_attrs
+
+    def edges(self, node: str, edge_type: str, reverse: bool) -> Iterator[str]:
+        snapshot = self.snapshot
+        index = snapshot.find_node(node)
+        if index is None:
+            return
+        edges: Sequence[int]
+        if reverse:
+            edges, ends = snapshot.in_edges(index), snapshot.edge_sources
+        else:
+            edges, ends = snapshot.out_edges(index), snapshot.edge_targets
+        for edge in edges:
+            if snapshot.edge_type(edge) == edge_type:
+                yield snapshot.node_id(ends[edge])
+
+
+class _SqliteLookup:
+    def __init__(self, store: SqliteGraphStore) -> None:
+        self.store = store
+
+    def node_attrs(self, node: str) -> Optional[dict]:
+        return self.store.node_attrs(node)
+
+    def edges(self, node: str, edge_type: str, reverse: bool) -> Iterator[str]:
+        if reverse:
+            return iter(self.store.predecessors(node, edge_type))
+        return iter(self.store.successors(node, edge_type))
+
+
+class _NetworkxLookup:
+    def __init__(self, graph: nx.MultiDiGraph) -> None:
+        self.graph = graph
+
+    def node_attrs(self, node: str) -> Optional[dict]:
+        if node not in self.graph:
+            return None
+        return dict(self.graph.nodes[node])
+
+    def edges(self, node: str, edge_type: str, reverse: bool) -> Iterator[str]:
+        if reverse:
+            edges = self.graph.in_edges(node, data="type")
+            return (source for source, _, type_ in edges if type_ == edge_type)
+        edges = self.graph.out_edges(node, data="type")
+        return (target for _, target, type_ in edges if type_ == edge_type)
+
+
+def _lookup(graph):
+    if isinstance(graph, GraphSnapshot):
+        return _SnapshotLookup(graph)
+    if isinstance(graph, SqliteGraphStore):
+        return _SqliteLookup(graph)
+    if isinstance(graph, NetworkxGraph):
+        return _NetworkxLookup(graph.graph)
+    loaded = nx.MultiDiGraph()
+    loaded.add_nodes_from(graph.iter_nodes())
+    loaded.add_edges_from(graph.iter_edges())
+    return _NetworkxLookup(loaded)
+
+
+def focus_graph(
+    graph,
+    node: str,
+    hops: int = 1,
+    edge_types: Sequence[str] = DEPENDENCY_EDGES,
+) -> nx.MultiDiGraph:
+    """Nodes at most `hops` edges away from a node, with their ancestors.
+
+    Edges of the given types are followed in both directions, and kept between
+    the reached nodes. The folders, files, classes and functions containing
+    the reached nodes are added with their CONTEXT and PATH edges, so that the
+    result renders as compound nodes.
+
+    Args:
+        graph: Graph opened with `byparse.stores.loading.open_graph`.
+        node (str): Id of the focused node.
+        hops (int): Maximum number of edges between the focused node and the others.
+        edge_types (Sequence[str]): Types of the followed edges.
+
+    Returns:
+        nx.MultiDiGraph: Neighborhood, the 'hops' attribute giving the distance of
+            each reached node, None for the ancestors only added as containers.
+
+    Raises:
+        ValueError: If the node is not in the graph.
+
+    """
+    lookup = _lookup(graph)
+    if lookup.node_attrs(node) is None:
+        raise ValueError(f"Unknown node {node}")
+
+    distances: Dict[str, int] = {node: 0}
+    edges: Dict[Tuple[str, str, str], None] = {}
+    queue = deque([node])
+    while queue:
+        current = queue.popleft()
+        distance = distances[current]
+        for edge_type in edge_types:
+            for reverse in (False, True):
+                for neighbor in lookup.edges(current, edge_type, reverse):
+                    if neighbor not in distances:
+                        if distance == hops:
+                            continue
+                        distances[neighbor] = distance + 1
+                        queue.append(neighbor)
+                    source, target = (
+                        (neighbor, current) if reverse else (current, neighbor)
+                    )
+                    edges[(source, target, edge_type)] = None
+
+    focus = nx.MultiDiGraph()
+    for reached, distance in distances.items():
+        focus.add_node(reached, **lookup.node_attrs(reached), hops=distance)
+    for source, target, edge_type in edges:
+        focus.add_edge(source, target, type=edge_type)
+
+    # Containers of the reached nodes, up to the roots
+    for reached in distances:
+        child = reached
+        while True:
+            parent = None
+            for edge_type in HIERARCHY_EDGES:
+                parent = next(lookup.edges(child, edge_type, False), None)
+                if parent is not None:
+                    break
+            if parent is None:
+                break
+            known_parent = parent in focus
+            if not known_parent:
+                focus.add_node(parent, **lookup.node_attrs(parent), hops=None)
+            focus.add_edge(child, parent, type=edge_type)
+            if known_parent:
+                break  # Its own ancestors are or will be added from it
+            child = parent
+
+    # Parents read from cytoscape exports may be outside of the neighborhood
+    for reached, parent in list(focus.nodes(data="parent")):
+        if parent is not None and parent not in focus:
+            del focus.nodes[reached]["parent"]
+    return focus
@@ -0,0 +1,154 @@
+"""Change impact analysis: which tests can reach changed code.
+
+Every node gets the bitset of the tests that use it, directly or transitively,
+through CALL, INHERITANCE and TYPEHINT edges. Strongly connected components
+share the same bitset, which is computed once per component from the ones of
+its users, components being visited in Tarjan reverse topological order.
+Finding the tests affected by a change is then an OR of a few bitsets.
+
+"""
+
+import gzip
+import json
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Union
+
+from byparse.analysis.adjacency import AdjacencyIndex
+from byparse.analysis.query import DEPENDENCY_EDGES
+from byparse.analysis.scc import (
+    components_members,
+    iter_neighbors,
+    strongly_connected_components,
+)
+
+IMPACT_INDEX_VERSION = 1
+
+
+def is_test_node(node: str, test_prefix: str = "tests/") -> bool:
+    """Test functions and methods, as 'tests/test_mod.py>TestClass>test_func'."""
+    if not node.startswith(test_prefix) or ">" not in node:
+        return False
+    return node.rsplit(">", 1)[1].startswith("test")
+
+
+class ImpactIndex:
+    """Tests that can reach each node of a graph, as bitsets.
+
+    Attributes:
+        nodes (List[str]): Sorted node ids.
+        tests (List[str]): Test nodes, bit i of a bitset being the test i.
+        components (List[int]): Component of each node.
+        bitsets (List[int]): Tests bitset of each component.
+
+    """
+
+    def __init__(
+        self,
+        nodes: List[str],
+        tests: List[str],
+        components: Sequence[int],
+        bitsets: List[int],
+    ) -> None:
+        self.nodes = nodes
+        self.tests = tests
+        self.components = components
+        self.bitsets = bitsets
+
+    @classmethod
+    def build(
+        cls,
+        adjacency: AdjacencyIndex,
+        test_prefix: str = "tests/",
+        edge_types: Sequence[str] = DEPENDENCY_EDGES,
+    ) -> "ImpactIndex":
+        """Compute the tests bitsets of every node of an adjacency index.
+
+        Args:
+            adjacency (AdjacencyIndex): Graph to analyse.
+            test_prefix (str): Path prefix of the test files.
+            edge_types (Sequence[str]): Types of the edges going from used to user.
+
+        """
+        components, n_components = strongly_connected_components(adjacency, edge_types)
+
+        # Sorted node ids allow to find the nodes of a file by bisection
+        nodes = list(adjacency.nodes)
+        order = sorted(range(len(nodes)), key=nodes.__getitem__)
+        nodes = [nodes[position] for position in order]
+        tests_positions = [
+            position
+            for position, node in zip(order, nodes)
+            if is_test_node(node, test_prefix)
+        ]
+        tests = [adjacency.nodes[position] for position in tests_positions]
+
+        bitsets = [0] * n_components
+        for bit, position in enumerate(tests_positions):
+            bitsets[components[position]] |= 1 << bit
+
+        # Users of a component are in lower numbered components, visited first
+        for component, members in enumerate(
+            components_members(components, n_components)
+        ):
+            bitset = bitsets[component]
+            for position in members:
+                for user in iter_neighbors(adjacency, position, edge_types):
+                    user_component = components[user]
+                    if user_component != component:
+                        bitset |= bitsets[user_component]
+            bitsets[component] = bitset
+
+        return cls(nodes, tests, [components[position] for position in order], bitsets)
+
+    def nodes_under(self, path: str) -> List[int]:
+        """Positions of the node of a path and of the nodes it contains."""
+        path = path.rstrip("/")
+        positions: List[int] = []
+        for prefix in (path + "/", path + ">"):
+            # '0' and '?' come right after '/' and '>'
+            end_prefix = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            start = bisect_left(self.nodes, prefix)
+            positions.extend(range(start, bisect_left(self.nodes, end_prefix, start)))
+        position = bisect_left(self.nodes, path)
+        if position < len(self.nodes) and self.nodes[position] == path:
+            positions.append(position)
+        return positions
+
+    def affected_tests(self, changed: Iterable[str]) -> List[str]:
+        """Tests using any of the changed files, folders or node ids."""
+        bitset = 0
+        seen_components = set()
+        for path in changed:
+            for position in self.nodes_under(path):
+                component = self.components[position]
+                if component not in seen_components:
+                    seen_components.add(component)
+                    bitset |= self.bitsets[component]
+        affected = []
+        while bitset:
+            lowest_bit = bitset & -bitset
+            affected.append(self.tests[lowest_bit.bit_length() - 1])
+            bitset ^= lowest_bit
+        return affected
+
+    def save(self, path: Union[str, Path]):
+        data = {
+            "version": IMPACT_INDEX_VERSION,
+            "nodes": self.nodes,
+            "tests": self.tests,
+            "components": list(self.components),
+            "bitsets": [format(bitset, "x") for bitset in self.bitsets],
+        }
+        with gzip.open(path, "wt", encoding="utf8") as file:
+            json.dump(data, file, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Optional["ImpactIndex"]:
+        """Load a saved index, None if it was saved by another version."""
+        with gzip.open(path, "rt", encoding="utf8") as file:
+            data = json.load(file)
+        if data.get("version") != IMPACT_INDEX_VERSION:
+            return None
+        bitsets = [int(bitset, 16) for bitset in data["bitsets"]]
+        return cls(data["nodes"], data["tests"], data["components"], bitsets)
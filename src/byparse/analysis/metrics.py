@@ -0,0 +1,226 @@
+"""Centrality metrics of the uses graph, computed with NumPy.
+
+The graph is converted once to a compressed sparse row adjacency of its
+unique 'uses' edges, going from a context to the names it uses, which is the
+reverse of the CALL, INHERITANCE and TYPEHINT edges of byparse graphs. Every
+metric is then a handful of vectorized operations over the edge arrays:
+
+    fan_in       number of distinct users of a node
+    fan_out      number of distinct names a node uses
+    pagerank     power iteration, dangling nodes spreading uniformly
+    betweenness  Brandes algorithm from a sample of sources, each breadth first
+                 search expanding a whole level at once
+
+"""
+
+import csv
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from byparse.abc import EdgeType
+from byparse.stores.snapshot import GraphSnapshot
+
+METRICS = ("fan_in", "fan_out", "pagerank", "betweenness")
+
+
+class UsesMatrix:
+    """Unique uses edges of a graph, as compressed sparse rows.
+
+    Attributes:
+        nodes (List[str]): Node ids, by node position.
+        users (np.ndarray): Source position of each edge, sorted.
+        used (np.ndarray): Target position of each edge.
+        indptr (np.ndarray): Edges of the node i are the ones from indptr[i]
+            to indptr[i + 1].
+
+    """
+
+    def __init__(self, nodes: List[str], users: np.ndarray, used: np.ndarray) -> None:
+        self.nodes = nodes
+        n_nodes = len(nodes)
+        pairs = np.unique(users.astype(np.int64) * n_nodes + used)
+        self.users = pairs // n_nodes
+        self.used = pairs % n_nodes
+        self.indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.users, minlength=n_nodes), out=self.indptr[1:])
+
+    @classmethod
+    def from_graph(
+        cls, graph, edge_types: Sequence[str] = (EdgeType.CALL.name,)
+    ) -> "UsesMatrix":
+        """Uses of a graph opened with `byparse.stores.loading.open_graph`.
+
+        Snapshots edges are read from their arrays without decoding node ids
+        more than once.
+
+        """
+        if isinstance(graph, GraphSnapshot):
+            return cls._from_snapshot(graph, edge_types)
+        nodes = [node for node, _ in graph.iter_nodes()]
+        index = {node: i for i, node in enumerate(nodes)}
+        users, used = [], []
+        for source, target, edge_attrs in graph.iter_edges():
+            if edge_attrs.get("type") in edge_types:
+                used.append(index[source])
+                users.append(index[target])
+        return cls(
+            nodes, np.array(users, dtype=np.int64), np.array(used, dtype=np.int64)
+        )
+
+    @classmethod
+    def _from_snapshot(
+        cls, snapshot: GraphSnapshot, edge_types: Sequence[str]
+    ) -> "UsesMatrix":
+        codes = [EdgeType[edge_type].value for edge_type in edge_types]
+        edges_types = np.asarray(snapshot.edge_types, dtype=np.uint8)
+        selected = np.isin(edges_types, codes)
+        sources = np.asarray(snapshot.edge_sources, dtype=np.int64)[selected]
+        targets = np.asarray(snapshot.edge_targets, dtype=np.int64)[selected]
+        nodes = [snapshot.node_id(node) for node in range(snapshot.n_nodes)]
+        return cls(nodes, targets, sources)
+
+    def fan_in(self) -> np.ndarray:
+        return np.bincount(self.used, minlength=len(self.nodes))
+
+    def fan_out(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def pagerank(
+        self, alpha: float = 0.85, max_iter: int = 100, tol: float = 1.0e-6
+    ) -> np.ndarray:
+        """PageRank of the nodes, importance flowing from users to used names.
+
+        Converges like networkx: when the L1 change drops under `n_nodes * tol`.
+
+        """
+        n_nodes = len(self.nodes)
+        if n_nodes == 0:
+            return np.zeros(0)
+        fan_out = self.fan_out()
+        dangling = fan_out == 0
+        weights = np.zeros(n_nodes)
+        weights[~dangling] = 1.0 / fan_out[~dangling]
+        ranks = np.full(n_nodes, 1.0 / n_nodes)
+        for _ in range(max_iter):
+            spread = np.bincount(
+                self.used, weights=(ranks * weights)[self.users], minlength=n_nodes
+            )
+            uniform = (alpha * ranks[dangling].sum() + 1.0 - alpha) / n_nodes
+            new_ranks = alpha * spread + uniform
+            error = np.abs(new_ranks - ranks).sum()
+            ranks = new_ranks
+            if error < n_nodes * tol:
+                break
+        return ranks
+
+    def _expand(self, frontier: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Users and used positions of all the edges from the frontier nodes."""
+        starts = self.indptr[frontier]
+        counts = self.indptr[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return frontier[:0], frontier[:0]
+        shifts = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        edges = shifts + np.arange(total)
+        return np.repeat(frontier, counts), self.used[edges]
+
+    def betweenness(self, samples: Optional[int] = None, seed: int = 0) -> np.ndarray:
+        """Betweenness centrality, normalized like networkx for directed graphs.
+
+        Args:
+            samples (Optional[int]): Number of sampled sources, the estimate
+                being scaled by n_nodes / samples. Exact if None.
+            seed (int): Seed of the sources sampling.
+
+        """
+        n_nodes = len(self.nodes)
+        betweenness = np.zeros(n_nodes)
+        if samples is None or samples >= n_nodes:
+            sources = np.arange(n_nodes)
+        else:
+            rng = np.random.default_rng(seed)
+            sources = rng.choice(n_nodes, size=samples, replace=False)
+
+        distances = np.full(n_nodes, -1, dtype=np.int64)
+        paths = np.zeros(n_nodes)
+        dependencies = np.zeros(n_nodes)
+        for source in sources:
+            distances[source] = 0
+            paths[source] = 1.0
+            visited = [np.array([source])]
+            levels: List[Tuple[np.ndarray, np.ndarray]] = []
+            frontier = visited[0]
+            depth = 0
+            while frontier.size:
+                parents, children = self._expand(frontier)
+                depth += 1
+                unseen = distances[children] < 0
+                distances[children[unseen]] = depth
+                on_shortest = distances[children] == depth
+                parents, children = parents[on_shortest], children[on_shortest]
+                paths += np.bincount(
+                    children, weights=paths[parents], minlength=n_nodes
+                )
+                levels.append((parents, children))
+                frontier = np.unique(children)
+                visited.append(frontier)
+
+            for parents, children in reversed(levels):
+                shares = (
+                    paths[parents] / paths[children] * (1.0 + dependencies[children])
+                )
+                dependencies += np.bincount(parents, weights=shares, minlength=n_nodes)
+            dependencies[source] = 0.0
+            betweenness += dependencies
+
+            reached = np.concatenate(visited)
+            distances[reached] = -1
+            paths[reached] = 0.0
+            dependencies[reached] = 0.0
+
+        if n_nodes > 2:
+            betweenness /= (n_nodes - 1) * (n_nodes - 2)
+        return betweenness * (n_nodes / len(sources)) if len(sources) else betweenness
+
+
+def compute_metrics(
+    uses: UsesMatrix, samples: Optional[int] = 64, seed: int = 0
+) -> Dict[str, np.ndarray]:
+    """All the metrics of `METRICS`, by node position."""
+    return {
+        "fan_in": uses.fan_in(),
+        "fan_out": uses.fan_out(),
+        "pagerank": uses.pagerank(),
+        "betweenness": uses.betweenness(samples, seed),
+    }
+
+
+def iter_metrics_attributes(
+    nodes: Sequence[str], metrics: Dict[str, np.ndarray]
+) -> Iterator[Tuple[str, dict]]:
+    """Metrics of each node, as attributes for `graph.add_nodes_from`."""
+    columns = [(name, values.tolist()) for name, values in metrics.items()]
+    for position, node in enumerate(nodes):
+        yield node, {name: values[position] for name, values in columns}
+
+
+def write_metrics_csv(
+    nodes: Sequence[str],
+    metrics: Dict[str, np.ndarray],
+    path: Union[str, Path],
+    sort_by: Optional[str] = "pagerank",
+):
+    """Write one row per node with its metrics, highest `sort_by` first."""
+    order = range(len(nodes))
+    if sort_by is not None:
+        order = np.argsort(-metrics[sort_by], kind="stable").tolist()
+    columns = [values.tolist() for values in metrics.values()]
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file, lineterminator="\n")
+        writer.writerow(["node", *metrics])
+        for position in order:
+            writer.writerow(
+                [nodes[position], *(values[position] for values in columns)]
+            )
@@ -0,0 +1,126 @@
+"""Callers, callees and dependency paths queries on an adjacency index."""
+
+from collections import deque
+from typing import Dict, List, Optional, Sequence
+
+from byparse.abc import EdgeType
+from byparse.analysis.adjacency import AdjacencyIndex
+
+# Edges from a used name to the context using it
+DEPENDENCY_EDGES = (
+    EdgeType.CALL.name,
+    EdgeType.INHERITANCE.name,
+    EdgeType.TYPEHINT.name,
+)
+
+
+class GraphQuery:
+    """Queries on the symbols of a graph, answered from its adjacency index.
+
+    A context 'uses' a name when there is a CALL, INHERITANCE or TYPEHINT edge
+    from the name to the context.
+
+    Example:
+        >>> with open_graph("graph.bpg") as graph:
+        ...     query = GraphQuery(AdjacencyIndex.from_graph(graph))
+        ...     query.callers("package/module.py>func")
+
+    """
+
+    def __init__(self, adjacency: AdjacencyIndex) -> None:
+        self.adjacency = adjacency
+
+    def _nodes(self, positions: Sequence[int]) -> List[str]:
+        return [self.adjacency.nodes[position] for position in positions]
+
+    def callers(self, node: str) -> List[str]:
+        """Contexts calling the given function or class."""
+        position = self.adjacency.position(node)
+        return self._nodes(self.adjacency.neighbors(position, EdgeType.CALL.name))
+
+    def callees(self, node: str) -> List[str]:
+        """Functions and classes called by the given context."""
+        position = self.adjacency.position(node)
+        return self._nodes(
+            self.adjacency.neighbors(position, EdgeType.CALL.name, reverse=True)
+        )
+
+    def reachable(
+        self,
+        node: str,
+        edge_types: Sequence[str] = (EdgeType.CALL.name,),
+        reverse: bool = False,
+        max_depth: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """Nodes reached from a node following edges of the given types.
+
+        Args:
+            node (str): Node to start from, not part of the result.
+            edge_types (Sequence[str]): Types of the followed edges.
+            reverse (bool): Follow the edges backward.
+            max_depth (Optional[int]): Maximum number of edges followed, no limit if None.
+
+        Returns:
+            Dict[str, int]: Depth of each reached node, in breadth first order.
+
+        """
+        start = self.adjacency.position(node)
+        depths = {start: 0}
+        queue = deque([start])
+        while queue:
+            position = queue.popleft()
+            depth = depths[position] + 1
+            if max_depth is not None and depth > max_depth:
+                continue
+            for edge_type in edge_types:
+                for neighbor in self.adjacency.neighbors(position, edge_type, reverse):
+                    if neighbor not in depths:
+                        depths[neighbor] = depth
+                        queue.append(neighbor)
+        del depths[start]
+        return {
+            self.adjacency.nodes[position]: depth for position, depth in depths.items()
+        }
+
+    def transitive_callers(
+        self, node: str, max_depth: Optional[int] = None
+    ) -> Dict[str, int]:
+        return self.reachable(node, max_depth=max_depth)
+
+    def transitive_callees(
+        self, node: str, max_depth: Optional[int] = None
+    ) -> Dict[str, int]:
+        return self.reachable(node, reverse=True, max_depth=max_depth)
+
+    def dependency_path(
+        self,
+        source: str,
+        target: str,
+        edge_types: Sequence[str] = DEPENDENCY_EDGES,
+    ) -> Optional[List[str]]:
+        """Shortest chain of uses from a source context to a target symbol.
+
+        Returns:
+            Optional[List[str]]: Nodes from the source to the target,
+                None if the source does not depend on the target.
+
+        """
+        start = self.adjacency.position(source)
+        end = self.adjacency.position(target)
+        previous = {start: start}
+        queue = deque([start])
+        while queue and end not in previous:
+            position = queue.popleft()
+            for edge_type in edge_types:
+                for neighbor in self.adjacency.neighbors(
+                    position, edge_type, reverse=True
+                ):
+                    if neighbor not in previous:
+                        previous[neighbor] = position
+                        queue.append(neighbor)
+        if end not in previous:
+            return None
+        path = [end]
+        while path[-1] != start:
+            path.append(previous[path[-1]])
+        return self._nodes(path[::-1])
@@ -0,0 +1,98 @@
+"""Strongly connected components of an adjacency index, in linear time."""
+
+from array import array
+from itertools import chain
+from typing import Iterator, List, Sequence, Tuple
+
+from byparse.analysis.adjacency import AdjacencyIndex
+
+
+def iter_neighbors(
+    adjacency: AdjacencyIndex,
+    position: int,
+    edge_types: Sequence[str],
+    reverse: bool = False,
+) -> Iterator[int]:
+    if len(edge_types) == 1:
+        return iter(adjacency.neighbors(position, edge_types[0], reverse))
+    return chain.from_iterable(
+        adjacency.neighbors(position, edge_type, reverse) for edge_type in edge_types
+    )
+
+
+def strongly_connected_components(
+    adjacency: AdjacencyIndex, edge_types: Sequence[str], reverse: bool = False
+) -> Tuple[array, int]:
+    """Iterative Tarjan algorithm over the edges of the given types.
+
+    Components are numbered in the order Tarjan closes them, which is a reverse
+    topological order: an edge between two components always goes from a
+    higher numbered component to a lower numbered one.
+
+    Args:
+        adjacency (AdjacencyIndex): Graph to decompose.
+        edge_types (Sequence[str]): Types of the followed edges.
+        reverse (bool): Follow the edges backward.
+
+    Returns:
+        Tuple[array, int]: Component of each node position, and the number of components.
+
+    """
+    n_nodes = len(adjacency.nodes)
+    indexes = array("i", [-1]) * n_nodes
+    lowlinks = array("i", [0]) * n_nodes
+    on_stack = bytearray(n_nodes)
+    components = array("i", [-1]) * n_nodes
+    stack: List[int] = []
+    counter = 0
+    n_components = 0
+
+    for root in range(n_nodes):
+        if indexes[root] >= 0:
+            continue
+        indexes[root] = lowlinks[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [(root, iter_neighbors(adjacency, root, edge_types, reverse))]
+        while work:
+            node, neighbors = work[-1]
+            for neighbor in neighbors:
+                if indexes[neighbor] < 0:
+                    indexes[neighbor] = lowlinks[neighbor] = counter
+                    counter += 1
+                    stack.append(neighbor)
+                    on_stack[neighbor] = 1
+                    work.append(
+                        (
+                            neighbor,
+                            iter_neighbors(adjacency, neighbor, edge_types, reverse),
+                        )
+                    )
+                    break
+                if on_stack[neighbor] and indexes[neighbor] < lowlinks[node]:
+                    lowlinks[node] = indexes[neighbor]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if lowlinks[node] < lowlinks[parent]:
+                        lowlinks[parent] = lowlinks[node]
+                if lowlinks[node] == indexes[node]:
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        components[member] = n_components
+                        if member == node:
+                            break
+                    n_components += 1
+
+    return components, n_components
+
+
+def components_members(components: array, n_components: int) -> List[List[int]]:
+    """Node positions of each component."""
+    members: List[List[int]] = [[] for _ in range(n_components)]
+    for position, component in enumerate(components):
+        members[component].append(position)
+    return members
@@ -0,0 +1,92 @@
+"""Crawl many projects in one process, or in a pool of long-lived workers.
+
+Each process resolves installed packages once for all the projects it crawls,
+through the cache of `resolve_installed_path`, and pays the interpreter and
+imports startup only once. Every project is exported on its own, and a failing
+project is reported without stopping the others.
+
+"""
+
+import time
+import traceback
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from byparse.logging_utils import get_logger
+
+LOGGER = get_logger(__name__)
+
+
+def read_roots(path: Union[str, Path]) -> List[Path]:
+    """Project roots listed one per line, relative ones to the list folder.
+
+    Blank lines and lines starting with '#' are ignored.
+
+    """
+    path = Path(path)
+    roots = []
+    with open(path, "r", encoding="utf8") as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            roots.append(path.parent / line)
+    return roots
+
+
+def output_names(roots: List[Path]) -> Dict[Path, str]:
+    """Unique name of each root, to name its outputs.
+
+    Roots with the same folder name are suffixed with their rank, as '_2'.
+
+    """
+    names: Dict[Path, str] = {}
+    used: Dict[str, int] = {}
+    for root in roots:
+        name = root.resolve().name
+        used[name] = used.get(name, 0) + 1
+        if used[name] > 1:
+            name = f"{name}_{used[name]}"
+        names[root] = name
+    return names
+
+
+def _run_task(
+    task: Tuple[Callable[..., None], Path, tuple],
+) -> Tuple[Path, float, Optional[str]]:
+    function, root, function_args = task
+    start = time.perf_counter()
+    try:
+        function(root, *function_args)
+    except Exception:  # Reported with the project, the batch goes on
+        return root, time.perf_counter() - start, traceback.format_exc()
+    return root, time.perf_counter() - start, None
+
+
+def run_batch(
+    function: Callable[..., None],
+    tasks_args: Dict[Path, tuple],
+    jobs: int = 1,
+) -> Iterator[Tuple[Path, float, Optional[str]]]:
+    """Call a function on each project, in this process or in worker processes.
+
+    Args:
+        function (Callable[..., None]): Called with a root and its arguments.
+            Must be importable by the workers if `jobs` is more than 1.
+        tasks_args (Dict[Path, tuple]): Arguments of the call for each root.
+        jobs (int): Number of worker processes, each one crawling its share of
+            projects with its own caches. Projects run in this process if 1.
+
+    Yields:
+        Tuple[Path, float, Optional[str]]: Root, seconds spent on it, and the
+            traceback if it failed, in order of completion.
+
+    """
+    tasks = [(function, root, args) for root, args in tasks_args.items()]
+    if jobs <= 1:
+        for task in tasks:
+            yield _run_task(task)
+        return
+    with Pool(processes=min(jobs, len(tasks)) or 1) as pool:
+        yield from pool.imap_unordered(_run_task, tasks)
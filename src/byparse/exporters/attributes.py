@@ -0,0 +1,58 @@
+"""Attributes of nodes and edges as flat columns, for tabular and typed formats."""
+
+from typing import Dict, Iterable, Tuple
+
+# Types of columns, from the most to the least specific
+COLUMN_TYPES = (bool, int, float, str)
+
+# Attributes not exported, the hierarchy being given by the edges
+SKIPPED_ATTRIBUTES = ("parent", "ast")
+
+
+def flat_attrs(attrs: dict) -> dict:
+    """Scalar attributes of an element, positions being split in 'x' and 'y'."""
+    flat = {}
+    for key, value in attrs.items():
+        if key in SKIPPED_ATTRIBUTES or value is None:
+            continue
+        if key == "position" and isinstance(value, dict):
+            flat["x"], flat["y"] = value["x"], value["y"]
+        elif isinstance(value, COLUMN_TYPES):
+            flat[key] = value
+        else:
+            flat[key] = str(value)
+    return flat
+
+
+def _column_type(value) -> type:
+    for column_type in COLUMN_TYPES:
+        if isinstance(value, column_type):
+            return column_type
+    return str
+
+
+def scan_columns(attrs_iterable: Iterable[dict]) -> Dict[str, type]:
+    """Columns of flat attributes and the most specific type holding all values.
+
+    Only the columns are kept in memory, ints and floats being merged into floats
+    and any other mix of types into strings.
+
+    """
+    columns: Dict[str, type] = {}
+    for attrs in attrs_iterable:
+        for key, value in flat_attrs(attrs).items():
+            column_type = _column_type(value)
+            known_type = columns.get(key, column_type)
+            if known_type is not column_type:
+                column_type = (
+                    float if {known_type, column_type} == {int, float} else str
+                )
+            columns[key] = column_type
+    return columns
+
+
+def graph_columns(graph) -> Tuple[Dict[str, type], Dict[str, type]]:
+    """Columns of the nodes and of the edges of a graph."""
+    nodes_columns = scan_columns(attrs for _, attrs in graph.nodes(data=True))
+    edges_columns = scan_columns(attrs for _, _, attrs in graph.edges(data=True))
+    return nodes_columns, edges_columns
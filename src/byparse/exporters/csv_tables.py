@@ -0,0 +1,87 @@
+"""Streaming nodes and edges CSV files, in the graph databases bulk import layout.
+
+The headers follow the `neo4j-admin database import` conventions, also read by
+Memgraph and Kuzu loaders: nodes have an ':ID' column and their type as
+':LABEL', edges have ':START_ID', ':END_ID' and ':TYPE' columns. Other
+attributes get typed columns, as 'count:long'.
+
+"""
+
+import csv
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import networkx as nx
+
+from byparse.exporters.attributes import flat_attrs, graph_columns
+from byparse.exporters.cytoscape_json import open_text_output
+
+CSV_TYPES = {bool: "boolean", int: "long", float: "double", str: "string"}
+
+
+def _header(column: str, column_type: type) -> str:
+    if column_type is str:
+        return column
+    return f"{column}:{CSV_TYPES[column_type]}"
+
+
+def _row(attrs: dict, columns: Dict[str, type]) -> list:
+    flat = flat_attrs(attrs)
+    row = []
+    for column in columns:
+        value = flat.get(column, "")
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        row.append(value)
+    return row
+
+
+def write_csv_tables(
+    graph: nx.MultiDiGraph,
+    output_dir: Union[str, Path],
+    compress: Optional[bool] = None,
+):
+    """Write the nodes and the edges of a graph to nodes.csv and edges.csv.
+
+    Args:
+        graph (nx.MultiDiGraph): Graph to export.
+        output_dir (Union[str, Path]): Directory to write the files into.
+        compress (Optional[bool]): Compress using gzip, as nodes.csv.gz.
+
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    suffix = ".gz" if compress else ""
+
+    nodes_columns, edges_columns = graph_columns(graph)
+    nodes_columns.pop("type", None)
+    edges_columns.pop("type", None)
+
+    with open_text_output(output_dir / f"nodes.csv{suffix}", compress) as fp:
+        writer = csv.writer(fp, lineterminator="\n")
+        writer.writerow(
+            [":ID", ":LABEL"]
+            + [
+                _header(column, column_type)
+                for column, column_type in nodes_columns.items()
+            ]
+        )
+        for node, node_attrs in graph.nodes(data=True):
+            writer.writerow(
+                [node, node_attrs.get("type", "")] + _row(node_attrs, nodes_columns)
+            )
+
+    with open_text_output(output_dir / f"edges.csv{suffix}", compress) as fp:
+        writer = csv.writer(fp, lineterminator="\n")
+        writer.writerow(
+            [":START_ID", ":END_ID", ":TYPE"]
+            + [
+                _header(column, column_type)
+                for column, column_type in edges_columns.items()
+            ]
+        )
+        for source, target, edge_attrs in graph.edges(data=True):
+            writer.writerow(
+                [source, target, edge_attrs.get("type", "")]
+                + _row(edge_attrs, edges_columns)
+            )
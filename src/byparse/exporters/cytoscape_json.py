@@ -0,0 +1,152 @@
+"""Streaming writers of cytoscape elements as JSON or NDJSON."""
+
+import gzip
+import json
+import textwrap
+from pathlib import Path
+from typing import Dict, Iterable, Optional, TextIO, Union
+
+import networkx as nx
+
+from byparse.visualisation.cytoscape_fcose import (
+    iter_cytoscape_edges,
+    iter_cytoscape_nodes,
+)
+
+COMPACT_SEPARATORS = (",", ":")
+
+
+def open_text_output(path: Union[str, Path], compress: Optional[bool] = None) -> TextIO:
+    """Open a text file for writing, gzip compressed on the fly if asked.
+
+    Args:
+        path (Union[str, Path]): Path of the file to write.
+        compress (Optional[bool]): Compress using gzip.
+            Defaults to True if the path ends with '.gz'.
+
+    """
+    if compress is None:
+        compress = str(path).endswith(".gz")
+    if compress:
+        return gzip.open(path, "wt", encoding="utf8")
+    return open(path, "w", encoding="utf8")
+
+
+def json_encoder(indent: Optional[int] = None) -> json.JSONEncoder:
+    if indent is None:
+        return json.JSONEncoder(separators=COMPACT_SEPARATORS)
+    return json.JSONEncoder(indent=indent)
+
+
+def write_json(
+    obj: object,
+    path: Union[str, Path],
+    indent: Optional[int] = None,
+    compress: Optional[bool] = None,
+):
+    """Write a small json object, compact unless an indent is given."""
+    with open_text_output(path, compress) as fp:
+        for chunk in json_encoder(indent).iterencode(obj):
+            fp.write(chunk)
+
+
+def _write_json_array(
+    fp: TextIO, elements: Iterable[dict], encoder: json.JSONEncoder, indent: int
+):
+    fp.write("[")
+    separator = ""
+    for element in elements:
+        encoded = encoder.encode(element)
+        if encoder.indent is not None:
+            encoded = "\n" + textwrap.indent(encoded, " " * indent)
+        fp.write(separator)
+        fp.write(encoded)
+        separator = ","
+    if encoder.indent is not None and separator:
+        fp.write("\n" + " " * (indent - int(encoder.indent)))
+    fp.write("]")
+
+
+def write_json_arrays(
+    arrays: Dict[str, Iterable[dict]],
+    path: Union[str, Path],
+    indent: Optional[int] = None,
+    compress: Optional[bool] = None,
+):
+    """Write a json object of arrays, consuming each array one element at a time.
+
+    Args:
+        arrays (Dict[str, Iterable[dict]]): Elements of each key, written in order.
+        path (Union[str, Path]): Path of the json file to write.
+        indent (Optional[int]): Indentation of the json, compact if None.
+        compress (Optional[bool]): Compress using gzip.
+            Defaults to True if the path ends with '.gz'.
+
+    """
+    encoder = json_encoder(indent)
+    newline = "" if indent is None else "\n"
+    key_indent = "" if indent is None else " " * indent
+    key_separator = ":" if indent is None else ": "
+    with open_text_output(path, compress) as fp:
+        fp.write("{")
+        separator = ""
+        for key, elements in arrays.items():
+            fp.write(separator + newline + key_indent)
+            fp.write(encoder.encode(key) + key_separator)
+            _write_json_array(fp, elements, encoder, 2 * (indent or 0))
+            separator = ","
+        fp.write(newline + "}")
+
+
+def write_cytoscape_json(
+    graph: nx.MultiDiGraph,
+    path: Union[str, Path],
+    indent: Optional[int] = None,
+    compress: Optional[bool] = None,
+):
+    """Write the cytoscape elements of a graph one element at a time.
+
+    The written file is the same json object as the one given by
+    `networkx_to_cytoscape_fcose`, without ever building it in memory.
+
+    Args:
+        graph (nx.MultiDiGraph): Graph to export.
+        path (Union[str, Path]): Path of the json file to write.
+        indent (Optional[int]): Indentation of the json, compact if None.
+        compress (Optional[bool]): Compress using gzip.
+            Defaults to True if the path ends with '.gz'.
+
+    """
+    write_json_arrays(
+        {"nodes": iter_cytoscape_nodes(graph), "edges": iter_cytoscape_edges(graph)},
+        path,
+        indent=indent,
+        compress=compress,
+    )
+
+
+def write_cytoscape_ndjson(
+    graph: nx.MultiDiGraph,
+    path: Union[str, Path],
+    compress: Optional[bool] = None,
+):
+    """Write the cytoscape elements of a graph as newline delimited json.
+
+    Each line is a cytoscape element with its 'group' ('nodes' or 'edges'),
+    all nodes being written before the edges.
+
+    Args:
+        graph (nx.MultiDiGraph): Graph to export.
+        path (Union[str, Path]): Path of the ndjson file to write.
+        compress (Optional[bool]): Compress using gzip.
+            Defaults to True if the path ends with '.gz'.
+
+    """
+    encoder = json_encoder()
+    with open_text_output(path, compress) as fp:
+        for node in iter_cytoscape_nodes(graph):
+            fp.write(encoder.encode({"group": "nodes", **node}))
+            fp.write("\n")
+        for edge in iter_cytoscape_edges(graph):
+            fp.write(encoder.encode({"group": "edges", **edge}))
+            fp.write("\n")
@@ -0,0 +1,61 @@
+"""Streaming Graphviz DOT writer."""
+
+from pathlib import Path
+from typing import Optional, Union
+
+import networkx as nx
+
+from byparse.exporters.attributes import flat_attrs
+from byparse.exporters.cytoscape_json import open_text_output
+
+# Attributes renamed to their Graphviz equivalent
+DOT_ATTRIBUTES = {"linestyle": "style"}
+# Attributes that have another meaning in Graphviz
+SKIPPED_DOT_ATTRIBUTES = ("arrow", "x", "y")
+
+
+def dot_id(text: str) -> str:
+    escaped = str(text).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _dot_attrs(attrs: dict) -> str:
+    flat = flat_attrs(attrs)
+    dot_attrs = []
+    for key, value in flat.items():
+        if key in SKIPPED_DOT_ATTRIBUTES:
+            continue
+        dot_attrs.append(f"{DOT_ATTRIBUTES.get(key, key)}={dot_id(value)}")
+    if "x" in flat:
+        # Graphviz y axis goes up, pinned with '!'
+        dot_attrs.append(f'pos="{flat["x"]},{-flat["y"]}!"')
+    if not dot_attrs:
+        return ""
+    return " [" + ", ".join(dot_attrs) + "]"
+
+
+def write_dot(
+    graph: nx.MultiDiGraph,
+    path: Union[str, Path],
+    name: str = "byparse",
+    compress: Optional[bool] = None,
+):
+    """Write a graph in the Graphviz DOT language one element at a time.
+
+    Args:
+        graph (nx.MultiDiGraph): Graph to export.
+        path (Union[str, Path]): Path of the dot file to write.
+        name (str): Name of the digraph.
+        compress (Optional[bool]): Compress using gzip.
+            Defaults to True if the path ends with '.gz'.
+
+    """
+    with open_text_output(path, compress) as fp:
+        fp.write(f"digraph {dot_id(name)} {{\n")
+        for node, node_attrs in graph.nodes(data=True):
+            fp.write(f"  {dot_id(node)}{_dot_attrs(node_attrs)};\n")
+        for source, target, edge_attrs in graph.edges(data=True):
+            fp.write(
+                f"  {dot_id(source)} -> {dot_id(target)}{_dot_attrs(edge_attrs)};\n"
+            )
+        fp.write("}\n")
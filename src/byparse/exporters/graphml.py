@@ -0,0 +1,80 @@
+"""Streaming GraphML writer, readable by Gephi, yEd or networkx."""
+
+from pathlib import Path
+from typing import Dict, Optional, TextIO, Union
+from xml.sax.saxutils import escape, quoteattr
+
+import networkx as nx
+
+from byparse.exporters.attributes import flat_attrs, graph_columns
+from byparse.exporters.cytoscape_json import open_text_output
+
+GRAPHML_TYPES = {bool: "boolean", int: "long", float: "double", str: "string"}
+
+GRAPHML_HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<graphml xmlns="http://graphml.graphdrawing.org/xmlns"
+  xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+  xsi:schemaLocation="http://graphml.graphdrawing.org/xmlns
+  http://graphml.graphdrawing.org/xmlns/1.0/graphml.xsd">
+"""
+
+
+def _graphml_value(value) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return escape(str(value))
+
+
+def _write_keys(fp: TextIO, domain: str, columns: Dict[str, type]) -> Dict[str, str]:
+    keys_ids: Dict[str, str] = {}
+    for column, column_type in columns.items():
+        key_id = f"{domain[0]}{len(keys_ids)}"
+        keys_ids[column] = key_id
+        fp.write(
+            f"  <key id={quoteattr(key_id)} for={quoteattr(domain)}"
+            f" attr.name={quoteattr(column)}"
+            f" attr.type={quoteattr(GRAPHML_TYPES[column_type])}/>\n"
+        )
+    return keys_ids
+
+
+def _write_data(fp: TextIO, attrs: dict, keys_ids: Dict[str, str]):
+    for key, value in flat_attrs(attrs).items():
+        fp.write(f'    <data key="{keys_ids[key]}">{_graphml_value(value)}</data>\n')
+
+
+def write_graphml(
+    graph: nx.MultiDiGraph,
+    path: Union[str, Path],
+    compress: Optional[bool] = None,
+):
+    """Write a graph as GraphML one element at a time.
+
+    Attribute keys are declared from a first scan of the attributes names and
+    types, then each node and edge is written as soon as it is read.
+
+    Args:
+        graph (nx.MultiDiGraph): Graph to export.
+        path (Union[str, Path]): Path of the GraphML file to write.
+        compress (Optional[bool]): Compress using gzip.
+            Defaults to True if the path ends with '.gz'.
+
+    """
+    nodes_columns, edges_columns = graph_columns(graph)
+    with open_text_output(path, compress) as fp:
+        fp.write(GRAPHML_HEADER)
+        nodes_keys = _write_keys(fp, "node", nodes_columns)
+        edges_keys = _write_keys(fp, "edge", edges_columns)
+        fp.write('  <graph edgedefault="directed">\n')
+        for node, node_attrs in graph.nodes(data=True):
+            fp.write(f"  <node id={quoteattr(str(node))}>\n")
+            _write_data(fp, node_attrs, nodes_keys)
+            fp.write("  </node>\n")
+        for source, target, edge_attrs in graph.edges(data=True):
+            fp.write(
+                f"  <edge source={quoteattr(str(source))}"
+                f" target={quoteattr(str(target))}>\n"
+            )
+            _write_data(fp, edge_attrs, edges_keys)
+            fp.write("  </edge>\n")
+        fp.write("  </graph>\n</graphml>\n")
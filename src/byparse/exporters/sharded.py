@@ -0,0 +1,119 @@
+"""Sharded cytoscape export, for progressive loading in the viewer.
+
+The export is a directory holding:
+
+    overview.json         top level folders and files of the project
+    shards/<n>.json       content of the folder n: its subfolders, its files
+                          and their contexts, and the edges between them
+    shards/<n>.cross.json edges between this folder content and other shards
+
+Folder nodes are collapsed in the shard of their parent folder, with a 'count'
+of nodes under them and the path of their own 'shard'. The viewer starts from
+the overview and loads a folder shard when the folder is expanded, so the first
+load does not depend on the size of the project.
+
+"""
+
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import networkx as nx
+
+from byparse.abc import NodeType
+from byparse.graphs.hierarchy import HIERARCHY_EDGES, HierarchyIndex
+from byparse.visualisation.cytoscape_fcose import cytoscape_edge, cytoscape_node
+from byparse.exporters.cytoscape_json import write_json
+
+OVERVIEW = -1  # Shard of the nodes without any parent folder
+OVERVIEW_PATH = "overview.json"
+
+
+def cross_shard_path(shard_path: str) -> str:
+    return shard_path[: -len(".json")] + ".cross.json"
+
+
+def write_sharded_cytoscape(
+    graph: nx.MultiDiGraph,
+    output_dir: Union[str, Path],
+    hierarchy: Optional[HierarchyIndex] = None,
+    indent: Optional[int] = None,
+):
+    """Write the cytoscape elements of a graph as one shard per folder.
+
+    Args:
+        graph (nx.MultiDiGraph): Graph to export.
+        output_dir (Union[str, Path]): Directory to write the shards into.
+        hierarchy (Optional[HierarchyIndex]): Hierarchy of the graph, built if not given.
+        indent (Optional[int]): Indentation of the json, compact if None.
+
+    """
+    if hierarchy is None:
+        hierarchy = HierarchyIndex(graph)
+    output_dir = Path(output_dir)
+    (output_dir / "shards").mkdir(parents=True, exist_ok=True)
+
+    is_folder = [
+        graph.nodes[node].get("type") == NodeType.FOLDER.name
+        for node in hierarchy.nodes
+    ]
+
+    # Each node goes in the shard of its closest folder ancestor
+    shards = array("i", [OVERVIEW]) * len(hierarchy.nodes)
+    members: Dict[int, List[int]] = {OVERVIEW: []}
+    shard_paths: Dict[int, str] = {OVERVIEW: OVERVIEW_PATH}
+    for i in hierarchy.order:
+        parent = hierarchy.parents[i]
+        if parent >= 0:
+            shards[i] = parent if is_folder[parent] else shards[parent]
+        members[shards[i]].append(i)
+        if is_folder[i]:
+            members[i] = []
+            shard_paths[i] = f"shards/{len(shard_paths) - 1}.json"
+
+    internal_edges: Dict[int, List[Tuple[str, str, dict]]] = {}
+    cross_edges: Dict[int, List[Tuple[str, str, dict]]] = {}
+    for source, target, edge_attrs in graph.edges(data=True):
+        if edge_attrs["type"] in HIERARCHY_EDGES:
+            continue
+        source_shard = shards[hierarchy.index[source]]
+        target_shard = shards[hierarchy.index[target]]
+        edge = (source, target, edge_attrs)
+        if source_shard == target_shard:
+            internal_edges.setdefault(source_shard, []).append(edge)
+        else:
+            cross_edges.setdefault(source_shard, []).append(edge)
+            cross_edges.setdefault(target_shard, []).append(edge)
+
+    for shard, shard_members in members.items():
+        nodes = []
+        for i in shard_members:
+            element = cytoscape_node(
+                hierarchy.nodes[i], graph.nodes[hierarchy.nodes[i]]
+            )
+            if is_folder[i]:
+                element["data"]["count"] = hierarchy.subtree_sizes[i] - 1
+                element["data"]["shard"] = shard_paths[i]
+            nodes.append(element)
+        edges = [cytoscape_edge(*edge) for edge in internal_edges.get(shard, [])]
+        write_json(
+            {"nodes": nodes, "edges": edges},
+            output_dir / shard_paths[shard],
+            indent=indent,
+        )
+
+        cross = []
+        for source, target, edge_attrs in cross_edges.get(shard, []):
+            element = cytoscape_edge(source, target, edge_attrs)
+            element["data"]["sourceShard"] = shard_paths[
+                shards[hierarchy.index[source]]
+            ]
+            element["data"]["targetShard"] = shard_paths[
+                shards[hierarchy.index[target]]
+            ]
+            cross.append(element)
+        write_json(
+            {"edges": cross},
+            output_dir / cross_shard_path(shard_paths[shard]),
+            indent=indent,
+        )
@@ -1,5 +1,7 @@
+import builtins
+import logging
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Dict, Optional, Sequence, Tuple, Union
 
 import ast
 import networkx as nx
@@ -8,7 +10,8 @@ from byparse.abc import EdgeType
 from byparse.utils import link_path_to_name, root_ast_to_node_type
 from byparse.path_resolvers.imports import resolve_aliases_paths
 from byparse.path_resolvers.names import resolve_name
-from byparse.logging_utils import get_logger
+from byparse.logging_utils import get_logger, trace_sampled
+from byparse.profiling import phase
 
 LOGGER = get_logger(__name__)
 
@@ -44,11 +47,11 @@ def add_context_node(
 
     node_type = root_ast_to_node_type(context.root_ast)
 
-    if str(context_path) not in graph.nodes():
+    if not graph.has_node(str(context_path)):
         graph.add_node(str(context_path), label=label, type=node_type)
 
 
-def asts_to_names(asts: List[ast.AST]):
+def asts_to_names(asts: Sequence[Optional[ast.AST]]):
     annotations_names = []
     for ast_elem in asts:
         if ast_elem is None:
@@ -58,27 +61,31 @@ def asts_to_names(asts: List[ast.AST]):
         elif isinstance(ast_elem, ast.Constant):
             annotations_names.append(ast_elem.value)
         else:
-            LOGGER.warning(f"Unsupported annotation type: {type(ast_elem)}")
+            LOGGER.warning("Unsupported annotation type: %s", type(ast_elem))
     return annotations_names
 
 
-def add_context_calls_edges(
-    graph: nx.MultiDiGraph,
-    project: "ProjectCrawler",
+def resolve_context_scope(
     module: "ModuleCrawler",
     context: "AstContextCrawler",
-    context_path: Union[Path, str],
-    aliases_paths: Dict["ast.alias", Path] = None,
-    used_names: Dict[str, "ast.alias"] = None,
-    known_contexts: Dict[str, "AstContextCrawler"] = None,
-):
-
-    # Add local imports
+    aliases_paths: Optional[Dict["ast.alias", Path]] = None,
+    used_names: Optional[Dict[str, "ast.alias"]] = None,
+    known_contexts: Optional[Dict[str, "AstContextCrawler"]] = None,
+) -> Tuple[
+    Dict["ast.alias", Path], Dict[str, "ast.alias"], Dict[str, "AstContextCrawler"]
+]:
+    """Merge the names visible from a context with the ones of its parents.
+
+    Returns:
+        Tuple of the local aliases paths, used names and known contexts.
+
+    """
     aliases_paths = {} if aliases_paths is None else aliases_paths
     used_names = {} if used_names is None else used_names
-    local_aliases_paths, local_used_names = resolve_aliases_paths(
-        context.imports, str(module.root)
-    )
+    with phase("imports"):
+        local_aliases_paths, local_used_names = resolve_aliases_paths(
+            context.imports, str(module.root)
+        )
 
     local_aliases_paths.update(aliases_paths)
     local_used_names.update(used_names)
@@ -88,7 +95,22 @@ def add_context_calls_edges(
     local_known_contexts.update(context.known_names)
     local_known_contexts.update(known_contexts)
 
-    def add_namelink_edge(name: str, edge_type: EdgeType):
+    return local_aliases_paths, local_used_names, local_known_contexts
+
+
+def add_namelink_edge(
+    graph: nx.MultiDiGraph,
+    project: "ProjectCrawler",
+    module: "ModuleCrawler",
+    context: "AstContextCrawler",
+    context_path: Union[Path, str],
+    name: str,
+    edge_type: EdgeType,
+    local_known_contexts: Dict[str, "AstContextCrawler"],
+    local_used_names: Dict[str, "ast.alias"],
+    local_aliases_paths: Dict["ast.alias", Path],
+):
+    with phase("resolve"):
         name_path, name_type = resolve_name(
             name,
             module.path,
@@ -99,56 +121,115 @@ def add_context_calls_edges(
             local_aliases_paths,
         )
 
-        if not name_path:
+    if trace_sampled():
+        LOGGER.info(
+            "Resolution trace: %s in %s resolved to %s (%s)"
+            " local_known_contexts:%s local_used_names:%s",
+            name,
+            context.path,
+            name_path,
+            name_type,
+            list(local_known_contexts),
+            list(local_used_names),
+        )
+
+    if not name_path:
+        if LOGGER.isEnabledFor(logging.DEBUG):
             LOGGER.debug(
                 "Could not find path for name: %s in %s local_known_contexts:%s"
                 " nor in local_used_names:%s",
                 name,
-                str(context.path),
-                str(list(local_known_contexts.keys())),
-                str(list(local_used_names.keys())),
+                context.path,
+                list(local_known_contexts),
+                list(local_used_names),
             )
-            return
-
-        if project.path.parts[0] in str(name_path):
-            name_path = str(Path(name_path).relative_to(project.path))
+        return
 
-        if str(name_path) not in graph.nodes():
-            graph.add_node(str(name_path), label=name.split(".")[-1], type=name_type)
-        graph.add_edge(str(name_path), str(context_path), type=edge_type.name)
+    if Path(name_path).is_absolute():
+        name_path = str(Path(name_path).relative_to(project.path.absolute()))
 
-    def add_calls_edges():
-        for call_name, _ in context.calls.items():
+    name_node = str(name_path)
+    if not graph.has_node(name_node):
+        graph.add_node(name_node, label=name.split(".")[-1], type=name_type)
+    graph.add_edge(name_node, str(context_path), type=edge_type.name)
 
-            # Ignore builtins calls
-            if call_name in __builtins__:
-                continue
 
-            add_namelink_edge(call_name, EdgeType.CALL)
+def add_context_links(
+    graph: nx.MultiDiGraph,
+    project: "ProjectCrawler",
+    module: "ModuleCrawler",
+    context: "AstContextCrawler",
+    context_path: Union[Path, str],
+    local_known_contexts: Dict[str, "AstContextCrawler"],
+    local_used_names: Dict[str, "ast.alias"],
+    local_aliases_paths: Dict["ast.alias", Path],
+):
+    """Add the calls, inheritance and typehints edges leading to a context."""
+
+    def add_context_namelink_edge(name: str, edge_type: EdgeType):
+        add_namelink_edge(
+            graph,
+            project,
+            module,
+            context,
+            context_path,
+            name,
+            edge_type,
+            local_known_contexts,
+            local_used_names,
+            local_aliases_paths,
+        )
 
-    def add_inheritance_edges():
+    if isinstance(context.root_ast, ast.ClassDef):
         for base_name in asts_to_names(context.root_ast.bases):
-            add_namelink_edge(base_name, EdgeType.INHERITANCE)
+            add_context_namelink_edge(base_name, EdgeType.INHERITANCE)
 
-    def add_typehints_edges():
-        for name in asts_to_names([x.annotation for x in context.root_ast.args.args]):
+    if isinstance(context.root_ast, ast.FunctionDef):
+        args = context.root_ast.args.args
+        for name in asts_to_names([x.annotation for x in args]):
 
             # Ignore builtins type hints
-            if name in __builtins__:
+            if name in vars(builtins):
                 continue
 
-            add_namelink_edge(name, EdgeType.TYPEHINT)
+            add_context_namelink_edge(name, EdgeType.TYPEHINT)
 
-    # Add context node
-    add_context_node(graph, context_path, context)
+    for call_name, _ in context.calls.items():
 
-    if isinstance(context.root_ast, ast.ClassDef):
-        add_inheritance_edges()
+        # Ignore builtins calls
+        if call_name in vars(builtins):
+            continue
+
+        add_context_namelink_edge(call_name, EdgeType.CALL)
 
-    if isinstance(context.root_ast, ast.FunctionDef):
-        add_typehints_edges()
 
-    add_calls_edges()
+def add_context_calls_edges(
+    graph: nx.MultiDiGraph,
+    project: "ProjectCrawler",
+    module: "ModuleCrawler",
+    context: "AstContextCrawler",
+    context_path: Union[Path, str],
+    aliases_paths: Optional[Dict["ast.alias", Path]] = None,
+    used_names: Optional[Dict[str, "ast.alias"]] = None,
+    known_contexts: Optional[Dict[str, "AstContextCrawler"]] = None,
+):
+    local_aliases_paths, local_used_names, local_known_contexts = resolve_context_scope(
+        module, context, aliases_paths, used_names, known_contexts
+    )
+
+    # Add context node
+    add_context_node(graph, context_path, context)
+
+    add_context_links(
+        graph,
+        project,
+        module,
+        context,
+        context_path,
+        local_known_contexts,
+        local_used_names,
+        local_aliases_paths,
+    )
 
     # Recurse on subcontexts (functions & classes)
     for subcontext_name, subcontext in context.known_names.items():
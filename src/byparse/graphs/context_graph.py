@@ -1,9 +1,9 @@
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, Optional
+from typing import TYPE_CHECKING, Dict, Optional, Set
 import networkx as nx
 
 from byparse.abc import NodeType, EdgeType
-from byparse.utils import link_path_to_name
+from byparse.utils import ast_lines, link_path_to_name
 
 if TYPE_CHECKING:
     from byparse.context_crawl import AstContextCrawler
@@ -18,22 +18,46 @@ def build_contexts_graph(
     if graph is None:
         graph = nx.MultiDiGraph()
 
+    known_folders: Set[Path] = set()
     for module_path, module_crawler in project.modules.items():
         graph.add_node(
-            str(module_path), label=module_path.name, type=NodeType.FILE.name
+            str(module_path),
+            label=module_path.name,
+            type=NodeType.FILE.name,
+            lines=len(module_crawler.source.splitlines()),
         )
-        _add_parent_folders(graph, module_path)
+        add_parent_folders(graph, module_path, known_folders)
         _add_sub_contexts(graph, module_path, module_crawler.context)
 
     return graph
 
 
-def _add_parent_folders(graph: nx.MultiDiGraph, path: Path):
+def add_parent_folders(
+    graph: nx.MultiDiGraph,
+    path: Path,
+    known_folders: Optional[Set[Path]] = None,
+):
+    """Link a path to its chain of parent folders.
+
+    Args:
+        graph (nx.MultiDiGraph): Graph to add the folders to.
+        path (Path): Path relative to the project root.
+        known_folders (Optional[Set[Path]]): Folders already linked to their own parents,
+            the chain stops at the first of them. Updated in place.
+
+    """
     parent = path.parent
-    if str(parent) != ".":
+    if str(parent) == ".":
+        return
+    already_known = known_folders is not None and parent in known_folders
+    if not already_known:
         graph.add_node(str(parent), label=parent.name, type=NodeType.FOLDER.name)
-        graph.add_edge(str(path), str(parent), type=EdgeType.PATH.name)
-        _add_parent_folders(graph, parent)
+    graph.add_edge(str(path), str(parent), type=EdgeType.PATH.name)
+    if already_known:
+        return
+    if known_folders is not None:
+        known_folders.add(parent)
+    add_parent_folders(graph, parent, known_folders)
 
 
 def _add_sub_contexts(
@@ -45,7 +69,12 @@ def _add_sub_contexts(
         attr_contexts: Dict[str, "AstContextCrawler"] = getattr(context, attr_name)
         for name, subcontext in attr_contexts.items():
             subcontext_path = link_path_to_name(context_path, name)
-            graph.add_node(subcontext_path, label=name, type=node_type)
+            graph.add_node(
+                subcontext_path,
+                label=name,
+                type=node_type,
+                lines=ast_lines(subcontext.root_ast),
+            )
             graph.add_edge(
                 subcontext_path,
                 str(context_path),
@@ -0,0 +1,95 @@
+from array import array
+from typing import Dict, Iterator, List, Optional
+
+import networkx as nx
+
+from byparse.abc import EdgeType
+
+HIERARCHY_EDGES = (EdgeType.CONTEXT.name, EdgeType.PATH.name)
+
+
+class HierarchyIndex:
+    """Folders, files and contexts tree of a graph, from its CONTEXT and PATH edges.
+
+    Built once in a few linear passes and stored in flat arrays indexed by node
+    position in `nodes`, to be shared by the exporters, the constraints and the
+    level of detail aggregation.
+
+    Attributes:
+        nodes (List[str]): Nodes of the graph.
+        index (Dict[str, int]): Position of each node in `nodes`.
+        parents (array): Parent position of each node, -1 for roots.
+        children_offsets (array): `children[children_offsets[i]:children_offsets[i+1]]`
+            are the children positions of the node i.
+        children (array): Children positions, grouped by parent.
+        depths (array): Depth of each node, 0 for roots.
+        subtree_sizes (array): Number of nodes in the subtree of each node,
+            including itself.
+        order (array): Node positions ordered from the roots down, each node
+            coming after its parent.
+
+    """
+
+    def __init__(self, graph: nx.MultiDiGraph) -> None:
+        self.nodes: List[str] = list(graph.nodes)
+        self.index: Dict[str, int] = {node: i for i, node in enumerate(self.nodes)}
+        n_nodes = len(self.nodes)
+
+        self.parents = array("i", [-1]) * n_nodes
+        for source, target, edge_type in graph.edges(data="type"):
+            if edge_type in HIERARCHY_EDGES:
+                self.parents[self.index[source]] = self.index[target]
+
+        counts = [0] * (n_nodes + 1)
+        for parent in self.parents:
+            if parent >= 0:
+                counts[parent + 1] += 1
+        self.children_offsets = array("I", [0]) * (n_nodes + 1)
+        for i in range(n_nodes):
+            self.children_offsets[i + 1] = self.children_offsets[i] + counts[i + 1]
+        self.children = array("I", [0]) * self.children_offsets[n_nodes]
+        filled = array("I", self.children_offsets[:-1])
+        for child, parent in enumerate(self.parents):
+            if parent >= 0:
+                self.children[filled[parent]] = child
+                filled[parent] += 1
+
+        self.depths = array("I", [0]) * n_nodes
+        self.order = array("I", (i for i in range(n_nodes) if self.parents[i] < 0))
+        position = 0
+        while position < len(self.order):
+            node = self.order[position]
+            for child in self.children_positions(node):
+                self.depths[child] = self.depths[node] + 1
+                self.order.append(child)
+            position += 1
+
+        self.subtree_sizes = array("I", [1]) * n_nodes
+        for node in reversed(self.order):
+            parent = self.parents[node]
+            if parent >= 0:
+                self.subtree_sizes[parent] += self.subtree_sizes[node]
+
+    def children_positions(self, node: int) -> array:
+        return self.children[
+            self.children_offsets[node] : self.children_offsets[node + 1]
+        ]
+
+    def is_leaf(self, node: int) -> bool:
+        return self.children_offsets[node] == self.children_offsets[node + 1]
+
+    def parent(self, node: str) -> Optional[str]:
+        parent = self.parents[self.index[node]]
+        return self.nodes[parent] if parent >= 0 else None
+
+    def children_of(self, node: str) -> List[str]:
+        return [
+            self.nodes[child] for child in self.children_positions(self.index[node])
+        ]
+
+    def ancestors(self, node: str) -> Iterator[str]:
+        """Parent, grand-parent... of a node up to its root."""
+        parent = self.parents[self.index[node]]
+        while parent >= 0:
+            yield self.nodes[parent]
+            parent = self.parents[parent]
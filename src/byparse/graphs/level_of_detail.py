@@ -0,0 +1,82 @@
+from array import array
+from typing import Dict, Optional, Tuple
+
+import networkx as nx
+
+from byparse.abc import LEVELS, LEVELS_RANKS
+from byparse.graphs.hierarchy import HIERARCHY_EDGES, HierarchyIndex
+
+
+def aggregate_graph(
+    graph: nx.MultiDiGraph, level: str, hierarchy: Optional[HierarchyIndex] = None
+) -> nx.MultiDiGraph:
+    """Collapse a graph up to the folder, file or class level of detail.
+
+    Nodes finer than the level are merged into their closest ancestor that is not,
+    following CONTEXT and PATH edges. Kept nodes get a 'count' attribute with the
+    number of nodes merged into them, including the ones already counted by merged
+    nodes when aggregating an aggregated graph, and other edges between the same kept nodes
+    are merged into one edge per type with the sum of their 'weight' (1 by default).
+    Edges inside a merged node are dropped.
+
+    Args:
+        graph (nx.MultiDiGraph): Graph to aggregate, it is not modified.
+        level (str): One of 'folder', 'file', 'class' or 'function'.
+        hierarchy (Optional[HierarchyIndex]): Hierarchy of the graph, built if not given.
+
+    Returns:
+        nx.MultiDiGraph: Aggregated graph, the given one for the 'function' level.
+
+    """
+    if level not in LEVELS:
+        raise ValueError(f"Unknown level {level}, should be one of {LEVELS}")
+    level_rank = LEVELS_RANKS[level.upper()]
+    if level_rank == max(LEVELS_RANKS.values()):
+        return graph
+
+    if hierarchy is None:
+        hierarchy = HierarchyIndex(graph)
+
+    # Parents come first in the hierarchy order, so their representative is known
+    representatives_positions = array("I", range(len(hierarchy.nodes)))
+    for i in hierarchy.order:
+        parent = hierarchy.parents[i]
+        node_type = graph.nodes[hierarchy.nodes[i]].get("type")
+        if parent >= 0 and LEVELS_RANKS.get(node_type, 0) > level_rank:
+            representatives_positions[i] = representatives_positions[parent]
+    representatives: Dict[str, str] = {
+        node: hierarchy.nodes[representative]
+        for node, representative in zip(hierarchy.nodes, representatives_positions)
+    }
+
+    # Nodes of an aggregated graph already count the nodes merged into them
+    aggregated = nx.MultiDiGraph()
+    for node, node_attrs in graph.nodes(data=True):
+        if representatives[node] == node:
+            attrs = {**node_attrs}
+            attrs["count"] = node_attrs.get("count", 0)
+            aggregated.add_node(node, **attrs)
+    for node, kept_node in representatives.items():
+        if kept_node != node:
+            merged_count = graph.nodes[node].get("count", 0) + 1
+            aggregated.nodes[kept_node]["count"] += merged_count
+
+    weights: Dict[Tuple[str, str, str], int] = {}
+    for source, target, edge_attrs in graph.edges(data=True):
+        edge_type = edge_attrs["type"]
+        if edge_type in HIERARCHY_EDGES:
+            if representatives[source] == source:
+                kept_parent = representatives[target]
+                aggregated.add_edge(source, kept_parent, key=edge_type, type=edge_type)
+            continue
+        edge_key = (representatives[source], representatives[target], edge_type)
+        if edge_key[0] == edge_key[1]:
+            continue
+        weights[edge_key] = weights.get(edge_key, 0) + edge_attrs.get("weight", 1)
+
+    for (source, target, edge_type), weight in weights.items():
+        aggregated.add_edge(
+            source, target, key=edge_type, type=edge_type, weight=weight
+        )
+
+    return aggregated
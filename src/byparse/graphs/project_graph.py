@@ -0,0 +1,236 @@
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Union
+
+import networkx as nx
+
+from byparse.abc import NodeType, EdgeType
+from byparse.utils import ast_lines, link_path_to_name
+from byparse.graphs.context_graph import add_parent_folders
+from byparse.graphs.call_graph import add_context_links, resolve_context_scope
+
+if TYPE_CHECKING:
+    import ast
+
+    from byparse.context_crawl import AstContextCrawler
+    from byparse.project_crawl import ProjectCrawler, ModuleCrawler
+
+
+def build_project_graph(
+    project: "ProjectCrawler",
+    graph: Optional[nx.MultiDiGraph] = None,
+) -> nx.MultiDiGraph:
+    """Build the contexts graph and the call graph in a single traversal.
+
+    Gives the same nodes and edges as `build_contexts_graph` followed by
+    `build_call_graph`, while visiting each context and each folder only once.
+
+    """
+
+    if graph is None:
+        graph = nx.MultiDiGraph()
+
+    known_folders: Set[Path] = set()
+    for module_path, module in project.modules.items():
+        graph.add_node(
+            str(module_path),
+            label=module_path.name,
+            type=NodeType.FILE.name,
+            lines=len(module.source.splitlines()),
+        )
+        add_parent_folders(graph, module_path, known_folders)
+        _add_context_structure(graph, project, module, module.context, module_path)
+
+    return graph
+
+
+def _module_nodes(graph: nx.MultiDiGraph, module_path: Path) -> List[str]:
+    """File node of a module and the nodes of its contexts."""
+    file_node = str(module_path)
+    prefix = file_node + ">"
+    return [node for node in graph if node == file_node or node.startswith(prefix)]
+
+
+def _node_module(node: str) -> Optional[Path]:
+    module = node.split(">", 1)[0]
+    return Path(module) if module.endswith(".py") else None
+
+
+def _importing_modules(project: "ProjectCrawler", changed: Set[Path]) -> Set[Path]:
+    """Modules importing names from the changed ones, maybe through re-exports.
+
+    Names are resolved through chains of module level imports, so the modules
+    importing at the module level from changed ones are followed transitively.
+
+    """
+    imports = {
+        module_path: module.imported_modules()
+        for module_path, module in project.modules.items()
+    }
+    reached = set(changed)
+    reexporting = reached
+    while reexporting:
+        reexporting = {
+            module_path
+            for module_path, (module_level, _) in imports.items()
+            if module_path not in reached and not module_level.isdisjoint(reached)
+        }
+        reached |= reexporting
+    return {
+        module_path
+        for module_path, (_, anywhere) in imports.items()
+        if not anywhere.isdisjoint(reached)
+    }
+
+
+def update_project_graph(
+    project: "ProjectCrawler",
+    graph: nx.MultiDiGraph,
+    changed_modules: Iterable[Path],
+) -> nx.MultiDiGraph:
+    """Update a graph built by `build_project_graph` after some modules changed.
+
+    Nodes of the changed modules are rebuilt. The modules using names of the
+    changed ones, or importing from them directly or through re-exports, have
+    their links resolved again, as they may now point to other, new or missing
+    names. Gives the same graph as a full rebuild.
+
+    Args:
+        project (ProjectCrawler): Project whose changed modules were parsed again,
+            deleted modules being removed from its modules.
+        graph (nx.MultiDiGraph): Graph to update in place.
+        changed_modules (Iterable[Path]): Modified, added or deleted modules,
+            relative to the project root.
+
+    """
+    changed = set(changed_modules)
+    hierarchy_types = (EdgeType.CONTEXT.name, EdgeType.PATH.name)
+
+    # Modules with links to the names of the changed modules
+    relinked: Set[Path] = set()
+    for module_path in changed:
+        for node in _module_nodes(graph, module_path):
+            for _, user, edge_type in graph.out_edges(node, data="type"):
+                user_module = _node_module(user)
+                if edge_type not in hierarchy_types and user_module is not None:
+                    relinked.add(user_module)
+    relinked |= _importing_modules(project, changed)
+    relinked -= changed
+
+    for module_path in changed:
+        nodes = _module_nodes(graph, module_path)
+        folders = [
+            parent
+            for node in nodes
+            for _, parent, edge_type in graph.out_edges(node, data="type")
+            if edge_type == EdgeType.PATH.name
+        ]
+        graph.remove_nodes_from(nodes)
+        # Folders left empty by a deleted module
+        while folders:
+            folder = folders.pop()
+            if folder in graph and graph.in_degree(folder) == 0:
+                folders.extend(parent for _, parent in graph.out_edges(folder))
+                graph.remove_node(folder)
+
+    for module_path in relinked:
+        # Links and context edges are added again with the module structure
+        for node in _module_nodes(graph, module_path):
+            graph.remove_edges_from(
+                [
+                    (used, node, key)
+                    for used, _, key, edge_type in graph.in_edges(
+                        node, keys=True, data="type"
+                    )
+                    if edge_type not in hierarchy_types
+                ]
+                + [
+                    (node, parent, key)
+                    for _, parent, key, edge_type in graph.out_edges(
+                        node, keys=True, data="type"
+                    )
+                    if edge_type == EdgeType.CONTEXT.name
+                ]
+            )
+
+    known_folders = {
+        Path(node)
+        for node, node_type in graph.nodes(data="type")
+        if node_type == NodeType.FOLDER.name
+    }
+    for module_path in changed | relinked:
+        module = project.modules.get(module_path)
+        if module is None:
+            continue
+        if module_path in changed:
+            graph.add_node(
+                str(module_path),
+                label=module_path.name,
+                type=NodeType.FILE.name,
+                lines=len(module.source.splitlines()),
+            )
+            add_parent_folders(graph, module_path, known_folders)
+        _add_context_structure(graph, project, module, module.context, module_path)
+
+    # Names only linked by the removed links
+    graph.remove_nodes_from(
+        [
+            node
+            for node, node_type in graph.nodes(data="type")
+            if node_type is None and graph.degree(node) == 0
+        ]
+    )
+    return graph
+
+
+def _add_context_structure(
+    graph: nx.MultiDiGraph,
+    project: "ProjectCrawler",
+    module: "ModuleCrawler",
+    context: "AstContextCrawler",
+    context_path: Union[Path, str],
+    aliases_paths: Optional[Dict["ast.alias", Path]] = None,
+    used_names: Optional[Dict[str, "ast.alias"]] = None,
+):
+    local_aliases_paths, local_used_names, local_known_contexts = resolve_context_scope(
+        module, context, aliases_paths, used_names
+    )
+
+    add_context_links(
+        graph,
+        project,
+        module,
+        context,
+        context_path,
+        local_known_contexts,
+        local_used_names,
+        local_aliases_paths,
+    )
+
+    def _add_sub_context(attr_name: str, node_type: str):
+        attr_contexts: Dict[str, "AstContextCrawler"] = getattr(context, attr_name)
+        for name, subcontext in attr_contexts.items():
+            subcontext_path = link_path_to_name(context_path, name)
+            # Overrides the attributes of nodes created earlier as link targets
+            graph.add_node(
+                subcontext_path,
+                label=name,
+                type=node_type,
+                lines=ast_lines(subcontext.root_ast),
+            )
+            graph.add_edge(
+                subcontext_path,
+                str(context_path),
+                type=EdgeType.CONTEXT.name,
+            )
+            _add_context_structure(
+                graph,
+                project,
+                module,
+                subcontext,
+                subcontext_path,
+                aliases_paths=local_aliases_paths,
+                used_names=local_used_names,
+            )
+
+    _add_sub_context("functions", NodeType.FUNCTION.name)
+    _add_sub_context("classes", NodeType.CLASS.name)
@@ -1,7 +1,18 @@
-"""Utilitaries for logging in package."""
+"""Utilitaries for logging in package.
+
+Hot paths log debug messages behind `LOGGER.isEnabledFor(logging.DEBUG)`
+when their arguments are costly to build, so that nothing is rendered when
+debug logging is off. Events too frequent to be all logged, as name
+resolutions, can instead be traced on a random sample with
+`set_trace_sampling`, checking `trace_sampled` before logging each one.
+
+"""
 
 import logging
-from colorama import Fore, Style
+import random
+
+_TRACE_SAMPLING = 0.0
+_TRACE_RANDOM = random.Random(0)
 
 
 def init_logger(log_level: int, package_name: str) -> logging.Logger:
@@ -17,6 +28,8 @@ def init_logger(log_level: int, package_name: str) -> logging.Logger:
     stream_handler.setFormatter(stream_formater)
     logger.addHandler(stream_handler)
     if log_level <= logging.DEBUG:
+        from colorama import Fore, Style
+
         print(f"{Fore.GREEN:-<15}DEBUG MODE{'':-<15} {Style.RESET_ALL}")
     return logger
 
@@ -33,31 +46,58 @@ def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
 
 
+def set_trace_sampling(rate: float, seed: int = 0):
+    """Trace a random share of the sampled events, none with a rate of 0.
+
+    Args:
+        rate (float): Share of the events to trace, between 0 and 1.
+        seed (int): Seed of the sampling, to trace the same events again.
+
+    """
+    if not 0 <= rate <= 1:
+        raise ValueError(f"Trace sampling rate must be between 0 and 1, got {rate}")
+    global _TRACE_SAMPLING
+    _TRACE_SAMPLING = rate
+    _TRACE_RANDOM.seed(seed)
+
+
+def trace_sampled() -> bool:
+    """Whether to trace the current event, always False unless sampling."""
+    return _TRACE_SAMPLING > 0 and _TRACE_RANDOM.random() < _TRACE_SAMPLING
+
+
 class CustomHandler(logging.StreamHandler):
 
     """Custom logging handler for colored console."""
 
     COLOR_BY_LEVEL = {
-        "DEBUG": Fore.GREEN,
-        "INFO": Fore.BLUE,
-        "WARNING": Fore.YELLOW,
-        "WARN": Fore.YELLOW,
-        "ERROR": Fore.RED,
-        "FATAL": Fore.RED,
-        "CRITICAL": Fore.RED,
+        "DEBUG": "GREEN",
+        "INFO": "BLUE",
+        "WARNING": "YELLOW",
+        "WARN": "YELLOW",
+        "ERROR": "RED",
+        "FATAL": "RED",
+        "CRITICAL": "RED",
     }
 
     def __init__(self, *args, **kwargs):
         self.package_name = kwargs.pop("package_name", "root")
+        self._short_pathnames = {}
         super().__init__(*args, **kwargs)
 
     def emit(self, record: logging.LogRecord):
-        record.pathname = (
-            self.package_name + record.pathname.split(self.package_name)[-1]
-        )
+        from colorama import Fore, Style
+
+        pathname = self._short_pathnames.get(record.pathname)
+        if pathname is None:
+            pathname = self.package_name + record.pathname.split(self.package_name)[-1]
+            self._short_pathnames[record.pathname] = pathname
+        record.pathname = pathname
 
         level_color = self.COLOR_BY_LEVEL.get(record.levelname)
         record.levelname = f"{record.levelname: <8}"
         if level_color:
-            record.levelname = level_color + record.levelname + Style.RESET_ALL
+            record.levelname = (
+                getattr(Fore, level_color) + record.levelname + Style.RESET_ALL
+            )
         return super().emit(record)
@@ -1,9 +1,11 @@
 from typing import Dict, Optional, Tuple, Union
 
 import ast
+from functools import lru_cache
 from pathlib import Path
 from importlib.util import find_spec
 from byparse.logging_utils import get_logger
+from byparse.profiling import count, register_cache
 
 LOGGER = get_logger(__name__)
 
@@ -66,22 +68,47 @@ def resolve_import_ast_alias_path(
             return path
 
     # For installed packages
-    try:
-        spec = find_spec(alias.name)
-    except ModuleNotFoundError:
-        spec = None
-
-    if spec is None:
+    path = resolve_installed_path(alias.name)
+    if path is None:
         warning_msg = f"{alias.name}"
         if module is not None:
             warning_msg += f" at {module}"
         LOGGER.warning("Could not find a reference for alias %s", warning_msg)
+        count("imports.not_found")
         return Path(f"Lib/site-packages/not-found/{alias.name}")
-    if spec.origin == "built-in" or spec.origin is None:
-        return Path(f"Lib/site-packages/built-in/{alias.name}")
+    return path
+
+
+@lru_cache(maxsize=None)
+def resolve_installed_path(name: str) -> Optional[Path]:
+    """Path of an installed or built-in module, None if it cannot be found.
+
+    Cached for the whole process, as installed packages do not depend on the
+    crawled project, so that crawling many projects only searches them once.
+    Clear it with `resolve_installed_path.cache_clear()` after installing packages.
+
+    """
+    try:
+        spec = find_spec(name)
+    except (ImportError, ValueError, AttributeError):
+        # Parents are imported to find submodules, and may fail to import
+        spec = None
+
+    if spec is None:
+        return None
+    if spec.origin == "frozen":
+        # Frozen standard modules keep the path of their source, if any
+        filename = getattr(spec.loader_state, "filename", None)
+        if filename is not None:
+            return Path(filename)
+    if spec.origin in ("built-in", "frozen") or spec.origin is None:
+        return Path(f"Lib/site-packages/built-in/{name}")
     return Path(spec.origin)
 
 
+register_cache("resolve_installed_path", resolve_installed_path)
+
+
 def _relative_resolution(module_chain: str, project_root: str) -> Optional[Path]:
     def mod_to_path(module_chain: str, asfile=False) -> Path:
         str_path = module_chain.replace(".", "/").lower()
@@ -90,11 +117,13 @@ def _relative_resolution(module_chain: str, project_root: str) -> Optional[Path]
         return Path(project_root) / Path(str_path)
 
     # File
+    count("imports.fs_probes")
     path = mod_to_path(module_chain, asfile=True)
     if path.exists() and path.is_file():
         return path
 
     # Folder
+    count("imports.fs_probes")
     path = mod_to_path(module_chain, asfile=False)
     if path.exists() and path.is_dir():
         return path / Path("__init__.py")
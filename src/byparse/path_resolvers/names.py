@@ -1,4 +1,5 @@
 import ast
+import logging
 from pathlib import Path
 from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
@@ -10,6 +11,7 @@ from byparse.path_resolvers.imports import (
     resolve_import_ast_paths,
 )
 from byparse.logging_utils import get_logger
+from byparse.profiling import count, phase
 
 if TYPE_CHECKING:
     from byparse.context_crawl import AstContextCrawler
@@ -83,6 +85,17 @@ def resolve_lib_name(
     return Path(call_path), node_type
 
 
+def _project_module(
+    path: Path, project_modules: Dict[Path, "ModuleCrawler"], project_path: Path
+) -> Optional["ModuleCrawler"]:
+    """Crawled module at a path, None if outside the project or not crawled."""
+    try:
+        relative_path = path.absolute().relative_to(project_path.absolute())
+    except ValueError:
+        return None
+    return project_modules.get(relative_path)
+
+
 def resolve_import_path_chain(
     call_name: str,
     project_modules: Dict[Path, "ModuleCrawler"],
@@ -91,38 +104,57 @@ def resolve_import_path_chain(
     call_true_path: Path,
     project_path: Path,
 ):
-    target: "ModuleCrawler" = project_modules[
-        call_true_path.absolute().relative_to(project_path.absolute())
-    ]
+    target = _project_module(call_true_path, project_modules, project_path)
+    if target is None:
+        LOGGER.debug(
+            "Could not resolve call_chain %s: %s is not crawled",
+            call_name,
+            call_true_path,
+        )
+        return None, None
 
+    visited = {id(target)}
     while (
         alias_name not in target.context.known_names
         and call_end not in target.context.known_names
     ):
         # Solve chained imports until reaching the functions / class definition
+        count("resolve.chain_steps")
         if alias_name in target.context.imports:
             import_from_ast = target.context.imports[alias_name]
         elif call_end in target.context.imports:
             import_from_ast = target.context.imports[call_end]
         else:
-            known_names = str(list(target.context.known_names.keys()))
-            import_names = str(list(target.context.imports.keys()))
-            LOGGER.debug(
-                "Could not resolve call_chain %s: %s & %s not found in"
-                " known_names:%s nor in imports_names:%s",
-                call_name,
-                alias_name,
-                call_end,
-                known_names,
-                import_names,
-            )
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                LOGGER.debug(
+                    "Could not resolve call_chain %s: %s & %s not found in"
+                    " known_names:%s nor in imports_names:%s",
+                    call_name,
+                    alias_name,
+                    call_end,
+                    list(target.context.known_names),
+                    list(target.context.imports),
+                )
             return None, None
 
         target_path = resolve_import_ast_paths(import_from_ast, str(target.root))
         target_path = list(target_path.values())[0]
-        target = project_modules[
-            target_path.absolute().relative_to(target.root.absolute())
-        ]
+        target = _project_module(target_path, project_modules, target.root)
+        if target is None:
+            LOGGER.debug(
+                "Could not resolve call_chain %s: %s is not crawled",
+                call_name,
+                target_path,
+            )
+            return None, None
+        if id(target) in visited:
+            LOGGER.debug(
+                "Could not resolve call_chain %s: imports cycle through %s",
+                call_name,
+                target_path,
+            )
+            return None, None
+        visited.add(id(target))
         call_true_path = target_path
 
 
@@ -146,8 +178,10 @@ def resolve_name(
     local_aliases_paths: Dict["ast.alias", Path],
     with_deps=False,
 ) -> Tuple[Optional[Path], NodeType]:
+    count("resolve.attempts")
     name_path, name_type = resolve_same_module_name(name, local_known_contexts)
     if name_path is not None:
+        count("resolve.same_module")
         return name_path.relative_to(project_path), name_type
 
     chain, end, _, chain_level = get_call_chain(name, list(local_used_names.keys()))
@@ -157,8 +191,12 @@ def resolve_name(
         alias: ast.alias = local_used_names[chain]
         name_true_path: Path = local_aliases_paths[alias]
 
-        # Filter libs
-        if "site-packages" in name_true_path.parts or "lib" in name_true_path.parts:
+        # Filter libs, the project itself may be under a 'lib' folder
+        parts = name_true_path.parts
+        if ("site-packages" in parts or "lib" in parts) and _project_module(
+            name_true_path, project_modules, project_path
+        ) is None:
+            count("resolve.library")
             return resolve_lib_name(name_true_path, name, with_deps)
 
         name_path, name_type = resolve_import_path_chain(
@@ -170,40 +208,45 @@ def resolve_name(
             project_path,
         )
         if name_path is not None:
+            count("resolve.project")
             return name_path.relative_to(project_path), name_type
         else:
-            # Try with other call_parts
-            level = chain_level - 1
-            while name_path is None and level >= 0:
-                chain, end, _, chain_level = get_call_chain(
-                    name, list(local_used_names.keys()), level
-                )
-
-                rel_context_path = context_path.relative_to(project_path)
-                if (
-                    "__main__.py" in rel_context_path.parts
-                    or "__init__.py" in rel_context_path.parts
-                ):
-                    rel_context_path = rel_context_path.parent
-
-                full_name = ".".join(list(rel_context_path.parts) + [chain])
-                alias: ast.alias = ast.alias(name=full_name)
-
-                name_true_path: Path = resolve_import_ast_alias_path(
-                    alias, project_path
-                )
-
-                name_path, name_type = resolve_import_path_chain(
-                    name,
-                    project_modules,
-                    alias.name,
-                    end,
-                    name_true_path,
-                    project_path,
-                )
-                level -= 1
+            # Try with other call_parts, the names not found end there
+            with phase("resolve_fallback"):
+                level = chain_level - 1
+                while name_path is None and level >= 0:
+                    count("resolve.fallback_iterations")
+                    chain, end, _, chain_level = get_call_chain(
+                        name, list(local_used_names.keys()), level
+                    )
+
+                    rel_context_path = context_path.relative_to(project_path)
+                    if (
+                        "__main__.py" in rel_context_path.parts
+                        or "__init__.py" in rel_context_path.parts
+                    ):
+                        rel_context_path = rel_context_path.parent
+
+                    full_name = ".".join(list(rel_context_path.parts) + [chain])
+                    alias: ast.alias = ast.alias(name=full_name)
+
+                    name_true_path: Path = resolve_import_ast_alias_path(
+                        alias, project_path
+                    )
+
+                    name_path, name_type = resolve_import_path_chain(
+                        name,
+                        project_modules,
+                        alias.name,
+                        end,
+                        name_true_path,
+                        project_path,
+                    )
+                    level -= 1
 
             if name_path is not None:
+                count("resolve.project_fallback")
                 return name_path.relative_to(project_path), name_type
 
+    count("resolve.not_found")
     return None, None
@@ -0,0 +1,352 @@
+"""Phase timers, run reports and profiling of byparse runs.
+
+Code doing a distinct step of a run wraps it in `phase`, and counts what it
+processed with `count`. Both do nothing unless a `RunReport` is active, as
+within `profile_run`, so they can stay in the hot paths:
+
+    with phase("parse"):
+        module_ast = ast.parse(source)
+    count("source_bytes", len(source))
+
+Phases can be nested: the wall and CPU times of a phase include the ones of
+the phases it contains, its 'self' times exclude them.
+
+Functions cached with `functools.lru_cache` can be registered with
+`register_cache`, so that reports give their hits and misses during the run.
+
+"""
+
+import json
+import platform
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    import functools
+    import pstats
+
+REPORT_VERSION = 1
+
+_NULL_PHASE = nullcontext()
+_ACTIVE: Optional["RunReport"] = None
+_CACHES: Dict[str, "functools._lru_cache_wrapper"] = {}
+
+
+def peak_rss() -> Optional[int]:
+    """Peak resident set size of this process in bytes, None if unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class PhaseStats:
+    """Accumulated times and memory of every run of a phase."""
+
+    __slots__ = ("calls", "wall", "cpu", "child_wall", "child_cpu", "peak_rss")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.child_wall = 0.0
+        self.child_cpu = 0.0
+        self.peak_rss: Optional[int] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "wall_seconds": self.wall,
+            "cpu_seconds": self.cpu,
+            "self_wall_seconds": self.wall - self.child_wall,
+            "self_cpu_seconds": self.cpu - self.child_cpu,
+            "peak_rss_bytes": self.peak_rss,
+        }
+
+
+class _Phase:
+    __slots__ = ("report", "stats", "wall", "cpu")
+
+    def __init__(self, report: "RunReport", name: str) -> None:
+        self.report = report
+        self.stats = report.phases.get(name)
+        if self.stats is None:
+            self.stats = report.phases[name] = PhaseStats()
+
+    def __enter__(self):
+        self.report.stack.append(self.stats)
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+
+    def __exit__(self, *exc_info):
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        stats = self.stats
+        stats.calls += 1
+        stats.wall += wall
+        stats.cpu += cpu
+        stack = self.report.stack
+        stack.pop()
+        if stack:
+            stack[-1].child_wall += wall
+            stack[-1].child_cpu += cpu
+        # Peak memory only grows, so it is not worth measuring on every call
+        if stats.calls == 1 or not stack:
+            stats.peak_rss = peak_rss()
+
+
+class RunReport:
+    """Times, memory and counts of a run, by phase.
+
+    Attributes:
+        phases (Dict[str, PhaseStats]): Statistics of each phase, by name, in
+            the order they first ran.
+        counts (Dict[str, int]): Counters incremented with `count`.
+        caches (Dict[str, Dict[str, int]]): Hits and misses of the registered
+            caches during the run, once stopped.
+
+    """
+
+    def __init__(self, argv: Optional[List[str]] = None) -> None:
+        self.argv = list(sys.argv[1:] if argv is None else argv)
+        self.phases: Dict[str, PhaseStats] = {}
+        self.counts: Dict[str, int] = {}
+        self.stack: List[PhaseStats] = []
+        self.started = time.time()
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        self.total_wall: Optional[float] = None
+        self.total_cpu: Optional[float] = None
+        self._caches_start = _caches_info()
+        self.caches: Dict[str, Dict[str, int]] = {}
+
+    def stop(self):
+        self.total_wall = time.perf_counter() - self.wall
+        self.total_cpu = time.process_time() - self.cpu
+        for name, (hits, misses, size) in _caches_info().items():
+            start_hits, start_misses, _ = self._caches_start.get(name, (0, 0, 0))
+            self.caches[name] = {
+                "hits": hits - start_hits,
+                "misses": misses - start_misses,
+                "size": size,
+            }
+
+    def to_dict(self) -> dict:
+        return {
+            "version": REPORT_VERSION,
+            "argv": self.argv,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "started": time.strftime(
+                "%Y-%m-%dT%H:%M:%S%z", time.localtime(self.started)
+            ),
+            "wall_seconds": self.total_wall,
+            "cpu_seconds": self.total_cpu,
+            "peak_rss_bytes": peak_rss(),
+            "phases": {name: stats.to_dict() for name, stats in self.phases.items()},
+            "counts": dict(self.counts),
+            "caches": {
+                name: {**info, "hit_ratio": hit_ratio(info)}
+                for name, info in self.caches.items()
+            },
+        }
+
+    def write(self, path: Union[str, Path]):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+
+def phase(name: str):
+    """Context manager timing a phase of the active report, if any."""
+    if _ACTIVE is None:
+        return _NULL_PHASE
+    return _Phase(_ACTIVE, name)
+
+
+def count(name: str, value: int = 1):
+    """Add to a counter of the active report, if any."""
+    if _ACTIVE is not None:
+        _ACTIVE.counts[name] = _ACTIVE.counts.get(name, 0) + value
+
+
+def active_report() -> Optional[RunReport]:
+    return _ACTIVE
+
+
+def register_cache(name: str, cached_function: "functools._lru_cache_wrapper"):
+    """Report the hits and misses of a `functools.lru_cache` function."""
+    _CACHES[name] = cached_function
+
+
+def _caches_info() -> Dict[str, Tuple[int, int, int]]:
+    caches_info = {}
+    for name, cached_function in _CACHES.items():
+        info = cached_function.cache_info()
+        caches_info[name] = (info.hits, info.misses, info.currsize)
+    return caches_info
+
+
+def hit_ratio(cache_info: Dict[str, int]) -> Optional[float]:
+    lookups = cache_info["hits"] + cache_info["misses"]
+    return cache_info["hits"] / lookups if lookups else None
+
+
+def format_summary(report: RunReport) -> str:
+    """Table of the phases, counters and caches of a stopped report."""
+    lines = [
+        f"{'phase':<20}{'calls':>10}{'wall (s)':>12}{'self (s)':>12}{'cpu (s)':>12}"
+    ]
+    for name, stats in report.phases.items():
+        lines.append(
+            f"{name:<20}{stats.calls:>10}{stats.wall:>12.3f}"
+            f"{stats.wall - stats.child_wall:>12.3f}{stats.cpu:>12.3f}"
+        )
+    lines.append(f"{'total':<20}{'':>10}{report.total_wall or 0:>12.3f}")
+    if report.counts:
+        lines.append("")
+        lines.append(f"{'counter':<32}{'value':>14}")
+        for name, value in sorted(report.counts.items()):
+            lines.append(f"{name:<32}{value:>14}")
+    if report.caches:
+        lines.append("")
+        lines.append(f"{'cache':<32}{'hits':>10}{'misses':>10}{'hit ratio':>12}")
+        for name, info in report.caches.items():
+            ratio = hit_ratio(info)
+            shown = "-" if ratio is None else f"{ratio:.1%}"
+            lines.append(f"{name:<32}{info['hits']:>10}{info['misses']:>10}{shown:>12}")
+    return "\n".join(lines)
+
+
+def collapsed_stacks(stats: "pstats.Stats", max_depth: int = 64) -> Dict[str, int]:
+    """Estimated microseconds spent in each call stack, for flamegraphs.
+
+    cProfile only records callers and callees pairs, so the time of a function
+    is split between the stacks leading to it in proportion to the time spent
+    in each of its calls from its callers.
+
+    Returns:
+        Dict[str, int]: Microseconds by stack of frames joined with ';', the
+            format of flamegraph.pl and speedscope collapsed stacks.
+
+    """
+    functions = stats.stats  # type: ignore[attr-defined]
+    children: Dict[tuple, Dict[tuple, float]] = {}
+    for function, (_, _, _, _, callers) in functions.items():
+        for caller, (_, _, _, caller_cumulative) in callers.items():
+            children.setdefault(caller, {})[function] = caller_cumulative
+
+    def frame(function: Tuple[str, int, str]) -> str:
+        filename, line, name = function
+        if filename == "~":  # Built-in function
+            return name
+        return f"{Path(filename).stem}.py:{line}:{name}"
+
+    stacks: Dict[str, int] = {}
+
+    def visit(function: tuple, time_here: float, stack: List[str], path: set):
+        _, _, total, cumulative, _ = functions[function]
+        stack.append(frame(function))
+        if cumulative > 0:
+            own = round(time_here * total / cumulative * 1e6)
+            if own > 0:
+                key = ";".join(stack)
+                stacks[key] = stacks.get(key, 0) + own
+            if len(stack) < max_depth:
+                path.add(function)
+                for child, child_cumulative in children.get(function, {}).items():
+                    if child not in path and child in functions:
+                        share = time_here * child_cumulative / cumulative
+                        if share * 1e6 >= 1:
+                            visit(child, share, stack, path)
+                path.discard(function)
+        stack.pop()
+
+    for function, (_, _, _, cumulative, callers) in functions.items():
+        if not callers:
+            visit(function, cumulative, [], set())
+    return stacks
+
+
+def write_collapsed_stacks(stats: "pstats.Stats", path: Union[str, Path]):
+    with open(path, "w", encoding="utf-8") as file:
+        for stack, microseconds in sorted(collapsed_stacks(stats).items()):
+            file.write(f"{stack} {microseconds}\n")
+
+
+@contextmanager
+def recording(argv: Optional[List[str]] = None) -> Iterator[RunReport]:
+    """Make a new `RunReport` active in the wrapped code, stopped on exit."""
+    global _ACTIVE
+    report = RunReport(argv)
+    previous, _ACTIVE = _ACTIVE, report
+    try:
+        yield report
+    finally:
+        report.stop()
+        _ACTIVE = previous
+
+
+@contextmanager
+def profile_run(
+    report_path: Optional[Union[str, Path]] = None,
+    profile_path: Optional[Union[str, Path]] = None,
+    argv: Optional[List[str]] = None,
+    summary: bool = False,
+):
+    """Record a `RunReport` of the wrapped code, and profile it if asked.
+
+    Args:
+        report_path (Optional[Union[str, Path]]): Write the JSON run report there.
+        profile_path (Optional[Union[str, Path]]): Write the cProfile statistics
+            there, loadable with `pstats`, and their collapsed stacks next to
+            them with the '.collapsed' suffix.
+        argv (Optional[List[str]]): Arguments of the run, to keep in the report.
+        summary (bool): Print a summary table of the report to stderr.
+
+    """
+    if report_path is None and profile_path is None and not summary:
+        yield None
+        return
+
+    profiler = None
+    if profile_path is not None:
+        import cProfile
+
+        profiler = cProfile.Profile()
+    try:
+        with recording(argv) as report:
+            if profiler is not None:
+                profiler.enable()
+            try:
+                yield report
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+    finally:
+        if report_path is not None:
+            report.write(report_path)
+        if summary:
+            print(format_summary(report), file=sys.stderr)
+        if profiler is not None and profile_path is not None:
+            import pstats
+
+            profiler.dump_stats(profile_path)
+            write_collapsed_stacks(
+                pstats.Stats(profiler), Path(profile_path).with_suffix(".collapsed")
+            )
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 import os
 import ast
@@ -9,11 +9,28 @@ from byparse.context_crawl import AstContextCrawler
 from byparse.utils import pretty_path_name
 from byparse.graphs.context_graph import build_contexts_graph
 from byparse.graphs.call_graph import build_call_graph
+from byparse.graphs.project_graph import build_project_graph, update_project_graph
+from byparse.path_resolvers.imports import resolve_aliases_paths
 from byparse.logging_utils import get_logger
+from byparse.profiling import count, phase
 
 LOGGER = get_logger(__name__)
 
 
+def iter_python_files(
+    project_path: Path, exclude: Optional[List[str]] = None
+) -> Iterator[Path]:
+    """Python files of a project, skipping the excluded folders names."""
+    for root, dirs, files in os.walk(project_path, topdown=True):
+        if exclude is not None:
+            dirs[:] = [d for d in dirs if d not in exclude]
+        for filename in files:
+            if filename.endswith(".py"):
+                yield Path(root) / Path(filename)
+            elif filename.endswith(".ipynb"):
+                LOGGER.warning("Notebooks are not supported yet, ignored %s", filename)
+
+
 class ModuleCrawler:
     root: Path
     path: Path
@@ -25,13 +42,56 @@ class ModuleCrawler:
         self.path = Path(path)
         self.name = pretty_path_name(self.path)
 
-        with open(self.path, "r", encoding="utf8") as file:
-            self.source = file.read()
+        with phase("parse"):
+            with open(self.path, "r", encoding="utf8") as file:
+                self.source = file.read()
 
-        module_ast = ast.parse(source=self.source, filename=self.path.name)
+            module_ast = ast.parse(source=self.source, filename=self.path.name)
+        count("modules")
+        count("source_bytes", len(self.source))
 
         # Crawl ast
-        self.context = AstContextCrawler(module_ast, path=self.path)
+        with phase("crawl"):
+            self.context = AstContextCrawler(module_ast, path=self.path)
+        self._imported_modules: Optional[Tuple[Set[Path], Set[Path]]] = None
+
+    def imported_modules(self) -> Tuple[Set[Path], Set[Path]]:
+        """Files imported by the module, relative to the root.
+
+        Resolved on the first call and kept until `forget_imports`.
+
+        Returns:
+            Tuple[Set[Path], Set[Path]]: Files imported at the module level,
+                through which the module can re-export names, and files imported
+                anywhere in the module.
+
+        """
+        if self._imported_modules is None:
+            module_level = self._imported_paths(self.context)
+            contexts, anywhere = [self.context], set()
+            while contexts:
+                context = contexts.pop()
+                contexts.extend(context.functions.values())
+                contexts.extend(context.classes.values())
+                anywhere |= self._imported_paths(context)
+            self._imported_modules = module_level, anywhere
+        return self._imported_modules
+
+    def forget_imports(self):
+        """Resolve imports again on the next `imported_modules`, as files changed."""
+        self._imported_modules = None
+
+    def _imported_paths(self, context: AstContextCrawler) -> Set[Path]:
+        with phase("imports"):
+            aliases_paths, _ = resolve_aliases_paths(context.imports, str(self.root))
+        root = self.root.absolute()
+        paths = set()
+        for path in aliases_paths.values():
+            try:
+                paths.add(path.absolute().relative_to(root))
+            except ValueError:  # Installed packages
+                continue
+        return paths
 
     def __str__(self) -> str:
         return (
@@ -50,29 +110,61 @@ class ProjectCrawler:
         self, exclude: Optional[List[str]] = None
     ) -> Dict[Path, ModuleCrawler]:
         modules_asts = {}
-        for root, dirs, files in os.walk(self.path, topdown=True):
-            if exclude is not None:
-                dirs[:] = [d for d in dirs if d not in exclude]
-            for filename in files:
-                if filename.endswith(".py"):
-                    filepath = Path(root) / Path(filename)
-                    modules_asts[filepath.relative_to(self.path)] = ModuleCrawler(
-                        filepath, root=self.path
-                    )
-                elif filename.endswith(".ipynb"):
-                    LOGGER.warning(
-                        "Notebooks are not supported yet, ignored %s", filename
-                    )
+        with phase("discovery"):
+            filepaths = list(iter_python_files(self.path, exclude))
+        for filepath in filepaths:
+            modules_asts[filepath.relative_to(self.path)] = ModuleCrawler(
+                filepath, root=self.path
+            )
         return modules_asts
 
+    def reparse_modules(self, modules_paths: Iterable[Path]):
+        """Parse again modules given relative to the project root.
+
+        Modules that no longer exist are forgotten, new ones are added.
+
+        """
+        files_changed = False
+        for module_path in modules_paths:
+            filepath = self.path / module_path
+            if filepath.exists():
+                files_changed |= module_path not in self.modules
+                self.modules[module_path] = ModuleCrawler(filepath, root=self.path)
+            else:
+                files_changed |= self.modules.pop(module_path, None) is not None
+        # Imports of other modules may now resolve to other files
+        if files_changed:
+            for module in self.modules.values():
+                module.forget_imports()
+
     def build_contexts_graph(
         self,
         graph: Optional[nx.DiGraph] = None,
     ) -> nx.DiGraph:
-        return build_contexts_graph(self, graph)
+        with phase("graph"):
+            graph = build_contexts_graph(self, graph)
+        return graph
 
     def build_call_graph(
         self,
         graph: Optional[nx.DiGraph] = None,
     ) -> nx.DiGraph:
-        return build_call_graph(self, graph)
+        with phase("graph"):
+            graph = build_call_graph(self, graph)
+        return graph
+
+    def build_project_graph(
+        self,
+        graph: Optional[nx.DiGraph] = None,
+    ) -> nx.DiGraph:
+        with phase("graph"):
+            graph = build_project_graph(self, graph)
+        return graph
+
+    def update_project_graph(
+        self, graph: nx.MultiDiGraph, modules_paths: Iterable[Path]
+    ) -> nx.MultiDiGraph:
+        """Parse the given modules again and update a `build_project_graph` graph."""
+        modules_paths = set(modules_paths)
+        self.reparse_modules(modules_paths)
+        return update_project_graph(self, graph, modules_paths)
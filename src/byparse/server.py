@@ -0,0 +1,423 @@
+"""Resident server keeping project graphs in memory to answer queries quickly.
+
+Each served project is crawled once, then a watcher thread polls the
+modification times of its Python files and updates its graph in place,
+parsing again only the modules that changed. Requests are answered over
+HTTP, on localhost or on a Unix socket, from the graph in memory and from
+indexes cached until the next change.
+
+Projects are kept in a least recently used cache bounded by their total
+number of nodes and edges, the most recently used project always being kept.
+
+Routes, all GET and answering JSON:
+
+    /status                             served projects and their sizes
+    /query?node=&relation=&depth=       callers, callees, or dependency path to target=
+    /impact?changed=&select=            tests using the changed files, folders or nodes
+    /export                             cytoscape elements of the whole graph
+    /refresh                            look for changes right away
+
+Every route takes an optional root=, defaulting to the first served project.
+Only the projects under the roots given to the `ProjectCache` are served, and
+TCP requests must be addressed to localhost or to the listened interface, so
+that web pages cannot use DNS rebinding to crawl other local folders.
+
+"""
+
+import json
+import os
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, TypeVar, Union, cast
+from urllib.parse import parse_qs, urlsplit
+
+from byparse.analysis.adjacency import AdjacencyIndex
+from byparse.analysis.impact import ImpactIndex
+from byparse.analysis.query import GraphQuery
+from byparse.logging_utils import get_logger
+from byparse.project_crawl import ProjectCrawler, iter_python_files
+from byparse.stores.loading import NetworkxGraph
+from byparse.visualisation.cytoscape_fcose import networkx_to_cytoscape_fcose
+from byparse.visualisation.graph_vis import color_context_graph, compute_parents
+
+LOGGER = get_logger(__name__)
+
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+Cached = TypeVar("Cached")
+
+
+class ProjectState:
+    """Crawled project, its graph, and the indexes computed from it.
+
+    Attributes:
+        root (Path): Absolute root of the project.
+        version (int): Number of updates of the graph since it was built.
+        n_elements (int): Number of nodes and edges of the graph.
+
+    """
+
+    def __init__(self, root: Union[str, Path], exclude: Optional[List[str]] = None):
+        self.root = Path(root).resolve()
+        self.exclude = exclude
+        self.lock = threading.RLock()
+        self.mtimes = self.scan()
+        self.project = ProjectCrawler(str(self.root), exclude=exclude)
+        self.graph = self.project.build_project_graph()
+        self.version = 0
+        self.n_elements = self._count_elements()
+        self._cache: Dict[str, object] = {}
+
+    def scan(self) -> Dict[Path, int]:
+        """Modification time of each Python file, by path relative to the root."""
+        mtimes = {}
+        for path in iter_python_files(self.root, self.exclude):
+            try:
+                mtimes[path.relative_to(self.root)] = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                continue
+        return mtimes
+
+    def refresh(self) -> List[Path]:
+        """Update the graph with the modules changed since the last refresh.
+
+        Returns:
+            List[Path]: Modules modified, added or deleted.
+
+        """
+        # Scanned under the lock, as concurrent refreshes would update twice
+        with self.lock:
+            mtimes = self.scan()
+            changed = [
+                path
+                for path in set(mtimes) | set(self.mtimes)
+                if mtimes.get(path) != self.mtimes.get(path)
+            ]
+            if not changed:
+                return changed
+            try:
+                self.project.update_project_graph(self.graph, changed)
+            except SyntaxError as error:
+                # Likely saved while being edited, retried at the next refresh
+                LOGGER.warning("Could not parse %s: %s", error.filename, error.msg)
+                return []
+            self.mtimes = mtimes
+            self.version += 1
+            self.n_elements = self._count_elements()
+            self._cache = {}
+        LOGGER.info("Updated %s modules of %s", len(changed), self.root)
+        return changed
+
+    def _count_elements(self) -> int:
+        return int(self.graph.number_of_nodes() + self.graph.number_of_edges())
+
+    def status(self) -> dict:
+        with self.lock:
+            return {
+                "root": str(self.root),
+                "version": self.version,
+                "nodes": self.graph.number_of_nodes(),
+                "edges": self.graph.number_of_edges(),
+            }
+
+    def cached(self, key: str, compute: Callable[[], Cached]) -> Cached:
+        """Value computed from the current graph, until it changes."""
+        with self.lock:
+            if key not in self._cache:
+                self._cache[key] = compute()
+            return cast(Cached, self._cache[key])
+
+    def query(self) -> GraphQuery:
+        return self.cached(
+            "query",
+            lambda: GraphQuery(AdjacencyIndex.from_graph(NetworkxGraph(self.graph))),
+        )
+
+    def impact_index(self, test_prefix: str) -> ImpactIndex:
+        return self.cached(
+            f"impact:{test_prefix}",
+            lambda: ImpactIndex.build(self.query().adjacency, test_prefix=test_prefix),
+        )
+
+    def cytoscape(self) -> dict:
+        def compute() -> dict:
+            graph = self.graph.copy()
+            color_context_graph(graph)
+            compute_parents(graph)
+            return networkx_to_cytoscape_fcose(graph)
+
+        return self.cached("cytoscape", compute)
+
+
+class ProjectCache:
+    """Least recently used project states, bounded by their nodes and edges.
+
+    Args:
+        max_elements (int): Maximum total of nodes and edges kept in memory.
+        exclude (Optional[List[str]]): Ignored folders of every project.
+        roots (Optional[List[Union[str, Path]]]): Folders under which projects
+            can be served, any folder if None.
+
+    """
+
+    def __init__(
+        self,
+        max_elements: int = 5_000_000,
+        exclude: Optional[List[str]] = None,
+        roots: Optional[List[Union[str, Path]]] = None,
+    ) -> None:
+        self.max_elements = max_elements
+        self.exclude = exclude
+        self.roots = None if roots is None else [Path(root).resolve() for root in roots]
+        self.default_root: Optional[Path] = None
+        self.lock = threading.Lock()
+        self.states: "OrderedDict[Path, ProjectState]" = OrderedDict()
+        # Projects being crawled, for requests arriving during their crawl
+        self._crawling: Dict[Path, "Future[ProjectState]"] = {}
+
+    def get(self, root: Optional[Union[str, Path]] = None) -> ProjectState:
+        """State of a project, crawled if it is not in memory.
+
+        Projects are crawled without holding the cache lock, so that a long
+        crawl only delays the requests for the same project.
+
+        """
+        if root is None:
+            if self.default_root is None:
+                raise ValueError("No root given and no project served yet")
+            root = self.default_root
+        root = Path(root).resolve()
+        if self.roots is not None and not any(
+            root == allowed or allowed in root.parents for allowed in self.roots
+        ):
+            raise ValueError(f"{root} is not under the served roots")
+        if not root.is_dir():
+            raise ValueError(f"No project at {root}")
+        with self.lock:
+            if self.default_root is None:
+                self.default_root = root
+            state = self.states.get(root)
+            if state is not None:
+                self.states.move_to_end(root)
+                return state
+            other_crawl = self._crawling.get(root)
+            if other_crawl is None:
+                crawling: "Future[ProjectState]" = Future()
+                self._crawling[root] = crawling
+        if other_crawl is not None:
+            return other_crawl.result()
+
+        try:
+            state = ProjectState(root, exclude=self.exclude)
+        except BaseException as error:
+            with self.lock:
+                del self._crawling[root]
+            crawling.set_exception(error)
+            raise
+        with self.lock:
+            del self._crawling[root]
+            self.states[root] = state
+            self._evict()
+        crawling.set_result(state)
+        return state
+
+    def _evict(self):
+        total = sum(state.n_elements for state in self.states.values())
+        while total > self.max_elements and len(self.states) > 1:
+            root, state = self.states.popitem(last=False)
+            total -= state.n_elements
+            LOGGER.info("Evicted %s from memory", root)
+
+    def refresh(self) -> Dict[str, List[str]]:
+        with self.lock:
+            states = list(self.states.values())
+        return {
+            str(state.root): [path.as_posix() for path in state.refresh()]
+            for state in states
+        }
+
+    def watch(self, interval: float):
+        """Refresh every project forever, waiting `interval` seconds in between."""
+        while True:
+            time.sleep(interval)
+            try:
+                self.refresh()
+            except Exception:
+                LOGGER.exception("Could not refresh the served projects")
+
+
+def _param(params: Dict[str, List[str]], name: str, default=None):
+    values = params.get(name)
+    return values[-1] if values else default
+
+
+def _list_param(params: Dict[str, List[str]], name: str) -> List[str]:
+    return [
+        value for values in params.get(name, []) for value in values.split(",") if value
+    ]
+
+
+def status_route(projects: ProjectCache, params: Dict[str, List[str]]) -> dict:
+    with projects.lock:
+        states = list(projects.states.values())
+    return {"projects": [state.status() for state in states]}
+
+
+def query_route(projects: ProjectCache, params: Dict[str, List[str]]) -> dict:
+    state = projects.get(_param(params, "root"))
+    node = _param(params, "node")
+    if node is None:
+        raise ValueError("Missing node parameter")
+    relation = _param(params, "relation", "callers")
+    graph_query = state.query()
+    if relation == "path":
+        target = _param(params, "target")
+        if target is None:
+            raise ValueError("Missing target parameter")
+        return {"path": graph_query.dependency_path(node, target)}
+    max_depth = int(_param(params, "depth", 1)) or None
+    if relation == "callers":
+        return {"nodes": graph_query.transitive_callers(node, max_depth)}
+    if relation == "callees":
+        return {"nodes": graph_query.transitive_callees(node, max_depth)}
+    raise ValueError(f"Unknown relation {relation}")
+
+
+def impact_route(projects: ProjectCache, params: Dict[str, List[str]]) -> dict:
+    state = projects.get(_param(params, "root"))
+    impact_index = state.impact_index(_param(params, "select", "tests/"))
+    return {"tests": impact_index.affected_tests(_list_param(params, "changed"))}
+
+
+def export_route(projects: ProjectCache, params: Dict[str, List[str]]) -> dict:
+    return projects.get(_param(params, "root")).cytoscape()
+
+
+def refresh_route(projects: ProjectCache, params: Dict[str, List[str]]) -> dict:
+    if _param(params, "root") is not None:
+        projects.get(_param(params, "root"))
+    return {"changed": projects.refresh()}
+
+
+ROUTES = {
+    "/status": status_route,
+    "/query": query_route,
+    "/impact": impact_route,
+    "/export": export_route,
+    "/refresh": refresh_route,
+}
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """Answers the `ROUTES` of the served projects in JSON."""
+
+    def do_GET(self):
+        allowed_hosts = self.server.allowed_hosts
+        if allowed_hosts is not None:
+            host = urlsplit("//" + self.headers.get("Host", "")).hostname
+            if host not in allowed_hosts:
+                self.send_json(403, {"error": f"Host {host} is not allowed"})
+                return
+        url = urlsplit(self.path)
+        route = ROUTES.get(url.path)
+        if route is None:
+            self.send_json(404, {"error": f"Unknown route {url.path}"})
+            return
+        try:
+            payload = route(self.server.projects, parse_qs(url.query))
+        except ValueError as error:
+            self.send_json(400, {"error": str(error)})
+            return
+        except Exception as error:
+            LOGGER.exception("Could not answer %s", self.path)
+            self.send_json(500, {"error": f"{type(error).__name__}: {error}"})
+            return
+        self.send_json(200, payload)
+
+    def send_json(self, status: int, payload: object):
+        body = json.dumps(payload, separators=(",", ":")).encode("utf8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt: str, *args):
+        LOGGER.debug(fmt, *args)
+
+
+class GraphServer(ThreadingHTTPServer):
+    """HTTP server of project graphs, on a local TCP port.
+
+    Attributes:
+        allowed_hosts (Set[str]): Host names requests can be addressed to.
+
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, projects: ProjectCache) -> None:
+        super().__init__(address, RequestHandler)
+        self.projects = projects
+        self.allowed_hosts: Optional[Set[str]] = {
+            *LOCAL_HOSTS,
+            address[0].lower(),
+            str(self.server_address[0]).lower(),
+        }
+
+
+class UnixGraphServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP server of project graphs, on a Unix socket."""
+
+    daemon_threads = True
+
+    def __init__(self, path: Union[str, Path], projects: ProjectCache) -> None:
+        super().__init__(str(path), RequestHandler)
+        self.projects = projects
+        # Unix sockets are not reachable from web pages
+        self.allowed_hosts: Optional[Set[str]] = None
+
+
+def serve(
+    projects: ProjectCache,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Optional[Union[str, Path]] = None,
+    interval: Optional[float] = 1.0,
+):
+    """Serve projects until interrupted, watching their files for changes.
+
+    Args:
+        projects (ProjectCache): Projects to serve, more being added on request.
+        host (str): Interface to listen on, localhost by default.
+        port (int): TCP port to listen on.
+        socket_path (Optional[Union[str, Path]]): Listen on this Unix socket
+            instead of a TCP port.
+        interval (Optional[float]): Seconds between checks for changed files,
+            only checked on '/refresh' if None.
+
+    """
+    if interval is not None:
+        watcher = threading.Thread(target=projects.watch, args=(interval,), daemon=True)
+        watcher.start()
+
+    server: socketserver.BaseServer
+    if socket_path is not None:
+        if Path(socket_path).exists():
+            os.unlink(socket_path)
+        server = UnixGraphServer(socket_path, projects)
+        LOGGER.info("Serving on %s", socket_path)
+    else:
+        tcp_server = GraphServer((host, port), projects)
+        LOGGER.info("Serving on http://%s:%s", host, tcp_server.server_address[1])
+        server = tcp_server
+    with server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,162 @@
+"""Open graphs saved by byparse in any of its formats, to iterate over them.
+
+Every opened graph has the `iter_nodes` and `iter_edges` methods of the stores,
+yielding `(node, attrs)` and `(source, target, attrs)`, and can be used as a
+context manager. Snapshots, SQLite stores and NDJSON files are read lazily,
+cytoscape JSON files are parsed at once. Every format gives the same graph, the
+CONTEXT and PATH edges of cytoscape exports being rebuilt from the 'parent'
+attribute of their nodes.
+
+"""
+
+import gzip
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List, Optional, Set, TextIO, Tuple, Union
+
+from byparse.abc import EdgeType, NodeType
+from byparse.stores.snapshot import GraphSnapshot
+from byparse.stores.sqlite_store import SqliteGraphStore
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+SNAPSHOT_SUFFIXES = (".bpg",)
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+NDJSON_SUFFIXES = (".ndjson", ".ndjson.gz")
+JSON_SUFFIXES = (".json", ".json.gz")
+
+# Keys of cytoscape elements data that are not attributes of the graph
+CYTOSCAPE_KEYS = ("id", "source", "target")
+
+
+def open_text_input(path: Union[str, Path]) -> TextIO:
+    if str(path).endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf8")
+    return open(path, "r", encoding="utf8")
+
+
+def _element_attrs(element: dict) -> dict:
+    data = element["data"]
+    attrs = {key: value for key, value in data.items() if key not in CYTOSCAPE_KEYS}
+    if "position" in element:
+        attrs["position"] = element["position"]
+    return attrs
+
+
+class CytoscapeFile:
+    """Graph exported as cytoscape JSON or NDJSON elements.
+
+    Cytoscape exports do not hold CONTEXT and PATH edges, the hierarchy being
+    given by the 'parent' attribute of nodes. They are yielded again by
+    `iter_edges`, as PATH edges to folders and CONTEXT edges to other parents.
+
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.is_ndjson = str(path).endswith(NDJSON_SUFFIXES)
+        self._elements: Optional[dict] = None
+        if not self.is_ndjson:
+            with open_text_input(self.path) as file:
+                self._elements = json.load(file)
+
+    def close(self):
+        self._elements = None
+
+    def __enter__(self) -> "CytoscapeFile":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _iter_group(self, group: str) -> Iterator[dict]:
+        if not self.is_ndjson:
+            if self._elements is None:
+                raise ValueError(f"{self.path} is closed")
+            yield from self._elements[group]
+            return
+        with open_text_input(self.path) as file:
+            for line in file:
+                if line.strip():
+                    element = json.loads(line)
+                    if element.get("group") == group:
+                        yield element
+
+    def iter_nodes(self) -> Iterator[Tuple[str, dict]]:
+        for element in self._iter_group("nodes"):
+            yield element["data"]["id"], _element_attrs(element)
+
+    def iter_edges(self) -> Iterator[Tuple[str, str, dict]]:
+        nodes: Set[str] = set()
+        folders: Set[str] = set()
+        parents: List[Tuple[str, str]] = []
+        for element in self._iter_group("nodes"):
+            data = element["data"]
+            nodes.add(data["id"])
+            if data.get("type") == NodeType.FOLDER.name:
+                folders.add(data["id"])
+            if data.get("parent") is not None:
+                parents.append((data["id"], data["parent"]))
+        for child, parent in parents:
+            if parent in nodes:
+                edge_type = EdgeType.PATH if parent in folders else EdgeType.CONTEXT
+                yield child, parent, {"type": edge_type.name}
+
+        for element in self._iter_group("edges"):
+            data = element["data"]
+            yield data["source"], data["target"], _element_attrs(element)
+
+
+class NetworkxGraph:
+    """Graph built in memory, with the same interface as the saved ones."""
+
+    def __init__(self, graph: "nx.MultiDiGraph") -> None:
+        self.graph = graph
+
+    def close(self):
+        pass
+
+    def __enter__(self) -> "NetworkxGraph":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def iter_nodes(self) -> Iterator[Tuple[str, dict]]:
+        return iter(self.graph.nodes(data=True))
+
+    def iter_edges(self) -> Iterator[Tuple[str, str, dict]]:
+        return iter(self.graph.edges(data=True))
+
+
+def open_graph(path: Union[str, Path]):
+    """Open a saved graph, its format being given by its suffix.
+
+    A project directory is crawled and its graph built in memory.
+
+    Args:
+        path (Union[str, Path]): Snapshot (.bpg), SQLite store (.db, .sqlite),
+            cytoscape json or ndjson (optionally gzipped), or project directory.
+
+    Raises:
+        FileNotFoundError: If the path does not exist.
+        ValueError: If the format of the file is unknown.
+
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"No graph at {path}")
+    if path.is_dir():
+        from byparse.project_crawl import ProjectCrawler
+
+        return NetworkxGraph(ProjectCrawler(str(path)).build_project_graph())
+
+    name = path.name
+    if name.endswith(SNAPSHOT_SUFFIXES):
+        return GraphSnapshot(path)
+    if name.endswith(SQLITE_SUFFIXES):
+        return SqliteGraphStore(path, mode="r")
+    if name.endswith(NDJSON_SUFFIXES + JSON_SUFFIXES):
+        return CytoscapeFile(path)
+    raise ValueError(f"Unknown graph format for {path}")
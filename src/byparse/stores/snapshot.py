@@ -0,0 +1,341 @@
+"""Versioned binary snapshot of a graph, memory-mapped for instant reload.
+
+Layout of a '.bpg' file (little-endian):
+
+    header    magic, version, counts, then (offset, count) of each section
+    sections  8-bytes aligned arrays, in the order of `SECTIONS`
+
+Node ids are the first `n_nodes` strings of the string table, sorted so that
+a node index can be found by binary search. Edges are sorted by source then
+target, `out_offsets` giving the outgoing edges of each node (CSR) while
+`in_edge_indexes` lists edges sorted by target, sliced using `in_offsets`.
+`node_lines` holds the size in lines of files, classes and functions,
+`NO_LINES` for the other nodes.
+
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from enum import Enum
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+from byparse.abc import EdgeType, NodeType
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+MAGIC = b"BPG\x00"
+VERSION = 2
+NO_LINES = 0xFFFFFFFF
+
+SECTIONS = (
+    ("string_offsets", "Q"),
+    ("strings", "B"),
+    ("node_labels", "I"),
+    ("node_types", "B"),
+    ("node_lines", "I"),
+    ("edge_sources", "I"),
+    ("edge_targets", "I"),
+    ("edge_types", "B"),
+    ("out_offsets", "I"),
+    ("in_offsets", "I"),
+    ("in_edge_indexes", "I"),
+)
+
+HEADER = struct.Struct("<4sHHIII4x" + "QQ" * len(SECTIONS))
+ALIGNMENT = 8
+
+
+class SnapshotError(ValueError):
+    """Raised when a file is not a snapshot this version can read."""
+
+
+def _type_code(enum_type: Type[Enum], name: Optional[str]) -> int:
+    """Code of an enum member name, 0 if unknown."""
+    if name is not None and name in enum_type.__members__:
+        return int(enum_type[name].value)
+    return 0
+
+
+def _type_codes(enum_type: Type[Enum]) -> List[int]:
+    return [0] + [member.value for member in enum_type]
+
+
+def _type_name(enum_type: Type[Enum], code: int) -> Optional[str]:
+    if code == 0:
+        return None
+    return enum_type(code).name
+
+
+def _offsets_from_counts(counts: Sequence[int]) -> array:
+    offsets = array("I", [0])
+    total = 0
+    for count in counts:
+        total += count
+        offsets.append(total)
+    return offsets
+
+
+def write_snapshot(graph: "nx.MultiDiGraph", path: Union[str, Path]):
+    """Write a graph as a binary snapshot readable by `GraphSnapshot`.
+
+    Only node labels and types and edge types are kept, other attributes
+    such as colors are meant to be computed again from them.
+
+    Args:
+        graph (nx.MultiDiGraph): Graph to save.
+        path (Union[str, Path]): Path of the '.bpg' file to write.
+
+    """
+    node_ids: List[str] = sorted(str(node) for node in graph.nodes)
+    node_index: Dict[str, int] = {node: i for i, node in enumerate(node_ids)}
+
+    strings: List[str] = list(node_ids)
+    string_index: Dict[str, int] = dict(node_index)
+    node_labels = array("I", bytes(4 * len(node_ids)))
+    node_types = array("B", bytes(len(node_ids)))
+    node_lines = array("I", [NO_LINES]) * len(node_ids)
+    for node, node_attrs in graph.nodes(data=True):
+        i = node_index[str(node)]
+        label = str(node_attrs.get("label", node))
+        if label not in string_index:
+            string_index[label] = len(strings)
+            strings.append(label)
+        node_labels[i] = string_index[label]
+        node_types[i] = _type_code(NodeType, node_attrs.get("type"))
+        if node_attrs.get("lines") is not None:
+            node_lines[i] = node_attrs["lines"]
+
+    edges: List[Tuple[int, int, int]] = sorted(
+        (
+            node_index[str(source)],
+            node_index[str(target)],
+            _type_code(EdgeType, edge_type),
+        )
+        for source, target, edge_type in graph.edges(data="type")
+    )
+    edge_sources = array("I", (edge[0] for edge in edges))
+    edge_targets = array("I", (edge[1] for edge in edges))
+    edge_types = array("B", (edge[2] for edge in edges))
+    in_edge_indexes = array(
+        "I", sorted(range(len(edges)), key=lambda e: (edge_targets[e], e))
+    )
+
+    out_counts = [0] * len(node_ids)
+    in_counts = [0] * len(node_ids)
+    for source, target, _ in edges:
+        out_counts[source] += 1
+        in_counts[target] += 1
+
+    encoded_strings = [string.encode("utf8") for string in strings]
+    string_offsets = array("Q", [0])
+    for encoded in encoded_strings:
+        string_offsets.append(string_offsets[-1] + len(encoded))
+
+    sections = {
+        "string_offsets": string_offsets,
+        "strings": array("B", b"".join(encoded_strings)),
+        "node_labels": node_labels,
+        "node_types": node_types,
+        "node_lines": node_lines,
+        "edge_sources": edge_sources,
+        "edge_targets": edge_targets,
+        "edge_types": edge_types,
+        "out_offsets": _offsets_from_counts(out_counts),
+        "in_offsets": _offsets_from_counts(in_counts),
+        "in_edge_indexes": in_edge_indexes,
+    }
+
+    section_bytes: List[bytes] = []
+    section_table: List[int] = []
+    offset = HEADER.size
+    for name, _ in SECTIONS:
+        values = sections[name]
+        if sys.byteorder != "little":
+            values.byteswap()
+        data = values.tobytes()
+        padding = -offset % ALIGNMENT
+        offset += padding
+        section_table += [offset, len(values)]
+        section_bytes.append(b"\x00" * padding + data)
+        offset += len(data)
+
+    with open(path, "wb") as fp:
+        fp.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                0,
+                len(node_ids),
+                len(edges),
+                len(strings),
+                *section_table,
+            )
+        )
+        for data in section_bytes:
+            fp.write(data)
+
+
+class GraphSnapshot:
+    """Read-only graph memory-mapped from a '.bpg' snapshot file.
+
+    Arrays are zero-copy views on the mapped file, so opening is immediate
+    whatever the graph size and processes opening the same snapshot share
+    the same pages.
+
+    Example:
+        >>> with GraphSnapshot("graph.bpg") as snapshot:
+        ...     node = snapshot.find_node("package/module.py>func")
+        ...     callers = [snapshot.node_id(snapshot.edge_targets[e])
+        ...                for e in snapshot.out_edges(node)]
+
+    """
+
+    string_offsets: memoryview
+    strings: memoryview
+    node_labels: memoryview
+    node_types: memoryview
+    node_lines: memoryview
+    edge_sources: memoryview
+    edge_targets: memoryview
+    edge_types: memoryview
+    out_offsets: memoryview
+    in_offsets: memoryview
+    in_edge_indexes: memoryview
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as fp:
+            self._mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < HEADER.size:
+            raise SnapshotError(f"{self.path} is not a byparse snapshot")
+        magic, version, _, n_nodes, n_edges, n_strings, *table = HEADER.unpack_from(
+            self._mmap
+        )
+        if magic != MAGIC:
+            raise SnapshotError(f"{self.path} is not a byparse snapshot")
+        if version != VERSION:
+            raise SnapshotError(
+                f"{self.path} is a version {version} snapshot,"
+                f" only version {VERSION} is supported"
+            )
+        self.n_nodes: int = n_nodes
+        self.n_edges: int = n_edges
+        self.n_strings: int = n_strings
+
+        self._views: List[memoryview] = []
+        buffer = memoryview(self._mmap)
+        self._views.append(buffer)
+        for i, (name, item_format) in enumerate(SECTIONS):
+            offset, count = table[2 * i], table[2 * i + 1]
+            nbytes = count * struct.calcsize(item_format)
+            view = buffer[offset : offset + nbytes]
+            if sys.byteorder != "little" and item_format != "B":
+                values = array(item_format)
+                values.frombytes(view)
+                values.byteswap()
+                view = memoryview(values)
+            else:
+                # Formats of SECTIONS, which typeshed only accepts as literals
+                view = view.cast(item_format)  # type: ignore[call-overload]
+            self._views.append(view)
+            setattr(self, name, view)
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self) -> "GraphSnapshot":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def string(self, index: int) -> str:
+        start, end = self.string_offsets[index], self.string_offsets[index + 1]
+        return str(self.strings[start:end], "utf8")
+
+    def node_id(self, node: int) -> str:
+        return self.string(node)
+
+    def node_label(self, node: int) -> str:
+        return self.string(self.node_labels[node])
+
+    def node_type(self, node: int) -> Optional[str]:
+        return _type_name(NodeType, self.node_types[node])
+
+    def node_size(self, node: int) -> Optional[int]:
+        """Number of lines of a file, class or function node."""
+        lines = self.node_lines[node]
+        return None if lines == NO_LINES else lines
+
+    def edge_type(self, edge: int) -> Optional[str]:
+        return _type_name(EdgeType, self.edge_types[edge])
+
+    def find_node(self, node_id: str) -> Optional[int]:
+        """Index of a node given its id, None if it is not in the graph."""
+        key = node_id.encode("utf8")
+        low, high = 0, self.n_nodes
+        while low < high:
+            middle = (low + high) // 2
+            start = self.string_offsets[middle]
+            end = self.string_offsets[middle + 1]
+            if bytes(self.strings[start:end]) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.n_nodes and self.node_id(low) == node_id:
+            return low
+        return None
+
+    def out_edges(self, node: int) -> range:
+        """Indexes of the edges going out of a node."""
+        return range(self.out_offsets[node], self.out_offsets[node + 1])
+
+    def in_edges(self, node: int) -> memoryview:
+        """Indexes of the edges coming into a node."""
+        start, end = self.in_offsets[node], self.in_offsets[node + 1]
+        return self.in_edge_indexes[start:end]
+
+    def iter_nodes(self) -> Iterator[Tuple[str, dict]]:
+        for node in range(self.n_nodes):
+            attrs: dict = {"label": self.node_label(node), "type": self.node_type(node)}
+            lines = self.node_size(node)
+            if lines is not None:
+                attrs["lines"] = lines
+            yield self.node_id(node), attrs
+
+    def iter_edges(self) -> Iterator[Tuple[str, str, dict]]:
+        # Decode each node id and type once instead of once per edge
+        node_ids = [self.node_id(node) for node in range(self.n_nodes)]
+        type_names = {
+            code: _type_name(EdgeType, code) for code in _type_codes(EdgeType)
+        }
+        for source, target, code in zip(
+            self.edge_sources, self.edge_targets, self.edge_types
+        ):
+            yield node_ids[source], node_ids[target], {"type": type_names[code]}
+
+    def to_networkx(self) -> "nx.MultiDiGraph":
+        import networkx as nx
+
+        graph = nx.MultiDiGraph()
+        graph.add_nodes_from(self.iter_nodes())
+        graph.add_edges_from(self.iter_edges())
+        return graph
@@ -0,0 +1,236 @@
+"""Graph store writing nodes and edges to a SQLite database as they are built."""
+
+import sqlite3
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple, Union
+
+from byparse.abc import EdgeType
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    id TEXT PRIMARY KEY,
+    label TEXT,
+    type TEXT,
+    lines INTEGER
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS edges (
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    type TEXT
+);
+"""
+
+DROP = """
+DROP TABLE IF EXISTS edges;
+DROP TABLE IF EXISTS nodes;
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS edges_source ON edges (source, type);
+CREATE INDEX IF NOT EXISTS edges_target ON edges (target, type);
+CREATE INDEX IF NOT EXISTS edges_type ON edges (type);
+"""
+
+
+def _node_attrs(label: Optional[str], node_type: Optional[str], lines: Optional[int]):
+    attrs: dict = {"label": label, "type": node_type}
+    if lines is not None:
+        attrs["lines"] = lines
+    return attrs
+
+
+class SqliteGraphStore:
+    """Out-of-core graph backed by a SQLite database.
+
+    Can be given as the graph of `build_project_graph`, `build_contexts_graph`
+    or `build_call_graph`: nodes and edges are buffered and written by batches,
+    so the memory used by the graph stays bounded by the batch size.
+    Indexes on edges sources, targets and types are created on `close`,
+    once everything is inserted.
+
+    Opened with mode 'w', the nodes and edges of an existing database are
+    deleted first, with 'a' new ones are added to them. Mode 'r' opens the
+    database read only, without creating it nor writing anything to it.
+
+    Edges go from the used name to the context using it, hence the callers of
+    a function are the targets of its 'CALL' edges.
+
+    Example:
+        >>> with SqliteGraphStore("graph.db", mode="w") as store:
+        ...     project.build_project_graph(store)
+        >>> with SqliteGraphStore("graph.db", mode="r") as store:
+        ...     store.callers("package/module.py>func")
+
+    """
+
+    def __init__(
+        self, path: Union[str, Path], batch_size: int = 10000, mode: str = "a"
+    ) -> None:
+        if mode not in ("r", "w", "a"):
+            raise ValueError(f"Unknown mode {mode}, expected 'r', 'w' or 'a'")
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.read_only = mode == "r"
+        if self.read_only:
+            self.connection = sqlite3.connect(
+                f"{self.path.absolute().as_uri()}?mode=ro", uri=True
+            )
+        else:
+            self.connection = sqlite3.connect(str(self.path))
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            if mode == "w":
+                self.connection.executescript(DROP)
+            self.connection.executescript(SCHEMA)
+
+        columns = [
+            row[1] for row in self.connection.execute("PRAGMA table_info(nodes)")
+        ]
+        # Database written before lines were stored
+        self._lines_column = "lines"
+        if "lines" not in columns:
+            if self.read_only:
+                self._lines_column = "NULL"
+            else:
+                self.connection.execute("ALTER TABLE nodes ADD COLUMN lines INTEGER")
+
+        self._pending_nodes: Dict[
+            str, Tuple[Optional[str], Optional[str], Optional[int]]
+        ] = {}
+        self._pending_edges: List[Tuple[str, str, Optional[str]]] = []
+
+    def add_node(
+        self,
+        node: str,
+        label: Optional[str] = None,
+        type=None,
+        lines: Optional[int] = None,
+        **_,
+    ):
+        self._pending_nodes[str(node)] = (label, type, lines)
+        if len(self._pending_nodes) >= self.batch_size:
+            self.flush()
+
+    def add_edge(self, source: str, target: str, type=None, **_):
+        self._pending_edges.append((str(source), str(target), type))
+        if len(self._pending_edges) >= self.batch_size:
+            self.flush()
+
+    def has_node(self, node: str) -> bool:
+        node = str(node)
+        if node in self._pending_nodes:
+            return True
+        cursor = self.connection.execute("SELECT 1 FROM nodes WHERE id = ?", (node,))
+        return cursor.fetchone() is not None
+
+    def __contains__(self, node: str) -> bool:
+        return self.has_node(node)
+
+    def flush(self):
+        """Write buffered nodes and edges to the database."""
+        if not self._pending_nodes and not self._pending_edges:
+            return
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO nodes (id, label, type, lines) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (id) DO UPDATE SET label = excluded.label,"
+                " type = excluded.type, lines = excluded.lines",
+                ((node, *attrs) for node, attrs in self._pending_nodes.items()),
+            )
+            # Nodes only referenced by edges, as networkx would add them
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO nodes (id) VALUES (?)",
+                (
+                    (node,)
+                    for source, target, _ in self._pending_edges
+                    for node in (source, target)
+                ),
+            )
+            self.connection.executemany(
+                "INSERT INTO edges (source, target, type) VALUES (?, ?, ?)",
+                self._pending_edges,
+            )
+        self._pending_nodes = {}
+        self._pending_edges = []
+
+    def close(self):
+        if not self.read_only:
+            self.flush()
+            self.connection.executescript(INDEXES)
+            # Single file database, that read only connections do not write to
+            self.connection.execute("PRAGMA journal_mode=DELETE")
+        self.connection.close()
+
+    def __enter__(self) -> "SqliteGraphStore":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def number_of_nodes(self) -> int:
+        self.flush()
+        return int(self.connection.execute("SELECT COUNT(*) FROM nodes").fetchone()[0])
+
+    def number_of_edges(self) -> int:
+        self.flush()
+        return int(self.connection.execute("SELECT COUNT(*) FROM edges").fetchone()[0])
+
+    def successors(self, node: str, edge_type: Optional[str] = None) -> List[str]:
+        """Targets of the edges going out of a node, of the given type if any."""
+        self.flush()
+        query = "SELECT target FROM edges WHERE source = ?"
+        params: Tuple[str, ...] = (node,)
+        if edge_type is not None:
+            query += " AND type = ?"
+            params += (edge_type,)
+        return [row[0] for row in self.connection.execute(query, params)]
+
+    def predecessors(self, node: str, edge_type: Optional[str] = None) -> List[str]:
+        """Sources of the edges coming into a node, of the given type if any."""
+        self.flush()
+        query = "SELECT source FROM edges WHERE target = ?"
+        params: Tuple[str, ...] = (node,)
+        if edge_type is not None:
+            query += " AND type = ?"
+            params += (edge_type,)
+        return [row[0] for row in self.connection.execute(query, params)]
+
+    def callers(self, node: str) -> List[str]:
+        return self.successors(node, EdgeType.CALL.name)
+
+    def callees(self, node: str) -> List[str]:
+        return self.predecessors(node, EdgeType.CALL.name)
+
+    def node_attrs(self, node: str) -> Optional[dict]:
+        """Attributes of a node, None if it is not in the graph."""
+        self.flush()
+        row = self.connection.execute(
+            f"SELECT label, type, {self._lines_column} FROM nodes WHERE id = ?",
+            (node,),
+        ).fetchone()
+        return None if row is None else _node_attrs(*row)
+
+    def iter_nodes(self) -> Iterator[Tuple[str, dict]]:
+        self.flush()
+        for node, *row in self.connection.execute(
+            f"SELECT id, label, type, {self._lines_column} FROM nodes"
+        ):
+            yield node, _node_attrs(*row)
+
+    def iter_edges(self) -> Iterator[Tuple[str, str, dict]]:
+        self.flush()
+        for source, target, edge_type in self.connection.execute(
+            "SELECT source, target, type FROM edges"
+        ):
+            yield source, target, {"type": edge_type}
+
+    def to_networkx(self) -> "nx.MultiDiGraph":
+        import networkx as nx
+
+        graph = nx.MultiDiGraph()
+        graph.add_nodes_from(self.iter_nodes())
+        graph.add_edges_from(self.iter_edges())
+        return graph
@@ -17,6 +17,23 @@ def link_path_to_name(path: Union[Path, str], name: str):
     return ">".join((str(path), name))
 
 
+def ast_lines(root_ast: Union[ast.Module, ast.FunctionDef, ast.ClassDef]) -> int:
+    """Number of lines of a module or definition, decorators included."""
+    if isinstance(root_ast, ast.Module):
+        return max(
+            (
+                getattr(node, "end_lineno", None) or node.lineno
+                for node in root_ast.body
+            ),
+            default=0,
+        )
+    first_line = min(
+        [root_ast.lineno] + [decorator.lineno for decorator in root_ast.decorator_list]
+    )
+    last_line = getattr(root_ast, "end_lineno", None) or root_ast.lineno
+    return last_line - first_line + 1
+
+
 def ast_call_name(call: ast.Call):
     call_name = ""
     element = call.func
@@ -1,54 +1,74 @@
-from typing import List
+from typing import Iterator, List, Optional
 import networkx as nx
 from byparse.abc import EdgeType, NodeType
+from byparse.graphs.hierarchy import HierarchyIndex
 
 
-def networkx_to_cytoscape_fcose(graph: nx.MultiDiGraph) -> dict:
+def cytoscape_node(node: str, node_attrs: dict) -> dict:
+    element = {"data": {"id": node, **node_attrs}}
+    if "position" in node_attrs:
+        element["position"] = element["data"].pop("position")
+    return element
+
+
+def cytoscape_edge(source: str, target: str, edge_attrs: dict) -> dict:
+    return {
+        "data": {
+            "id": f"{source}->{target}",
+            "source": source,
+            "target": target,
+            "arrow": edge_attrs.get("arrow", "triangle-backcurve"),
+            **edge_attrs,
+        }
+    }
+
+
+def iter_cytoscape_nodes(graph: nx.MultiDiGraph) -> Iterator[dict]:
+    for node, node_attrs in graph.nodes(data=True):
+        yield cytoscape_node(node, node_attrs)
 
-    nodes: List[dict] = []
-    edges: List[dict] = []
 
+def iter_cytoscape_edges(graph: nx.MultiDiGraph) -> Iterator[dict]:
     for source, target, edge_attrs in graph.edges(data=True):
         if edge_attrs["type"] not in (EdgeType.CONTEXT.name, EdgeType.PATH.name):
-            edges.append(
-                {
-                    "data": {
-                        "id": f"{source}->{target}",
-                        "source": source,
-                        "target": target,
-                        "arrow": edge_attrs.get("arrow", "triangle-backcurve"),
-                        **edge_attrs,
-                    }
-                }
-            )
+            yield cytoscape_edge(source, target, edge_attrs)
 
-    for node, node_attrs in graph.nodes(data=True):
-        nodes.append({"data": {"id": node, **node_attrs}})
 
+def networkx_to_cytoscape_fcose(graph: nx.MultiDiGraph) -> dict:
+    nodes: List[dict] = list(iter_cytoscape_nodes(graph))
+    edges: List[dict] = list(iter_cytoscape_edges(graph))
     return {"nodes": nodes, "edges": edges}
 
 
-def networkx_to_cytoscape_fcose_constraints(graph: nx.MultiDiGraph) -> dict:
+def networkx_to_cytoscape_fcose_constraints(
+    graph: nx.MultiDiGraph, hierarchy: Optional[HierarchyIndex] = None
+) -> dict:
+
+    if hierarchy is None:
+        hierarchy = HierarchyIndex(graph)
 
-    valign: List[dict] = []
-    halign: List[dict] = []
+    valign: List[List[str]] = []
+    halign: List[List[str]] = []
     relative_constraints: List[dict] = []
     nodes_positions: List[dict] = []
 
-    for _, node_attrs in graph.nodes(data=True):
-        if node_attrs["type"] == NodeType.CLASS.name and "childs" in node_attrs:
-            aligned_childs = [
-                node
-                for node in node_attrs["childs"]
-                if not graph.nodes[node].get("childs", [])
-            ]
+    for i, node in enumerate(hierarchy.nodes):
+        node_attrs = graph.nodes[node]
+        if hierarchy.is_leaf(i):
+            if "position" in node_attrs:
+                nodes_positions.append(
+                    {"nodeId": node, "position": node_attrs["position"]}
+                )
+            continue
+
+        aligned_childs = [
+            hierarchy.nodes[child]
+            for child in hierarchy.children_positions(i)
+            if hierarchy.is_leaf(child)
+        ]
+        if node_attrs["type"] == NodeType.CLASS.name:
             halign.append(aligned_childs)
-        if node_attrs["type"] == NodeType.FILE.name and "childs" in node_attrs:
-            aligned_childs = [
-                node
-                for node in node_attrs["childs"]
-                if not graph.nodes[node].get("childs", [])
-            ]
+        if node_attrs["type"] == NodeType.FILE.name:
             valign.append(aligned_childs)
 
     return {
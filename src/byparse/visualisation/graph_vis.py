@@ -1,16 +1,26 @@
+from typing import Optional
+
 import networkx as nx
 
 from byparse.abc import NodeType, EdgeType
+from byparse.graphs.hierarchy import HierarchyIndex
+
+
+def compute_parents(
+    graph: nx.MultiDiGraph, hierarchy: Optional[HierarchyIndex] = None
+) -> HierarchyIndex:
+    """Set the 'parent' attribute of nodes, as used by cytoscape compound nodes.
 
+    Returns:
+        HierarchyIndex: Hierarchy of the graph, to be reused for the constraints.
 
-def compute_parents_and_childs(graph: nx.MultiDiGraph):
-    for source, target, edge_attrs in graph.edges(data=True):
-        if edge_attrs["type"] in (EdgeType.CONTEXT.name, EdgeType.PATH.name):
-            graph.nodes[source]["parent"] = target
-            if "childs" in graph.nodes[target]:
-                graph.nodes[target]["childs"].append(source)
-            else:
-                graph.nodes[target]["childs"] = [source]
+    """
+    if hierarchy is None:
+        hierarchy = HierarchyIndex(graph)
+    for node, parent in zip(hierarchy.nodes, hierarchy.parents):
+        if parent >= 0:
+            graph.nodes[node]["parent"] = hierarchy.nodes[parent]
+    return hierarchy
 
 
 def color_context_graph(
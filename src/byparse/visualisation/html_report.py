@@ -0,0 +1,300 @@
+"""Self-contained offline HTML report of a graph.
+
+The graph is embedded in the page as compact column-oriented JSON, gzip
+compressed and base64 encoded, and decompressed in the browser with
+`DecompressionStream`. Nodes are packed inside their parents and drawn on a
+canvas, so neither the page size nor its rendering go through one DOM or
+JavaScript object per element.
+
+"""
+
+import base64
+import gzip
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import networkx as nx
+
+from byparse.graphs.hierarchy import HIERARCHY_EDGES, HierarchyIndex
+
+
+def build_report_data(
+    graph: nx.MultiDiGraph, hierarchy: Optional[HierarchyIndex] = None
+) -> dict:
+    """Column-oriented data of the graph, nodes ordered from the roots down.
+
+    Args:
+        graph (nx.MultiDiGraph): Graph to report, it is not modified.
+        hierarchy (Optional[HierarchyIndex]): Hierarchy of the graph, built if not given.
+
+    Returns:
+        dict: Node and edge columns, types and colors being indexes in
+            'nodeTypes', 'edgeTypes' and 'colors'.
+
+    """
+    if hierarchy is None:
+        hierarchy = HierarchyIndex(graph)
+
+    node_types: Dict[str, int] = {}
+    edge_types: Dict[str, int] = {}
+    colors: Dict[str, int] = {}
+
+    # Position of each node in the exported arrays, parents before children
+    array_position = {position: i for i, position in enumerate(hierarchy.order)}
+    nodes: Dict[str, List] = {
+        "id": [],
+        "label": [],
+        "type": [],
+        "color": [],
+        "parent": [],
+    }
+    has_positions = False
+    xs, ys = [], []
+    for i in hierarchy.order:
+        node = hierarchy.nodes[i]
+        node_attrs = graph.nodes[node]
+        nodes["id"].append(node)
+        nodes["label"].append(node_attrs.get("label", str(node)))
+        node_type = str(node_attrs.get("type"))
+        nodes["type"].append(node_types.setdefault(node_type, len(node_types)))
+        color = str(node_attrs.get("color", "grey"))
+        nodes["color"].append(colors.setdefault(color, len(colors)))
+        parent = hierarchy.parents[i]
+        nodes["parent"].append(array_position[parent] if parent >= 0 else -1)
+        position = node_attrs.get("position")
+        if position is not None:
+            has_positions = True
+            xs.append(round(position["x"]))
+            ys.append(round(position["y"]))
+        else:
+            xs.append(0)
+            ys.append(0)
+    if has_positions:
+        nodes["x"], nodes["y"] = xs, ys
+
+    edges: Dict[str, List] = {"source": [], "target": [], "type": [], "color": []}
+    for source, target, edge_attrs in graph.edges(data=True):
+        edge_type = edge_attrs["type"]
+        if edge_type in HIERARCHY_EDGES:
+            continue
+        edges["source"].append(array_position[hierarchy.index[source]])
+        edges["target"].append(array_position[hierarchy.index[target]])
+        edges["type"].append(edge_types.setdefault(edge_type, len(edge_types)))
+        color = str(edge_attrs.get("color", "grey"))
+        edges["color"].append(colors.setdefault(color, len(colors)))
+
+    return {
+        "nodeTypes": list(node_types),
+        "edgeTypes": list(edge_types),
+        "colors": list(colors),
+        "nodes": nodes,
+        "edges": edges,
+    }
+
+
+def encode_report_data(data: dict, compresslevel: int = 6) -> str:
+    """Compact JSON of the data, gzip compressed and base64 encoded."""
+    compact_json = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    compressed = gzip.compress(compact_json.encode("utf-8"), compresslevel)
+    return base64.b64encode(compressed).decode("ascii")
+
+
+def write_html_report(
+    graph: nx.MultiDiGraph,
+    path: Union[str, Path],
+    title: str = "byparse report",
+    hierarchy: Optional[HierarchyIndex] = None,
+):
+    """Write the graph as a single offline HTML file.
+
+    Args:
+        graph (nx.MultiDiGraph): Graph to report, it is not modified.
+        path (Union[str, Path]): Path of the HTML file.
+        title (str): Title of the page.
+        hierarchy (Optional[HierarchyIndex]): Hierarchy of the graph, built if not given.
+
+    """
+    encoded = encode_report_data(build_report_data(graph, hierarchy))
+    html = (
+        REPORT_TEMPLATE.replace("{{title}}", _escape_html(title))
+        .replace("{{data}}", encoded)
+        .replace("{{script}}", REPORT_SCRIPT)
+    )
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(html)
+
+
+def _escape_html(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+REPORT_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{{title}}</title>
+<style>
+html, body { margin: 0; height: 100%; overflow: hidden; font: 13px sans-serif; }
+#graph { width: 100%; height: 100%; display: block; background: #fdfdfd; }
+#info { position: absolute; top: 8px; left: 8px; padding: 4px 8px;
+  background: rgba(255, 255, 255, 0.9); border: 1px solid #ccc; }
+</style>
+</head>
+<body>
+<canvas id="graph"></canvas>
+<div id="info">Loading...</div>
+<script id="graph-data" type="application/octet-stream">{{data}}</script>
+<script>{{script}}</script>
+</body>
+</html>
+"""
+
+REPORT_SCRIPT = """
+"use strict";
+const NODE_RADIUS = 20, PADDING = 10, GOLDEN_ANGLE = Math.PI * (3 - Math.sqrt(5));
+const canvas = document.getElementById("graph");
+const info = document.getElementById("info");
+const context = canvas.getContext("2d");
+let graph, radius, xs, ys, view = {x: 0, y: 0, scale: 1}, hovered = -1;
+
+async function decode(encoded) {
+  const bytes = Uint8Array.from(atob(encoded), c => c.charCodeAt(0));
+  const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream("gzip"));
+  return JSON.parse(await new Response(stream).text());
+}
+
+// Pack children on a sunflower spiral inside their parent, from the leaves up.
+// Nodes come ordered from the roots down, so parents are before their children.
+function packNodes(nodes) {
+  const n = nodes.id.length;
+  radius = new Float64Array(n).fill(NODE_RADIUS);
+  const children = Array.from({length: n + 1}, () => []);
+  for (let i = 0; i < n; i++) children[nodes.parent[i] + 1].push(i);
+  const relative = new Float64Array(2 * n);
+  const pack = (group, members) => {
+    members.sort((a, b) => radius[b] - radius[a]);
+    let area = 0, extent = 0;
+    members.forEach((child, k) => {
+      area += (2 * radius[child] + PADDING) ** 2;
+      const distance = k ? Math.sqrt(area / Math.PI) : 0;
+      relative[2 * child] = distance * Math.cos(k * GOLDEN_ANGLE);
+      relative[2 * child + 1] = distance * Math.sin(k * GOLDEN_ANGLE);
+      extent = Math.max(extent, distance + radius[child]);
+    });
+    if (group >= 0) radius[group] = extent + PADDING;
+  };
+  for (let i = n - 1; i >= 0; i--) if (children[i + 1].length) pack(i, children[i + 1]);
+  pack(-1, children[0]);
+  xs = new Float64Array(n); ys = new Float64Array(n);
+  for (let i = 0; i < n; i++) {
+    const parent = nodes.parent[i];
+    xs[i] = relative[2 * i] + (parent >= 0 ? xs[parent] : 0);
+    ys[i] = relative[2 * i + 1] + (parent >= 0 ? ys[parent] : 0);
+  }
+}
+
+function usePositions(nodes) {
+  const n = nodes.id.length;
+  xs = Float64Array.from(nodes.x); ys = Float64Array.from(nodes.y);
+  radius = new Float64Array(n).fill(NODE_RADIUS);
+  for (let i = n - 1; i >= 0; i--) {
+    const parent = nodes.parent[i];
+    if (parent < 0) continue;
+    const distance = Math.hypot(xs[i] - xs[parent], ys[i] - ys[parent]);
+    radius[parent] = Math.max(radius[parent], distance + radius[i] + PADDING);
+  }
+}
+
+function fit() {
+  let minX = Infinity, minY = Infinity, maxX = -Infinity, maxY = -Infinity;
+  for (let i = 0; i < xs.length; i++) {
+    minX = Math.min(minX, xs[i] - radius[i]); maxX = Math.max(maxX, xs[i] + radius[i]);
+    minY = Math.min(minY, ys[i] - radius[i]); maxY = Math.max(maxY, ys[i] + radius[i]);
+  }
+  view.scale = Math.min(canvas.width / (maxX - minX), canvas.height / (maxY - minY)) || 1;
+  view.x = canvas.width / 2 - view.scale * (minX + maxX) / 2;
+  view.y = canvas.height / 2 - view.scale * (minY + maxY) / 2;
+}
+
+function draw() {
+  const {nodes, edges, colors} = graph;
+  context.setTransform(1, 0, 0, 1, 0, 0);
+  context.clearRect(0, 0, canvas.width, canvas.height);
+  context.setTransform(view.scale, 0, 0, view.scale, view.x, view.y);
+  const minRadius = 0.5 / view.scale;
+  for (let i = 0; i < xs.length; i++) {
+    if (radius[i] < minRadius) continue;
+    context.beginPath();
+    context.arc(xs[i], ys[i], radius[i], 0, 2 * Math.PI);
+    context.globalAlpha = nodes.parent[i] < 0 ? 0.3 : 0.5;
+    context.fillStyle = colors[nodes.color[i]];
+    context.fill();
+  }
+  context.globalAlpha = 0.4;
+  context.lineWidth = 1 / view.scale;
+  for (let e = 0; e < edges.source.length; e++) {
+    const source = edges.source[e], target = edges.target[e];
+    context.beginPath();
+    context.moveTo(xs[source], ys[source]);
+    context.lineTo(xs[target], ys[target]);
+    context.strokeStyle = colors[edges.color[e]];
+    context.stroke();
+  }
+  context.globalAlpha = 1;
+  context.fillStyle = "#000";
+  context.font = 12 / view.scale + "px sans-serif";
+  context.textAlign = "center";
+  for (let i = 0; i < xs.length; i++) {
+    if (radius[i] * view.scale > 30 || i === hovered) {
+      context.fillText(nodes.label[i], xs[i], ys[i] + radius[i] + 12 / view.scale);
+    }
+  }
+}
+
+function nodeAt(x, y) {
+  // Deepest node under the cursor, children come after their parents
+  for (let i = xs.length - 1; i >= 0; i--) {
+    if (Math.hypot(xs[i] - x, ys[i] - y) <= radius[i]) return i;
+  }
+  return -1;
+}
+
+function resize() {
+  canvas.width = canvas.clientWidth; canvas.height = canvas.clientHeight;
+}
+
+function listen() {
+  let drag = null;
+  canvas.addEventListener("mousedown", e => { drag = {x: e.clientX, y: e.clientY}; });
+  window.addEventListener("mouseup", () => { drag = null; });
+  canvas.addEventListener("mousemove", e => {
+    if (drag) {
+      view.x += e.clientX - drag.x; view.y += e.clientY - drag.y;
+      drag = {x: e.clientX, y: e.clientY};
+    } else {
+      hovered = nodeAt((e.offsetX - view.x) / view.scale, (e.offsetY - view.y) / view.scale);
+      if (hovered >= 0) {
+        info.textContent = graph.nodes.id[hovered] + " (" + graph.nodeTypes[graph.nodes.type[hovered]] + ")";
+      }
+    }
+    requestAnimationFrame(draw);
+  });
+  canvas.addEventListener("wheel", e => {
+    e.preventDefault();
+    const factor = Math.exp(-e.deltaY / 500);
+    view.x = e.offsetX - (e.offsetX - view.x) * factor;
+    view.y = e.offsetY - (e.offsetY - view.y) * factor;
+    view.scale *= factor;
+    requestAnimationFrame(draw);
+  }, {passive: false});
+  window.addEventListener("resize", () => { resize(); requestAnimationFrame(draw); });
+}
+
+decode(document.getElementById("graph-data").textContent.trim()).then(data => {
+  graph = data;
+  if (graph.nodes.x) usePositions(graph.nodes); else packNodes(graph.nodes);
+  resize(); fit(); listen(); draw();
+  info.textContent = graph.nodes.id.length + " nodes, " + graph.edges.source.length + " edges";
+});
+"""
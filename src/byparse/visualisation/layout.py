@@ -0,0 +1,207 @@
+"""Compound-aware force-directed layout computed with NumPy.
+
+Each compound node (folder, file, class...) gets its children laid out
+relatively to its own center, from the leaves up, so that children never
+leave their parent. Siblings repel each other and are pulled together by the
+edges between their subtrees. The absolute positions are then accumulated
+from the roots down.
+
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+from byparse.graphs.hierarchy import HIERARCHY_EDGES, HierarchyIndex
+
+GOLDEN_ANGLE = np.pi * (3 - np.sqrt(5))
+VIRTUAL_ROOT = -1  # Parent of the top level nodes
+
+
+def compute_compound_layout(
+    graph: nx.MultiDiGraph,
+    node_size: float = 40.0,
+    padding: float = 20.0,
+    iterations: int = 50,
+    max_force_nodes: int = 2000,
+    seed: int = 0,
+    hierarchy: Optional[HierarchyIndex] = None,
+) -> Dict[str, Tuple[float, float]]:
+    """Compute the position of every node and store it in its 'position' attribute.
+
+    Args:
+        graph (nx.MultiDiGraph): Graph to lay out, with CONTEXT and PATH edges
+            going from children to parents.
+        node_size (float): Size of leaf nodes.
+        padding (float): Space kept between siblings and around children.
+        iterations (int): Number of force-directed iterations per compound node.
+        max_force_nodes (int): Compound nodes with more children are only packed
+            on a spiral, as the forces use a dense (children x children) matrix.
+        seed (int): Seed of the initial jitter.
+        hierarchy (Optional[HierarchyIndex]): Hierarchy of the graph, built if not given.
+
+    Returns:
+        Dict[str, Tuple[float, float]]: Absolute position of each node.
+
+    """
+    rng = np.random.default_rng(seed)
+    if hierarchy is None:
+        hierarchy = HierarchyIndex(graph)
+    n_nodes = len(hierarchy.nodes)
+
+    siblings_edges = _siblings_edges(graph, hierarchy)
+
+    radius = np.full(n_nodes, node_size / 2)
+    relative_positions = np.zeros((n_nodes, 2))
+    roots = [i for i in hierarchy.order if hierarchy.parents[i] < 0]
+    groups = [i for i in reversed(hierarchy.order) if not hierarchy.is_leaf(i)]
+    for group in groups + [VIRTUAL_ROOT]:
+        if group == VIRTUAL_ROOT:
+            group_children = np.array(roots, dtype=int)
+        else:
+            group_children = np.array(hierarchy.children_positions(group), dtype=int)
+        if not len(group_children):
+            continue
+        child_index = {child: i for i, child in enumerate(group_children)}
+        edges = np.array(
+            [
+                (child_index[source], child_index[target])
+                for source, target in siblings_edges.get(group, [])
+            ],
+            dtype=int,
+        ).reshape(-1, 2)
+
+        radii = radius[group_children]
+        positions = _layout_siblings(
+            radii, edges, padding, iterations, max_force_nodes, rng
+        )
+        relative_positions[group_children] = positions
+        if group != VIRTUAL_ROOT:
+            extent = np.linalg.norm(positions, axis=1) + radii
+            radius[group] = float(extent.max()) + padding
+
+    absolute_positions = relative_positions.copy()
+    for i in hierarchy.order:
+        parent = hierarchy.parents[i]
+        if parent >= 0:
+            absolute_positions[i] += absolute_positions[parent]
+
+    positions_by_node: Dict[str, Tuple[float, float]] = {}
+    for node, (x, y) in zip(hierarchy.nodes, absolute_positions.tolist()):
+        positions_by_node[node] = (x, y)
+        graph.nodes[node]["position"] = {"x": round(x, 2), "y": round(y, 2)}
+    return positions_by_node
+
+
+def _ancestors(node: int, hierarchy: HierarchyIndex) -> List[int]:
+    chain = [node]
+    while hierarchy.parents[chain[-1]] >= 0:
+        chain.append(hierarchy.parents[chain[-1]])
+    return chain
+
+
+def _siblings_edges(
+    graph: nx.MultiDiGraph, hierarchy: HierarchyIndex
+) -> Dict[int, List[Tuple[int, int]]]:
+    """Edges between the children of the lowest common ancestor of their ends."""
+    siblings_edges: Dict[int, List[Tuple[int, int]]] = {}
+    for source, target, edge_type in graph.edges(data="type"):
+        if edge_type in HIERARCHY_EDGES:
+            continue
+        source_chain = _ancestors(hierarchy.index[source], hierarchy)
+        target_chain = _ancestors(hierarchy.index[target], hierarchy)
+        target_depth = {node: i for i, node in enumerate(target_chain)}
+
+        common_ancestor = VIRTUAL_ROOT
+        source_child, target_child = source_chain[-1], target_chain[-1]
+        for i, node in enumerate(source_chain):
+            if node in target_depth:
+                if i == 0 or target_depth[node] == 0:
+                    break  # One end contains the other
+                common_ancestor = node
+                source_child = source_chain[i - 1]
+                target_child = target_chain[target_depth[node] - 1]
+                break
+        if source_child != target_child:
+            siblings_edges.setdefault(common_ancestor, []).append(
+                (source_child, target_child)
+            )
+    return siblings_edges
+
+
+def _layout_siblings(
+    radii: np.ndarray,
+    edges: np.ndarray,
+    padding: float,
+    iterations: int,
+    max_force_nodes: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Positions of siblings around their parent center, without overlaps."""
+    n_nodes = len(radii)
+    if n_nodes == 1:
+        return np.zeros((1, 2))
+
+    # Pack on a sunflower spiral, biggest nodes at the center
+    order = np.argsort(-radii)
+    distance = np.sqrt(np.cumsum((2 * radii[order] + padding) ** 2) / np.pi)
+    angle = np.arange(n_nodes) * GOLDEN_ANGLE
+    positions = np.empty((n_nodes, 2))
+    positions[order, 0] = distance * np.cos(angle)
+    positions[order, 1] = distance * np.sin(angle)
+    positions += rng.normal(scale=1e-3 * padding, size=positions.shape)
+
+    if n_nodes > max_force_nodes or iterations <= 0:
+        return _centered(positions)
+
+    min_distances = radii[:, None] + radii[None, :] + padding
+    if not len(edges) and not _overlaps(positions, min_distances):
+        return _centered(positions)
+
+    # Fruchterman-Reingold with overlap removal, vectorized over all pairs
+    ideal_length = 2 * radii.mean() + padding
+    temperature = distance[-1] / 4
+    diagonal = np.eye(n_nodes, dtype=bool)
+    # Few siblings settle in a few steps, the iterations cost is mostly overhead
+    for _ in range(min(iterations, 4 * n_nodes)):
+        delta = positions[:, None, :] - positions[None, :, :]
+        squared_distances = np.einsum("ijk,ijk->ij", delta, delta)
+        squared_distances[diagonal] = 1.0
+        squared_distances = np.maximum(squared_distances, 1e-12)
+        distances = np.sqrt(squared_distances)
+
+        repulsion = ideal_length**2 / squared_distances
+        overlap = np.maximum(min_distances - distances, 0) / distances
+        weights = repulsion + overlap
+        weights[diagonal] = 0.0
+        displacement = np.einsum("ij,ijk->ik", weights, delta)
+
+        if len(edges):
+            edge_delta = positions[edges[:, 0]] - positions[edges[:, 1]]
+            edge_length = np.sqrt(np.einsum("ij,ij->i", edge_delta, edge_delta))
+            attraction = edge_delta * (edge_length / ideal_length)[:, None]
+            np.add.at(displacement, edges[:, 0], -attraction)
+            np.add.at(displacement, edges[:, 1], attraction)
+
+        displacement -= 0.05 * positions  # Gravity toward the parent center
+        lengths = np.sqrt(np.einsum("ij,ij->i", displacement, displacement))
+        steps = np.minimum(lengths, temperature)
+        positions += displacement * (steps / np.maximum(lengths, 1e-9))[:, None]
+        temperature *= 0.95
+        if steps.max() < 0.1:
+            break  # Forces are balanced
+
+    return _centered(positions)
+
+
+def _centered(positions: np.ndarray) -> np.ndarray:
+    centered: np.ndarray = positions - positions.mean(axis=0)
+    return centered
+
+
+def _overlaps(positions: np.ndarray, min_distances: np.ndarray) -> bool:
+    delta = positions[:, None, :] - positions[None, :, :]
+    distances = np.sqrt(np.einsum("ijk,ijk->ij", delta, delta))
+    np.fill_diagonal(distances, np.inf)
+    return bool((distances < min_distances).any())
@@ -6,11 +6,13 @@ def networkx_to_pyvis(graph: nx.Graph, width="1920px", height="1080px") -> Netwo
     pyvis_graph = Network(height, width, directed=True)
 
     for node, node_attrs in graph.nodes(data=True):
+        node_attrs = dict(node_attrs)  # Do not alter the given graph
         label = node_attrs.pop("label", str(node))
         node_attrs.pop("ast", None)
         pyvis_graph.add_node(str(node), label=label, **node_attrs)
 
     for source, target, edge_attrs in graph.edges(data=True):
+        edge_attrs = dict(edge_attrs)
         if (
             "value" not in edge_attrs
             and "width" not in edge_attrs
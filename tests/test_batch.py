@@ -0,0 +1,61 @@
+import json
+from pathlib import Path
+
+import pytest
+import pytest_check as check
+
+from byparse.batch import output_names, read_roots, run_batch
+from byparse.path_resolvers.imports import resolve_installed_path
+from byparse.project_crawl import ProjectCrawler
+
+
+def count_nodes(root: Path, output: Path):
+    graph = ProjectCrawler(str(root)).build_project_graph()
+    output.write_text(json.dumps(graph.number_of_nodes()))
+
+
+class TestBatch:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path: Path):
+        for project in ("first", "second"):
+            (tmp_path / project / "pkg").mkdir(parents=True)
+            (tmp_path / project / "pkg" / "core.py").write_text(
+                "import json\n\n\ndef run():\n    return 0\n"
+            )
+        (tmp_path / "other").mkdir()
+        (tmp_path / "other" / "first").mkdir()
+        (tmp_path / "broken").mkdir()
+        (tmp_path / "broken" / "bad.py").write_text("def broken(:\n")
+        self.list_path = tmp_path / "repos.txt"
+        self.list_path.write_text("# nightly\nfirst\n\nsecond\nother/first\nbroken\n")
+        self.root = tmp_path
+
+    def test_read_roots(self):
+        roots = read_roots(self.list_path)
+        expected = ["first", "second", "other/first", "broken"]
+        check.equal(roots, [self.root / root for root in expected])
+
+    def test_output_names(self):
+        names = output_names(read_roots(self.list_path))
+        check.equal(list(names.values()), ["first", "second", "first_2", "broken"])
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_run_batch(self, jobs: int):
+        roots = read_roots(self.list_path)
+        tasks_args = {root: (self.root / f"{i}.json",) for i, root in enumerate(roots)}
+        results = {
+            root: error for root, _, error in run_batch(count_nodes, tasks_args, jobs)
+        }
+        check.equal(set(results), set(roots))
+        check.is_in("SyntaxError", results[self.root / "broken"])
+        for i, root in enumerate(roots[:3]):
+            check.is_none(results[root])
+            check.is_true((self.root / f"{i}.json").exists())
+
+    def test_installed_path_cached(self):
+        resolve_installed_path.cache_clear()
+        ProjectCrawler(str(self.root / "first")).build_project_graph()
+        ProjectCrawler(str(self.root / "second")).build_project_graph()
+        cache_info = resolve_installed_path.cache_info()
+        check.equal(cache_info.misses, 1)
+        check.equal(cache_info.hits, 1)
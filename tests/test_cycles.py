@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import pytest
+import pytest_check as check
+
+from byparse.project_crawl import ProjectCrawler
+from byparse.analysis.adjacency import AdjacencyIndex
+from byparse.analysis.cycles import (
+    find_call_cycles,
+    find_import_cycles,
+    import_dependencies,
+    module_dependencies,
+)
+from byparse.stores.loading import NetworkxGraph
+
+MODULES = {
+    "a.py": "from pkg.b import fb\n\n\ndef fa():\n    return fb()\n",
+    "b.py": "from pkg.c import fc\n\n\ndef fb():\n    return fc()\n",
+    "c.py": (
+        "def fc():\n"
+        "    from pkg.a import fa\n\n"
+        "    return fa()\n\n\n"
+        "def recursive():\n"
+        "    return recursive()\n"
+    ),
+    "d.py": "from pkg.a import fa\n\n\ndef fd():\n    return fa()\n",
+    "e.py": "from pkg.f import ff\n\n\ndef fe():\n    return ff()\n",
+    "f.py": "from pkg.e import fe\n\n\ndef ff():\n    return 1\n",
+}
+
+
+class TestCycles:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path: Path):
+        (tmp_path / "pkg").mkdir()
+        for name, source in MODULES.items():
+            (tmp_path / "pkg" / name).write_text(source)
+        self.project = ProjectCrawler(tmp_path)
+        graph = self.project.build_project_graph()
+        self.adjacency = AdjacencyIndex.from_graph(NetworkxGraph(graph))
+
+    def test_module_dependencies(self):
+        modules = module_dependencies(self.adjacency)
+        check.equal(
+            sorted(modules.nodes),
+            ["pkg/a.py", "pkg/b.py", "pkg/c.py", "pkg/d.py", "pkg/e.py", "pkg/f.py"],
+        )
+        users = {
+            module: sorted(
+                modules.nodes[user]
+                for user in modules.neighbors(modules.position(module), "IMPORT")
+            )
+            for module in modules.nodes
+        }
+        check.equal(users["pkg/a.py"], ["pkg/c.py", "pkg/d.py"])
+        check.equal(users["pkg/d.py"], [])
+
+    def test_import_dependencies(self):
+        modules = import_dependencies(self.project)
+        importers = {
+            module: sorted(
+                modules.nodes[user]
+                for user in modules.neighbors(modules.position(module), "IMPORT")
+            )
+            for module in modules.nodes
+        }
+        check.equal(importers["pkg/a.py"], ["pkg/d.py"])
+        check.equal(importers["pkg/e.py"], ["pkg/f.py"])
+
+    def test_import_cycles(self):
+        cycles = find_import_cycles(import_dependencies(self.project))
+        check.equal(cycles, [(["pkg/e.py", "pkg/f.py", "pkg/e.py"], 2)])
+
+    def test_uses_cycles(self):
+        cycles = find_import_cycles(module_dependencies(self.adjacency))
+        check.equal(cycles, [(["pkg/a.py", "pkg/b.py", "pkg/c.py", "pkg/a.py"], 3)])
+
+    def test_call_cycles(self):
+        cycles = find_call_cycles(self.adjacency)
+        check.equal(
+            cycles,
+            [(["pkg/a.py>fa", "pkg/b.py>fb", "pkg/c.py>fc", "pkg/a.py>fa"], 3)],
+        )
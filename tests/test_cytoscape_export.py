@@ -0,0 +1,73 @@
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+import pytest_check as check
+
+from byparse.project_crawl import ProjectCrawler
+from byparse.visualisation.graph_vis import (
+    color_context_graph,
+    compute_parents,
+)
+from byparse.visualisation.cytoscape_fcose import networkx_to_cytoscape_fcose
+from byparse.exporters.cytoscape_json import (
+    write_cytoscape_json,
+    write_cytoscape_ndjson,
+)
+from byparse.stores.loading import open_graph
+
+
+class TestCytoscapeExport:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        toy_project_path = Path(__file__).parent / "toy_project"
+        self.graph = ProjectCrawler(toy_project_path).build_project_graph()
+        color_context_graph(self.graph)
+        compute_parents(self.graph)
+        self.expected = networkx_to_cytoscape_fcose(self.graph)
+
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_json(self, tmp_path: Path, indent):
+        path = tmp_path / "graph.json"
+        write_cytoscape_json(self.graph, path, indent=indent)
+        with open(path, encoding="utf8") as fp:
+            check.equal(json.load(fp), self.expected)
+
+    def test_compact_json(self, tmp_path: Path):
+        path = tmp_path / "graph.json"
+        write_cytoscape_json(self.graph, path)
+        check.is_not_in("\n", path.read_text(encoding="utf8"))
+        check.is_not_in(", ", path.read_text(encoding="utf8"))
+
+    def test_gzip_json(self, tmp_path: Path):
+        path = tmp_path / "graph.json.gz"
+        write_cytoscape_json(self.graph, path)
+        with gzip.open(path, "rt", encoding="utf8") as fp:
+            check.equal(json.load(fp), self.expected)
+
+    def test_ndjson(self, tmp_path: Path):
+        path = tmp_path / "graph.ndjson"
+        write_cytoscape_ndjson(self.graph, path)
+        elements = {"nodes": [], "edges": []}
+        with open(path, encoding="utf8") as fp:
+            for line in fp:
+                element = json.loads(line)
+                elements[element.pop("group")].append(element)
+        check.equal(elements, self.expected)
+
+    @pytest.mark.parametrize("name", ["graph.json", "graph.ndjson.gz"])
+    def test_load(self, tmp_path: Path, name: str):
+        path = tmp_path / name
+        if name.startswith("graph.json"):
+            write_cytoscape_json(self.graph, path)
+        else:
+            write_cytoscape_ndjson(self.graph, path)
+        with open_graph(path) as graph:
+            nodes = sorted(node for node, _ in graph.iter_nodes())
+            edges = sorted(
+                (source, target, edge_attrs["type"])
+                for source, target, edge_attrs in graph.iter_edges()
+            )
+        check.equal(nodes, sorted(self.graph.nodes))
+        check.equal(edges, sorted(self.graph.edges(data="type")))
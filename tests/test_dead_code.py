@@ -0,0 +1,109 @@
+from pathlib import Path
+
+import pytest
+import pytest_check as check
+
+from byparse.project_crawl import ProjectCrawler
+from byparse.analysis.dead_code import find_dead_code
+from byparse.exporters.cytoscape_json import (
+    write_cytoscape_json,
+    write_cytoscape_ndjson,
+)
+from byparse.stores.loading import NetworkxGraph, open_graph
+from byparse.stores.snapshot import GraphSnapshot, write_snapshot
+from byparse.visualisation.graph_vis import compute_parents
+
+MODULES = {
+    "__init__.py": "",
+    "api.py": (
+        "from pkg.core import Engine\n\n\n"
+        "def serve():\n"
+        "    engine = Engine()\n"
+        "    return engine.run()\n\n\n"
+        "def unused():\n"
+        "    def nested():\n"
+        "        return 1\n\n"
+        "    return nested()\n"
+    ),
+    "core.py": (
+        "class Engine:\n"
+        "    def run(self):\n"
+        "        return helper()\n\n"
+        "    def stop(self):\n"
+        "        return None\n\n\n"
+        "class Orphan:\n"
+        "    def method(self):\n"
+        "        return None\n\n\n"
+        "def helper():\n"
+        "    return 0\n"
+    ),
+    "tested.py": "def checked():\n    return 1\n",
+}
+
+TEST_MODULE = (
+    "from pkg.tested import checked\n\n\n"
+    "def test_checked():\n"
+    "    result = checked()\n"
+)
+
+
+class TestDeadCode:
+    @pytest.fixture(autouse=True, params=["networkx", "snapshot", "json", "ndjson"])
+    def setup(self, request, tmp_path: Path):
+        (tmp_path / "pkg").mkdir()
+        for name, source in MODULES.items():
+            (tmp_path / "pkg" / name).write_text(source)
+        (tmp_path / "tests").mkdir()
+        (tmp_path / "tests" / "test_tested.py").write_text(TEST_MODULE)
+        graph = ProjectCrawler(tmp_path).build_project_graph()
+        if request.param == "snapshot":
+            write_snapshot(graph, tmp_path / "graph.bpg")
+            self.graph = GraphSnapshot(tmp_path / "graph.bpg")
+            yield
+            self.graph.close()
+        elif request.param in ("json", "ndjson"):
+            compute_parents(graph)
+            path = tmp_path / f"graph.{request.param}"
+            if request.param == "json":
+                write_cytoscape_json(graph, path)
+            else:
+                write_cytoscape_ndjson(graph, path)
+            self.graph = open_graph(path)
+            yield
+            self.graph.close()
+        else:
+            self.graph = NetworkxGraph(graph)
+            yield
+
+    def dead_nodes(self, entries):
+        return {
+            node: lines
+            for _, _, definitions in find_dead_code(self.graph, entries)
+            for node, _, lines in definitions
+        }
+
+    def test_without_entries(self):
+        dead = self.dead_nodes([])
+        check.equal(
+            set(dead),
+            {"pkg/api.py>serve", "pkg/api.py>unused", "pkg/core.py>Engine"}
+            | {"pkg/core.py>Orphan", "pkg/core.py>helper"},
+        )
+        check.equal(dead["pkg/api.py>unused"], 5)
+        check.equal(dead["pkg/api.py>serve"], 3)
+        check.equal(dead["pkg/core.py>Orphan"], 3)
+
+    def test_with_entry(self):
+        dead = self.dead_nodes(["pkg/api.py>serve"])
+        check.equal(set(dead), {"pkg/api.py>unused", "pkg/core.py>Orphan"})
+
+    def test_file_entry(self):
+        dead = self.dead_nodes(["pkg/api.py"])
+        check.equal(set(dead), {"pkg/core.py>Orphan"})
+
+    def test_grouped_by_file(self):
+        found = find_dead_code(self.graph, ["pkg/api.py>serve"])
+        check.equal(
+            [(file, lines) for file, lines, _ in found],
+            [("pkg/api.py", 5), ("pkg/core.py", 3)],
+        )
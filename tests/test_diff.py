@@ -0,0 +1,80 @@
+import json
+from pathlib import Path
+
+import pytest
+import pytest_check as check
+
+from byparse.abc import EdgeType, NodeType
+from byparse.project_crawl import ProjectCrawler
+from byparse.analysis.diff import diff_graphs, write_diff_cytoscape
+from byparse.exporters.cytoscape_json import (
+    write_cytoscape_json,
+    write_cytoscape_ndjson,
+)
+from byparse.stores.loading import NetworkxGraph, open_graph
+from byparse.stores.snapshot import write_snapshot
+
+
+class TestDiff:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path: Path):
+        toy_project_path = Path(__file__).parent / "toy_project"
+        self.graph = ProjectCrawler(toy_project_path).build_project_graph()
+        self.tmp_path = tmp_path
+
+        self.new_graph = self.graph.copy()
+        self.removed_node = "package/module2.py>m22"
+        self.new_graph.remove_node(self.removed_node)
+        self.added_node = "package/module2.py>m3"
+        self.new_graph.add_node(
+            self.added_node, label="m3", type=NodeType.FUNCTION.name
+        )
+        self.new_graph.add_edge(
+            self.added_node, "package/module2.py", type=EdgeType.CONTEXT.name
+        )
+        self.added_edge = ("package/module2.py>m2", self.added_node, "CALL")
+        self.new_graph.add_edge(*self.added_edge[:2], type=self.added_edge[2])
+
+    def test_same_graph_in_every_format(self):
+        write_snapshot(self.graph, self.tmp_path / "graph.bpg")
+        write_cytoscape_json(self.graph, self.tmp_path / "graph.json.gz")
+        write_cytoscape_ndjson(self.graph, self.tmp_path / "graph.ndjson")
+        for name in ("graph.bpg", "graph.json.gz", "graph.ndjson"):
+            with open_graph(self.tmp_path / name) as graph:
+                graph_diff = diff_graphs(NetworkxGraph(self.graph), graph)
+                check.is_true(graph_diff.is_empty(), name)
+
+    def test_changes(self):
+        graph_diff = diff_graphs(
+            NetworkxGraph(self.graph), NetworkxGraph(self.new_graph)
+        )
+        check.equal(graph_diff.added_nodes, {self.added_node: NodeType.FUNCTION.name})
+        check.equal(
+            graph_diff.removed_nodes, {self.removed_node: NodeType.FUNCTION.name}
+        )
+        check.equal(graph_diff.added_edges, {self.added_edge})
+        removed_edges = {
+            (source, target, edge_type)
+            for source, target, edge_type in self.graph.edges(data="type")
+            if self.removed_node in (source, target)
+            and edge_type != EdgeType.CONTEXT.name
+        }
+        check.equal(graph_diff.removed_edges, removed_edges)
+
+    def test_highlight(self):
+        new_graph = NetworkxGraph(self.new_graph)
+        graph_diff = diff_graphs(NetworkxGraph(self.graph), new_graph)
+        highlight_path = self.tmp_path / "highlight.json"
+        write_diff_cytoscape(new_graph, graph_diff, highlight_path)
+        with open(highlight_path, "r", encoding="utf-8") as file:
+            elements = json.load(file)
+
+        nodes = {node["data"]["id"]: node["data"] for node in elements["nodes"]}
+        check.equal(set(nodes), set(self.graph.nodes) | {self.added_node})
+        check.equal(nodes[self.added_node]["diff"], "added")
+        check.equal(nodes[self.added_node]["parent"], "package/module2.py")
+        check.equal(nodes[self.removed_node]["diff"], "removed")
+        check.equal(nodes[self.removed_node]["parent"], "package/module2.py")
+        edges_diff = [edge["data"].get("diff") for edge in elements["edges"]]
+        check.equal(edges_diff.count("added"), 1)
+        check.equal(edges_diff.count("removed"), len(graph_diff.removed_edges))
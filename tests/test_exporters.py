@@ -0,0 +1,71 @@
+import csv
+import gzip
+from pathlib import Path
+
+import networkx as nx
+import pytest
+import pytest_check as check
+
+from byparse.project_crawl import ProjectCrawler
+from byparse.visualisation.graph_vis import color_context_graph
+from byparse.exporters.csv_tables import write_csv_tables
+from byparse.exporters.dot import write_dot
+from byparse.exporters.graphml import write_graphml
+
+
+class TestExporters:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path: Path):
+        toy_project_path = Path(__file__).parent / "toy_project"
+        self.graph = ProjectCrawler(toy_project_path).build_project_graph()
+        color_context_graph(self.graph)
+        for i, node in enumerate(self.graph.nodes):
+            self.graph.nodes[node]["position"] = {"x": float(i), "y": -1.5}
+        self.tmp_path = tmp_path
+
+    def edges(self, graph: nx.MultiDiGraph):
+        return sorted(graph.edges(data="type"))
+
+    def test_graphml(self):
+        path = self.tmp_path / "graph.graphml.gz"
+        write_graphml(self.graph, path)
+        with gzip.open(path, "rb") as file:
+            loaded = nx.read_graphml(file, force_multigraph=True)
+
+        check.equal(set(loaded.nodes), set(self.graph.nodes))
+        check.equal(self.edges(loaded), self.edges(self.graph))
+        for node, node_attrs in self.graph.nodes(data=True):
+            loaded_attrs = loaded.nodes[node]
+            check.equal(loaded_attrs["type"], node_attrs["type"])
+            check.equal(loaded_attrs["label"], node_attrs["label"])
+            check.equal(loaded_attrs["x"], node_attrs["position"]["x"])
+
+    def test_dot(self):
+        path = self.tmp_path / "graph.dot"
+        write_dot(self.graph, path)
+        lines = path.read_text(encoding="utf-8").splitlines()
+        check.equal(lines[0], 'digraph "byparse" {')
+        check.equal(lines[-1], "}")
+        edges_lines = [line for line in lines if " -> " in line]
+        check.equal(len(edges_lines), self.graph.number_of_edges())
+        check.equal(len(lines) - 2, len(self.graph) + len(edges_lines))
+        check.is_in('pos="0.0,1.5!"', lines[1])
+
+    def test_csv(self):
+        write_csv_tables(self.graph, self.tmp_path)
+        with open(self.tmp_path / "nodes.csv", "r", encoding="utf-8") as file:
+            nodes = list(csv.DictReader(file))
+        with open(self.tmp_path / "edges.csv", "r", encoding="utf-8") as file:
+            edges = list(csv.DictReader(file))
+
+        check.equal(
+            {node[":ID"]: node[":LABEL"] for node in nodes},
+            dict(self.graph.nodes(data="type")),
+        )
+        check.is_in("x:double", nodes[0])
+        check.equal(
+            sorted(
+                (edge[":START_ID"], edge[":END_ID"], edge[":TYPE"]) for edge in edges
+            ),
+            self.edges(self.graph),
+        )
@@ -0,0 +1,103 @@
+from pathlib import Path
+
+import networkx as nx
+import pytest
+import pytest_check as check
+
+from byparse.project_crawl import ProjectCrawler
+from byparse.analysis.focus import focus_graph
+from byparse.analysis.query import DEPENDENCY_EDGES
+from byparse.exporters.cytoscape_json import write_cytoscape_json
+from byparse.graphs.hierarchy import HIERARCHY_EDGES
+from byparse.stores.loading import NetworkxGraph, open_graph
+from byparse.stores.snapshot import write_snapshot
+from byparse.stores.sqlite_store import SqliteGraphStore
+from byparse.visualisation.graph_vis import compute_parents
+
+FOCUSED = "package/module1.py>m1"
+
+
+class TestFocusGraph:
+    @pytest.fixture(autouse=True, params=["networkx", "snapshot", "sqlite", "json"])
+    def setup(self, request, tmp_path: Path):
+        toy_project_path = Path(__file__).parent / "toy_project"
+        project = ProjectCrawler(toy_project_path)
+        self.graph = project.build_project_graph()
+        if request.param == "snapshot":
+            write_snapshot(self.graph, tmp_path / "graph.bpg")
+            self.saved = open_graph(tmp_path / "graph.bpg")
+        elif request.param == "sqlite":
+            with SqliteGraphStore(tmp_path / "graph.db") as store:
+                project.build_project_graph(store)
+            self.saved = open_graph(tmp_path / "graph.db")
+        elif request.param == "json":
+            compute_parents(self.graph)
+            write_cytoscape_json(self.graph, tmp_path / "graph.json")
+            self.saved = open_graph(tmp_path / "graph.json")
+        else:
+            self.saved = NetworkxGraph(self.graph)
+        yield
+        self.saved.close()
+
+    def expected_hops(self, hops):
+        uses = nx.Graph()
+        uses.add_edges_from(
+            (source, target)
+            for source, target, edge_type in self.graph.edges(data="type")
+            if edge_type in DEPENDENCY_EDGES
+        )
+        return nx.single_source_shortest_path_length(uses, FOCUSED, cutoff=hops)
+
+    def test_neighborhood(self):
+        for hops in (1, 2):
+            focus = focus_graph(self.saved, FOCUSED, hops)
+            reached = {
+                node: distance
+                for node, distance in focus.nodes(data="hops")
+                if distance is not None
+            }
+            check.equal(reached, self.expected_hops(hops))
+            for node, node_attrs in focus.nodes(data=True):
+                check.equal(node_attrs["type"], self.graph.nodes[node]["type"])
+
+    def test_edges(self):
+        focus = focus_graph(self.saved, FOCUSED, 1)
+        reached = self.expected_hops(1)
+        expected = sorted(
+            (source, target, edge_type)
+            for source, target, edge_type in self.graph.edges(data="type")
+            if (source in reached and target in reached)
+            or (edge_type in HIERARCHY_EDGES and source in focus)
+        )
+        check.equal(sorted(focus.edges(data="type")), expected)
+
+    def test_ancestors(self):
+        focus = focus_graph(self.saved, FOCUSED, 1)
+        for node in focus:
+            parents = [
+                target
+                for _, target, edge_type in self.graph.out_edges(node, data="type")
+                if edge_type in HIERARCHY_EDGES
+            ]
+            for parent in parents:
+                check.is_true(focus.has_edge(node, parent))
+
+    def test_parents_in_focus(self):
+        focus = focus_graph(self.saved, FOCUSED, 1)
+        for _, parent in focus.nodes(data="parent"):
+            if parent is not None:
+                check.is_in(parent, focus)
+
+    def test_unknown_node(self):
+        with pytest.raises(ValueError):
+            focus_graph(self.saved, "package/unknown.py>func")
+
+
+def test_parents_outside_focus():
+    graph = nx.MultiDiGraph()
+    graph.add_node("a.py", type="FILE")
+    graph.add_node("a.py>f", type="FUNCTION", parent="a.py")
+    graph.add_node("a.py>g", type="FUNCTION", parent="a.py")
+    graph.add_edge("a.py>f", "a.py>g", type="CALL")
+    focus = focus_graph(NetworkxGraph(graph), "a.py>f")
+    check.equal(dict(focus.nodes(data="parent")), {"a.py>f": None, "a.py>g": None})
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import pytest
+import pytest_check as check
+
+from byparse.abc import EdgeType
+from byparse.project_crawl import ProjectCrawler
+from byparse.graphs.hierarchy import HierarchyIndex
+
+
+class TestHierarchyIndex:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        toy_project_path = Path(__file__).parent / "toy_project"
+        self.graph = ProjectCrawler(toy_project_path).build_project_graph()
+        self.hierarchy = HierarchyIndex(self.graph)
+        self.parents = {
+            source: target
+            for source, target, edge_type in self.graph.edges(data="type")
+            if edge_type in (EdgeType.CONTEXT.name, EdgeType.PATH.name)
+        }
+
+    def test_parents_and_children(self):
+        for node in self.graph.nodes:
+            check.equal(self.hierarchy.parent(node), self.parents.get(node))
+            check.equal(
+                sorted(self.hierarchy.children_of(node)),
+                sorted(
+                    child for child, parent in self.parents.items() if parent == node
+                ),
+            )
+
+    def test_depths_and_sizes(self):
+        for node, i in self.hierarchy.index.items():
+            ancestors = list(self.hierarchy.ancestors(node))
+            check.equal(self.hierarchy.depths[i], len(ancestors))
+            descendants = [
+                other
+                for other in self.graph.nodes
+                if node in self.hierarchy.ancestors(other)
+            ]
+            check.equal(self.hierarchy.subtree_sizes[i], len(descendants) + 1)
+
+    def test_order(self):
+        check.equal(sorted(self.hierarchy.order), list(range(len(self.graph))))
+        seen = set()
+        for i in self.hierarchy.order:
+            parent = self.hierarchy.parents[i]
+            check.is_true(parent < 0 or parent in seen)
+            seen.add(i)
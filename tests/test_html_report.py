@@ -0,0 +1,89 @@
+import base64
+import gzip
+import json
+import re
+import sys
+from pathlib import Path
+
+import pytest
+import pytest_check as check
+
+from byparse.__main__ import cli_parser
+from byparse.abc import EdgeType
+from byparse.project_crawl import ProjectCrawler
+from byparse.visualisation.html_report import write_html_report
+
+HIERARCHY_EDGES = (EdgeType.CONTEXT.name, EdgeType.PATH.name)
+
+
+class TestHtmlReport:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path: Path):
+        toy_project_path = Path(__file__).parent / "toy_project"
+        self.graph = ProjectCrawler(toy_project_path).build_project_graph()
+        self.report_path = tmp_path / "report.html"
+
+    def load_data(self) -> dict:
+        html = self.report_path.read_text(encoding="utf-8")
+        encoded = re.search(
+            r'<script id="graph-data" type="application/octet-stream">(.*?)</script>',
+            html,
+            re.DOTALL,
+        ).group(1)
+        return json.loads(gzip.decompress(base64.b64decode(encoded)))
+
+    def test_embedded_graph(self):
+        write_html_report(self.graph, self.report_path)
+        data = self.load_data()
+        nodes, edges = data["nodes"], data["edges"]
+
+        check.equal(set(nodes["id"]), set(self.graph.nodes))
+        for i, parent in enumerate(nodes["parent"]):
+            check.less(parent, i)
+        check.is_false("x" in nodes)
+
+        ids = nodes["id"]
+        reported_edges = sorted(
+            (ids[source], ids[target], data["edgeTypes"][edge_type])
+            for source, target, edge_type in zip(
+                edges["source"], edges["target"], edges["type"]
+            )
+        )
+        expected_edges = sorted(
+            (source, target, edge_type)
+            for source, target, edge_type in self.graph.edges(data="type")
+            if edge_type not in HIERARCHY_EDGES
+        )
+        check.equal(reported_edges, expected_edges)
+
+    def test_graph_not_modified(self):
+        nodes_before = {node: dict(attrs) for node, attrs in self.graph.nodes.items()}
+        write_html_report(self.graph, self.report_path)
+        check.equal(dict(self.graph.nodes.items()), nodes_before)
+
+    def test_positions(self):
+        for i, node in enumerate(self.graph.nodes):
+            self.graph.nodes[node]["position"] = {"x": i + 0.4, "y": -i}
+        write_html_report(self.graph, self.report_path)
+        nodes = self.load_data()["nodes"]
+        for node, x, y in zip(nodes["id"], nodes["x"], nodes["y"]):
+            position = self.graph.nodes[node]["position"]
+            check.equal((x, y), (round(position["x"]), round(position["y"])))
+
+    @pytest.mark.parametrize(
+        "argv, output, level, layout",
+        [
+            (
+                ["-o", "main.html", "--level", "file", "--layout", "report"],
+                "main.html",
+                "file",
+                True,
+            ),
+            (["report", "-o", "sub.html", "-l", "class"], "sub.html", "class", False),
+            (["report"], None, "function", False),
+        ],
+    )
+    def test_cli_options(self, monkeypatch, argv, output, level, layout):
+        monkeypatch.setattr(sys, "argv", ["byparse"] + argv)
+        args = cli_parser()
+        check.equal((args.output, args.level, args.layout), (output, level, layout))
@@ -0,0 +1,155 @@
+import random
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import networkx as nx
+import pytest
+import pytest_check as check
+
+from byparse.abc import EdgeType
+from byparse.project_crawl import ProjectCrawler
+from byparse.analysis.adjacency import AdjacencyIndex
+from byparse.analysis.impact import ImpactIndex, is_test_node
+from byparse.analysis.query import DEPENDENCY_EDGES
+from byparse.analysis.scc import strongly_connected_components
+from byparse.stores.loading import NetworkxGraph
+
+TEST_MODULE = """from package.module2 import m2
+from package.submodules.submodule1 import sm1
+
+
+def test_m2():
+    m2()
+
+
+class TestSm1:
+    def test_sm1(self):
+        sm1()
+"""
+
+
+def check_components(graph: nx.MultiDiGraph, edge_types):
+    adjacency = AdjacencyIndex.from_graph(NetworkxGraph(graph))
+    components, n_components = strongly_connected_components(adjacency, edge_types)
+    typed_graph = nx.DiGraph()
+    typed_graph.add_nodes_from(graph.nodes)
+    typed_graph.add_edges_from(
+        (source, target)
+        for source, target, edge_type in graph.edges(data="type")
+        if edge_type in edge_types
+    )
+
+    expected = {frozenset(scc) for scc in nx.strongly_connected_components(typed_graph)}
+    found = {}
+    for position, component in enumerate(components):
+        found.setdefault(component, set()).add(adjacency.nodes[position])
+    check.equal(n_components, len(expected))
+    check.equal({frozenset(scc) for scc in found.values()}, expected)
+
+    positions = {node: i for i, node in enumerate(adjacency.nodes)}
+    for source, target in typed_graph.edges:
+        check.greater_equal(
+            components[positions[source]], components[positions[target]]
+        )
+
+
+class TestStronglyConnectedComponents:
+    def test_toy_project(self):
+        toy_project_path = Path(__file__).parent / "toy_project"
+        graph = ProjectCrawler(toy_project_path).build_project_graph()
+        check_components(graph, DEPENDENCY_EDGES)
+
+    def test_random_graph(self):
+        rng = random.Random(0)
+        graph = nx.MultiDiGraph()
+        graph.add_nodes_from(str(i) for i in range(200))
+        for _ in range(300):
+            graph.add_edge(
+                str(rng.randrange(200)), str(rng.randrange(200)), type="CALL"
+            )
+        check_components(graph, (EdgeType.CALL.name,))
+
+
+class TestImpactIndex:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path: Path):
+        project_path = tmp_path / "project"
+        shutil.copytree(Path(__file__).parent / "toy_project", project_path)
+        (project_path / "tests").mkdir()
+        (project_path / "tests" / "test_module.py").write_text(TEST_MODULE)
+        self.graph = ProjectCrawler(project_path).build_project_graph()
+        adjacency = AdjacencyIndex.from_graph(NetworkxGraph(self.graph))
+        self.impact_index = ImpactIndex.build(adjacency)
+        self.root = project_path
+        self.tmp_path = tmp_path
+
+    def expected_tests(self, changed_nodes):
+        uses = nx.DiGraph(
+            (source, target)
+            for source, target, edge_type in self.graph.edges(data="type")
+            if edge_type in DEPENDENCY_EDGES
+        )
+        uses.add_nodes_from(self.graph.nodes)
+        affected = set(changed_nodes)
+        for node in changed_nodes:
+            affected |= nx.descendants(uses, node)
+        return {node for node in affected if is_test_node(node)}
+
+    def test_tests(self):
+        check.equal(
+            set(self.impact_index.tests),
+            {"tests/test_module.py>test_m2", "tests/test_module.py>TestSm1>test_sm1"},
+        )
+
+    @pytest.mark.parametrize(
+        "changed",
+        [
+            "package/submodules/submodule1.py>sm1",
+            "package/submodules/submodule2.py",
+            "package/submodules",
+            "package",
+            "scripts",
+            "tests/test_module.py>TestSm1",
+        ],
+    )
+    def test_affected_tests(self, changed):
+        changed_nodes = [
+            node
+            for node in self.graph.nodes
+            if node == changed or node.startswith((changed + ">", changed + "/"))
+        ]
+        expected = self.expected_tests(changed_nodes)
+        check.equal(set(self.impact_index.affected_tests([changed])), expected)
+
+    def test_save_and_load(self):
+        self.impact_index.save(self.tmp_path / "impact.json.gz")
+        loaded = ImpactIndex.load(self.tmp_path / "impact.json.gz")
+        for changed in ("package", "package/module2.py>m2", "scripts"):
+            check.equal(
+                loaded.affected_tests([changed]),
+                self.impact_index.affected_tests([changed]),
+            )
+
+    def test_cli_changed_paths(self):
+        index = self.tmp_path / "impact.json.gz"
+        self.impact_index.save(index)
+
+        def impact(changed: str) -> subprocess.CompletedProcess:
+            return subprocess.run(
+                [sys.executable, "-m", "byparse", "--root", str(self.root)]
+                + ["impact", "--changed", changed, "--index", str(index)],
+                cwd=self.tmp_path,
+                capture_output=True,
+                text=True,
+            )
+
+        inside = impact(str(self.root / "package" / ".." / "package" / "module2.py"))
+        check.equal(inside.returncode, 0)
+        check.equal(inside.stdout.split(), ["tests/test_module.py>test_m2"])
+
+        outside = impact(str(self.tmp_path / "elsewhere.py"))
+        check.equal(outside.returncode, 1)
+        check.is_in("is not in the project root", outside.stderr)
+        check.is_not_in("Traceback", outside.stderr)
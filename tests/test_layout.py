@@ -0,0 +1,49 @@
+from itertools import combinations
+from math import dist
+from pathlib import Path
+
+import pytest
+import pytest_check as check
+
+from byparse.project_crawl import ProjectCrawler
+from byparse.visualisation.graph_vis import compute_parents
+from byparse.visualisation.cytoscape_fcose import (
+    networkx_to_cytoscape_fcose,
+    networkx_to_cytoscape_fcose_constraints,
+)
+
+pytest.importorskip("numpy")
+
+from byparse.visualisation.layout import compute_compound_layout  # noqa: E402
+
+
+class TestCompoundLayout:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        toy_project_path = Path(__file__).parent / "toy_project"
+        self.graph = ProjectCrawler(toy_project_path).build_project_graph()
+        self.hierarchy = compute_parents(self.graph)
+        self.positions = compute_compound_layout(self.graph, node_size=40, padding=20)
+
+    def test_all_nodes_placed(self):
+        check.equal(set(self.positions), set(self.graph.nodes))
+
+    def test_siblings_do_not_overlap(self):
+        for node in self.graph.nodes:
+            for child, other in combinations(self.hierarchy.children_of(node), 2):
+                check.greater_equal(
+                    dist(self.positions[child], self.positions[other]), 40
+                )
+
+    def test_exported_positions(self):
+        cyto_graph = networkx_to_cytoscape_fcose(self.graph)
+        for node in cyto_graph["nodes"]:
+            check.is_in("position", node)
+            check.is_not_in("position", node["data"])
+
+        constraints = networkx_to_cytoscape_fcose_constraints(self.graph)
+        fixed_nodes = [fixed["nodeId"] for fixed in constraints["fixedNodeConstraint"]]
+        leaves = [
+            node for node in self.graph.nodes if not self.hierarchy.children_of(node)
+        ]
+        check.equal(sorted(fixed_nodes), sorted(leaves))
@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import pytest
+import pytest_check as check
+
+from byparse.abc import EdgeType, NodeType
+from byparse.project_crawl import ProjectCrawler
+from byparse.graphs.level_of_detail import aggregate_graph
+
+HIERARCHY_EDGES = (EdgeType.CONTEXT.name, EdgeType.PATH.name)
+
+
+class TestAggregateGraph:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        toy_project_path = Path(__file__).parent / "toy_project"
+        self.graph = ProjectCrawler(toy_project_path).build_project_graph()
+
+    @pytest.mark.parametrize(
+        "level, kept_types",
+        [
+            ("folder", {NodeType.FOLDER.name}),
+            ("file", {NodeType.FOLDER.name, NodeType.FILE.name}),
+            ("class", {NodeType.FOLDER.name, NodeType.FILE.name, NodeType.CLASS.name}),
+        ],
+    )
+    def test_kept_nodes(self, level, kept_types):
+        aggregated = aggregate_graph(self.graph, level)
+        check.equal(
+            set(dict(aggregated.nodes(data="type")).values()) - kept_types, set()
+        )
+        check.equal(
+            sum(dict(aggregated.nodes(data="count")).values()) + len(aggregated),
+            len(self.graph),
+        )
+
+    def test_file_level_edges(self):
+        aggregated = aggregate_graph(self.graph, "file")
+
+        def file_of(node: str) -> str:
+            return node.split(">")[0]
+
+        expected_weights = {}
+        for source, target, edge_type in self.graph.edges(data="type"):
+            if edge_type in HIERARCHY_EDGES:
+                continue
+            key = (file_of(source), file_of(target), edge_type)
+            if key[0] != key[1]:
+                expected_weights[key] = expected_weights.get(key, 0) + 1
+
+        weights = {
+            (source, target, attrs["type"]): attrs["weight"]
+            for source, target, attrs in aggregated.edges(data=True)
+            if attrs["type"] not in HIERARCHY_EDGES
+        }
+        check.equal(weights, expected_weights)
+
+    def test_aggregate_aggregated(self):
+        twice = aggregate_graph(aggregate_graph(self.graph, "file"), "folder")
+        once = aggregate_graph(self.graph, "folder")
+
+        def elements(graph):
+            nodes = sorted(
+                (node, sorted(d.items())) for node, d in graph.nodes(data=True)
+            )
+            edges = sorted(
+                (u, v, sorted(d.items())) for u, v, d in graph.edges(data=True)
+            )
+            return nodes, edges
+
+        check.equal(elements(twice), elements(once))
+
+    def test_function_level(self):
+        check.is_(aggregate_graph(self.graph, "function"), self.graph)
+
+    def test_unknown_level(self):
+        with pytest.raises(ValueError):
+            aggregate_graph(self.graph, "module")
@@ -0,0 +1,75 @@
+import io
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+import pytest_check as check
+
+from byparse.__main__ import cli_parser
+from byparse.logging_utils import CustomHandler, set_trace_sampling
+from byparse.project_crawl import ProjectCrawler
+
+
+class TestTraceSampling:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path: Path, caplog: pytest.LogCaptureFixture):
+        (tmp_path / "core.py").write_text(
+            "import json\n\n\ndef run():\n    return json.dumps(unknown())\n"
+        )
+        self.root = tmp_path
+        self.caplog = caplog
+        caplog.set_level(logging.INFO, logger="byparse")
+        yield
+        set_trace_sampling(0)
+
+    def traces(self):
+        ProjectCrawler(str(self.root)).build_project_graph()
+        return [
+            record.getMessage()
+            for record in self.caplog.records
+            if record.getMessage().startswith("Resolution trace")
+        ]
+
+    def test_off(self):
+        check.equal(self.traces(), [])
+
+    def test_all(self):
+        set_trace_sampling(1)
+        traces = self.traces()
+        check.equal(len(traces), 2)
+        check.is_true(any("unknown in" in trace for trace in traces))
+
+    def test_same_sample(self):
+        set_trace_sampling(0.5, seed=3)
+        first = self.traces()
+        self.caplog.clear()
+        set_trace_sampling(0.5, seed=3)
+        check.equal(self.traces(), first)
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            set_trace_sampling(2)
+
+    @pytest.mark.parametrize("rate", ["2", "-0.1", "often"])
+    def test_invalid_cli_rate(self, rate: str, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(sys, "argv", ["byparse", "--trace-resolution", rate])
+        with pytest.raises(SystemExit):
+            cli_parser()
+
+
+class TestCustomHandler:
+    def test_short_pathname(self):
+        handler = CustomHandler(io.StringIO(), package_name="byparse")
+        for _ in range(2):
+            record = logging.LogRecord(
+                "byparse.test",
+                logging.INFO,
+                "/site-packages/byparse/graphs/call_graph.py",
+                1,
+                "message",
+                None,
+                None,
+            )
+            handler.emit(record)
+            check.equal(record.pathname, "byparse/graphs/call_graph.py")
@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import networkx as nx
+import pytest
+import pytest_check as check
+
+np = pytest.importorskip("numpy")
+
+from byparse.abc import EdgeType
+from byparse.project_crawl import ProjectCrawler
+from byparse.analysis.metrics import UsesMatrix, compute_metrics, write_metrics_csv
+from byparse.stores.loading import NetworkxGraph
+from byparse.stores.snapshot import GraphSnapshot, write_snapshot
+
+
+class TestMetrics:
+    @pytest.fixture(autouse=True, params=["networkx", "snapshot"])
+    def setup(self, request, tmp_path: Path):
+        toy_project_path = Path(__file__).parent / "toy_project"
+        self.graph = ProjectCrawler(toy_project_path).build_project_graph()
+        self.tmp_path = tmp_path
+        if request.param == "snapshot":
+            write_snapshot(self.graph, tmp_path / "graph.bpg")
+            with GraphSnapshot(tmp_path / "graph.bpg") as snapshot:
+                self.uses = UsesMatrix.from_graph(snapshot)
+        else:
+            self.uses = UsesMatrix.from_graph(NetworkxGraph(self.graph))
+        self.positions = {node: i for i, node in enumerate(self.uses.nodes)}
+
+        self.uses_graph = nx.DiGraph()
+        self.uses_graph.add_nodes_from(self.graph)
+        self.uses_graph.add_edges_from(
+            (user, used)
+            for used, user, edge_type in self.graph.edges(data="type")
+            if edge_type == EdgeType.CALL.name
+        )
+
+    def by_node(self, values):
+        return {node: values[self.positions[node]] for node in self.uses_graph}
+
+    def test_degrees(self):
+        check.equal(self.by_node(self.uses.fan_in()), dict(self.uses_graph.in_degree))
+        check.equal(self.by_node(self.uses.fan_out()), dict(self.uses_graph.out_degree))
+
+    def test_pagerank(self):
+        google = nx.google_matrix(self.uses_graph, alpha=0.85)
+        eigenvalues, eigenvectors = np.linalg.eig(google.T)
+        expected = np.real(eigenvectors[:, np.argmax(np.real(eigenvalues))])
+        expected = dict(zip(self.uses_graph, expected / expected.sum()))
+        ranks = self.by_node(self.uses.pagerank(tol=1e-12))
+        for node, rank in ranks.items():
+            check.almost_equal(rank, expected[node], abs=1e-9)
+
+    def test_betweenness(self):
+        expected = nx.betweenness_centrality(self.uses_graph)
+        betweenness = self.by_node(self.uses.betweenness())
+        for node, value in betweenness.items():
+            check.almost_equal(value, expected[node], abs=1e-12)
+        sampled = self.uses.betweenness(samples=10, seed=1)
+        check.equal(sampled.shape, (len(self.uses.nodes),))
+        check.is_true(np.all(sampled >= 0))
+
+    def test_csv(self):
+        path = self.tmp_path / "metrics.csv"
+        metrics = compute_metrics(self.uses)
+        write_metrics_csv(self.uses.nodes, metrics, path)
+        lines = path.read_text(encoding="utf-8").splitlines()
+        check.equal(lines[0], "node,fan_in,fan_out,pagerank,betweenness")
+        check.equal(len(lines), len(self.uses.nodes) + 1)
+        top = lines[1].split(",")[0]
+        check.equal(metrics["pagerank"][self.positions[top]], metrics["pagerank"].max())
@@ -0,0 +1,110 @@
+import json
+import pstats
+from pathlib import Path
+
+import pytest
+import pytest_check as check
+
+from byparse.path_resolvers.imports import resolve_installed_path
+from byparse.profiling import (
+    active_report,
+    count,
+    format_summary,
+    phase,
+    profile_run,
+)
+from byparse.project_crawl import ProjectCrawler
+
+
+class TestProfiling:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path: Path):
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "core.py").write_text(
+            "import json\n\n\ndef run():\n    return helper()\n\n\n"
+            "def helper():\n    return json.dumps(unknown())\n"
+        )
+        (tmp_path / "pkg" / "api.py").write_text(
+            "from pkg.core import run\n\n\ndef serve():\n    return run()\n"
+        )
+        self.root = tmp_path
+
+    def test_inactive(self):
+        check.is_none(active_report())
+        with phase("parse"):
+            count("modules")
+        check.is_none(active_report())
+
+    def test_report(self):
+        report_path = self.root / "report.json"
+        with profile_run(report_path, argv=["--root", "pkg"]):
+            ProjectCrawler(str(self.root / "pkg")).build_project_graph()
+        check.is_none(active_report())
+
+        report = json.loads(report_path.read_text())
+        check.equal(report["argv"], ["--root", "pkg"])
+        check.equal(report["counts"]["modules"], 2)
+        phases = report["phases"]
+        for name in ("discovery", "parse", "crawl", "graph", "imports", "resolve"):
+            check.is_in(name, phases)
+        check.equal(phases["parse"]["calls"], 2)
+        check.equal(phases["graph"]["calls"], 1)
+        graph = phases["graph"]
+        children_wall = phases["imports"]["wall_seconds"]
+        children_wall += phases["resolve"]["wall_seconds"]
+        check.almost_equal(
+            graph["self_wall_seconds"], graph["wall_seconds"] - children_wall
+        )
+        check.greater_equal(report["wall_seconds"], graph["wall_seconds"])
+
+    def test_nested_phases(self):
+        with profile_run(self.root / "report.json") as report:
+            with phase("outer"):
+                with phase("inner"):
+                    count("items", 3)
+                with phase("inner"):
+                    count("items")
+        outer, inner = report.phases["outer"], report.phases["inner"]
+        check.equal(inner.calls, 2)
+        check.almost_equal(outer.child_wall, inner.wall)
+        check.equal(report.counts, {"items": 4})
+
+    def test_profile(self):
+        profile_path = self.root / "run.prof"
+        with profile_run(profile_path=profile_path):
+            ProjectCrawler(str(self.root / "pkg")).build_project_graph()
+
+        stats = pstats.Stats(str(profile_path))
+        functions = {name for _, _, name in stats.stats}
+        check.is_in("build_project_graph", functions)
+
+        lines = profile_path.with_suffix(".collapsed").read_text().splitlines()
+        check.greater(len(lines), 0)
+        for line in lines:
+            stack, microseconds = line.rsplit(" ", 1)
+            check.greater(int(microseconds), 0)
+        check.is_true(any("build_project_graph" in line for line in lines))
+
+    def test_resolution_counters(self):
+        resolve_installed_path.cache_clear()
+        with profile_run(summary=True) as report:
+            ProjectCrawler(str(self.root)).build_project_graph()
+            ProjectCrawler(str(self.root)).build_project_graph()
+
+        counts = report.counts
+        check.equal(counts["resolve.attempts"], 2 * 4)
+        check.equal(counts["resolve.same_module"], 2 * 1)
+        check.equal(counts["resolve.project"], 2 * 1)
+        check.equal(counts["resolve.library"], 2 * 1)
+        check.equal(counts["resolve.not_found"], 2 * 1)
+        check.greater(counts["imports.fs_probes"], 0)
+        check.equal(
+            report.caches["resolve_installed_path"],
+            {"hits": 1, "misses": 1, "size": 1},
+        )
+        check.equal(
+            report.to_dict()["caches"]["resolve_installed_path"]["hit_ratio"], 0.5
+        )
+        summary = format_summary(report)
+        check.is_in("resolve.not_found", summary)
+        check.is_in("50.0%", summary)
@@ -0,0 +1,113 @@
+import shutil
+from pathlib import Path
+from typing import Set, Tuple
+
+import pytest
+import pytest_check as check
+import networkx as nx
+
+from byparse.abc import EdgeType
+from byparse.project_crawl import ProjectCrawler
+
+
+def nodes_to_set(graph: nx.MultiDiGraph) -> Set[Tuple[str, str, str]]:
+    return set((node, d["label"], d["type"]) for node, d in graph.nodes(data=True))
+
+
+def edges_to_set(graph: nx.MultiDiGraph) -> Set[Tuple[str, str, str]]:
+    return set((u, v, d["type"]) for u, v, d in graph.edges(data=True))
+
+
+class TestProjectGraph:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        toy_project_path = Path(__file__).parent / "toy_project"
+        self.project = ProjectCrawler(toy_project_path)
+
+    def test_same_as_two_passes(self):
+        two_passes_graph = self.project.build_contexts_graph()
+        two_passes_graph = self.project.build_call_graph(two_passes_graph)
+
+        graph = self.project.build_project_graph()
+
+        check.equal(nodes_to_set(graph), nodes_to_set(two_passes_graph))
+        check.equal(edges_to_set(graph), edges_to_set(two_passes_graph))
+
+    def test_folders_linked_once(self):
+        graph = self.project.build_project_graph()
+        path_edges = [
+            (u, v)
+            for u, v, edge_type in graph.edges(data="type")
+            if edge_type == EdgeType.PATH.name
+        ]
+        check.equal(len(path_edges), len(set(path_edges)))
+
+
+def sorted_nodes(graph: nx.MultiDiGraph):
+    return sorted((node, sorted(d.items())) for node, d in graph.nodes(data=True))
+
+
+class TestUpdateProjectGraph:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path: Path):
+        self.root = tmp_path / "toy_project"
+        shutil.copytree(Path(__file__).parent / "toy_project", self.root)
+        self.project = ProjectCrawler(self.root)
+        self.graph = self.project.build_project_graph()
+
+    def check_same_as_rebuild(self, *changed: str):
+        self.project.update_project_graph(self.graph, [Path(path) for path in changed])
+        rebuilt = ProjectCrawler(self.root).build_project_graph()
+        check.equal(sorted_nodes(self.graph), sorted_nodes(rebuilt))
+        check.equal(
+            sorted(self.graph.edges(data="type")), sorted(rebuilt.edges(data="type"))
+        )
+
+    def test_modified_module(self):
+        module_path = self.root / "package" / "module1.py"
+        source = module_path.read_text().replace("m11", "m12")
+        module_path.write_text(source + "\n\ndef m13():\n    return m12(None)\n")
+        self.check_same_as_rebuild("package/module1.py")
+
+    def test_deleted_module(self):
+        (self.root / "package" / "extra").mkdir()
+        module_path = self.root / "package" / "extra" / "unused.py"
+        module_path.write_text(
+            "from package.module2 import m2\n\n\ndef unused():\n    return m2()\n"
+        )
+        self.check_same_as_rebuild("package/extra/unused.py")
+        module_path.unlink()
+        self.check_same_as_rebuild("package/extra/unused.py")
+        check.is_false("package/extra" in self.graph)
+
+    def test_added_module(self):
+        (self.root / "package" / "extra").mkdir()
+        (self.root / "package" / "extra" / "module3.py").write_text(
+            "from package.module2 import m2\n\n\ndef m3():\n    return m2()\n"
+        )
+        self.check_same_as_rebuild("package/extra/module3.py")
+
+    def test_name_added_to_imported_module(self):
+        (self.root / "pkg").mkdir()
+        (self.root / "pkg" / "a.py").write_text("def f():\n    pass\n")
+        (self.root / "pkg" / "b.py").write_text(
+            "from pkg.a import g\n\n\ndef user():\n    return g()\n"
+        )
+        self.check_same_as_rebuild("pkg/a.py", "pkg/b.py")
+        (self.root / "pkg" / "a.py").write_text(
+            "def f():\n    pass\n\n\ndef g():\n    pass\n"
+        )
+        self.check_same_as_rebuild("pkg/a.py")
+        check.is_true(self.graph.has_edge("pkg/a.py>g", "pkg/b.py>user"))
+
+    def test_name_added_behind_reexport(self):
+        (self.root / "pkg").mkdir()
+        (self.root / "pkg" / "__init__.py").write_text("from pkg.a import g\n")
+        (self.root / "pkg" / "a.py").write_text("def f():\n    pass\n")
+        (self.root / "user.py").write_text(
+            "from pkg import g\n\n\ndef user():\n    return g()\n"
+        )
+        self.check_same_as_rebuild("pkg/__init__.py", "pkg/a.py", "user.py")
+        (self.root / "pkg" / "a.py").write_text("def g():\n    pass\n")
+        self.check_same_as_rebuild("pkg/a.py")
+        check.is_true(self.graph.has_edge("pkg/a.py>g", "user.py>user"))
@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import networkx as nx
+import pytest
+import pytest_check as check
+
+from byparse.abc import EdgeType
+from byparse.project_crawl import ProjectCrawler
+from byparse.analysis.adjacency import AdjacencyIndex
+from byparse.analysis.query import DEPENDENCY_EDGES, GraphQuery
+from byparse.stores.loading import NetworkxGraph
+from byparse.stores.snapshot import GraphSnapshot, write_snapshot
+
+
+class TestGraphQuery:
+    @pytest.fixture(autouse=True, params=["networkx", "snapshot"])
+    def setup(self, request, tmp_path: Path):
+        toy_project_path = Path(__file__).parent / "toy_project"
+        self.graph = ProjectCrawler(toy_project_path).build_project_graph()
+        if request.param == "snapshot":
+            write_snapshot(self.graph, tmp_path / "graph.bpg")
+            snapshot = GraphSnapshot(tmp_path / "graph.bpg")
+            self.query = GraphQuery(AdjacencyIndex.from_graph(snapshot))
+            yield
+            snapshot.close()
+        else:
+            graph = NetworkxGraph(self.graph)
+            self.query = GraphQuery(AdjacencyIndex.from_graph(graph))
+            yield
+
+    def call_edges(self):
+        return [
+            (source, target)
+            for source, target, edge_type in self.graph.edges(data="type")
+            if edge_type == EdgeType.CALL.name
+        ]
+
+    def test_nodes(self):
+        nodes = self.query.adjacency.nodes
+        check.equal(sorted(nodes), sorted(self.graph.nodes))
+        check.equal(nodes[-1], list(nodes)[len(nodes) - 1])
+        with pytest.raises(IndexError):
+            nodes[len(nodes)]
+
+    def test_callers_and_callees(self):
+        for source, target in self.call_edges():
+            check.is_in(target, self.query.callers(source))
+            check.is_in(source, self.query.callees(target))
+
+    def test_transitive(self):
+        calls = nx.DiGraph(self.call_edges())
+        for node in calls:
+            expected = nx.single_source_shortest_path_length(calls, node)
+            del expected[node]
+            check.equal(self.query.transitive_callers(node), expected)
+            check.equal(
+                self.query.transitive_callers(node, max_depth=1),
+                {caller: 1 for caller in calls.successors(node)},
+            )
+
+    def test_dependency_path(self):
+        uses = nx.DiGraph(
+            (target, source)
+            for source, target, edge_type in self.graph.edges(data="type")
+            if edge_type in DEPENDENCY_EDGES
+        )
+        lengths = dict(nx.all_pairs_shortest_path_length(uses))
+        for source, reachable in lengths.items():
+            for target, length in reachable.items():
+                if source == target:
+                    continue
+                path = self.query.dependency_path(source, target)
+                check.equal(len(path) - 1, length)
+                check.equal((path[0], path[-1]), (source, target))
+
+    def test_unknown_node(self):
+        with pytest.raises(ValueError):
+            self.query.callers("package/unknown.py>func")
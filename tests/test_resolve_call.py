@@ -1,8 +1,10 @@
 import ast
+from importlib.machinery import ModuleSpec
 from pathlib import Path
 
 import pytest
 import pytest_check as check
+from pytest_mock import MockerFixture
 
 from byparse.path_resolvers.names import (
     get_chain_known_level,
@@ -12,8 +14,10 @@ from byparse.path_resolvers.names import (
     resolve_lib_name,
     get_call_chain,
 )
-from byparse.project_crawl import AstContextCrawler
-from byparse.abc import NodeType
+from byparse.path_resolvers.imports import resolve_installed_path
+from byparse.profiling import recording
+from byparse.project_crawl import AstContextCrawler, ProjectCrawler
+from byparse.abc import EdgeType, NodeType
 
 
 class TestResolveCallPath:
@@ -175,3 +179,66 @@ class TestResolveLibCall:
 
         check.is_none(call_path)
         check.equal(node_type, NodeType.LIBRAIRY.name)
+
+
+class TestResolveProjectNames:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path: Path):
+        self.root = tmp_path / "lib" / "project"
+        self.root.mkdir(parents=True)
+
+    def call_edges(self) -> set:
+        graph = ProjectCrawler(str(self.root)).build_project_graph()
+        return {
+            (source, target)
+            for source, target, edge_type in graph.edges(data="type")
+            if edge_type == EdgeType.CALL.name
+        }
+
+    def test_imports_cycle(self):
+        (self.root / "a.py").write_text("from b import func\n")
+        (self.root / "b.py").write_text("from a import func\n")
+        (self.root / "main.py").write_text(
+            "from a import func\n\n\ndef main():\n    func()\n"
+        )
+        check.equal(self.call_edges(), set())
+
+    def test_project_in_lib_folder(self):
+        (self.root / "core.py").write_text("def func():\n    pass\n")
+        (self.root / "main.py").write_text(
+            "from core import func\n\n\ndef main():\n    func()\n"
+        )
+        check.equal(self.call_edges(), {("core.py>func", "main.py>main")})
+
+    def test_frozen_library_call(self):
+        (self.root / "main.py").write_text(
+            "import os\n\n\ndef main():\n    return os.path.join('a', 'b')\n"
+        )
+        resolve_installed_path.cache_clear()
+        with recording() as report:
+            check.equal(self.call_edges(), set())
+        check.equal(report.counts["resolve.library"], 1)
+        check.is_false("resolve.not_found" in report.counts)
+
+    def test_reexport_from_outside_project(self):
+        (self.root / "reexport.py").write_text("from json import dumps\n")
+        (self.root / "main.py").write_text(
+            "from reexport import dumps\n\n\ndef main():\n    return dumps(1)\n"
+        )
+        with recording() as report:
+            check.equal(self.call_edges(), set())
+        check.equal(report.counts["resolve.not_found"], 1)
+
+    def test_import_outside_project(self, mocker: MockerFixture):
+        resolve_installed_path.cache_clear()
+        mocker.patch(
+            "byparse.path_resolvers.imports.find_spec",
+            return_value=ModuleSpec("plugin", None, origin="/opt/plugins/plugin.py"),
+        )
+        (self.root / "main.py").write_text(
+            "from plugin import hook\n\n\ndef main():\n    return hook()\n"
+        )
+        with recording() as report:
+            check.equal(self.call_edges(), set())
+        resolve_installed_path.cache_clear()
+        check.equal(report.counts["resolve.not_found"], 1)
@@ -1,11 +1,18 @@
 import ast
+import os
+import posixpath
+from importlib.machinery import ModuleSpec
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 import pytest_check as check
 from pytest_mock import MockerFixture
 
-from byparse.path_resolvers.imports import resolve_import_ast_paths
+from byparse.path_resolvers.imports import (
+    resolve_import_ast_paths,
+    resolve_installed_path,
+)
 
 
 class TestResolveImportAstPaths:
@@ -15,6 +22,7 @@ class TestResolveImportAstPaths:
     @pytest.fixture(autouse=True)
     def setup(self):
         self.project_root = Path(__file__).parent / "toy_project"
+        resolve_installed_path.cache_clear()  # find_spec is mocked by some tests
 
     def test_single_package_import(self):
         pkg_alias = ast.alias(name="package")
@@ -103,3 +111,44 @@ class TestResolveImportAstPaths:
 
         alias_to_path = resolve_import_ast_paths(import_ast, str(self.project_root))
         check.equal(set(alias_to_path.values()), set(expected_aliases_paths.values()))
+
+    def test_librairy_parent_import_error(self, mocker: MockerFixture):
+        mocker.patch(
+            "byparse.path_resolvers.imports.find_spec",
+            side_effect=ImportError("win32 only"),
+        )
+        sm_alias = ast.alias(name="asyncio.windows_events")
+        import_ast = ast.Import(names=[sm_alias])
+
+        alias_to_path = resolve_import_ast_paths(import_ast, str(self.project_root))
+        check.equal(
+            alias_to_path,
+            {sm_alias: Path("Lib/site-packages/not-found/asyncio.windows_events")},
+        )
+
+    def test_librairy_unexpected_error(self, mocker: MockerFixture):
+        mocker.patch(
+            "byparse.path_resolvers.imports.find_spec",
+            side_effect=RuntimeError("bug"),
+        )
+        with pytest.raises(RuntimeError):
+            resolve_installed_path("matplotlib.pyplot")
+
+    def test_frozen_module(self, mocker: MockerFixture):
+        spec = ModuleSpec("os", None, origin="frozen")
+        spec.loader_state = SimpleNamespace(filename="/usr/lib/python3.11/os.py")
+        mocker.patch("byparse.path_resolvers.imports.find_spec", return_value=spec)
+        check.equal(resolve_installed_path("os"), Path("/usr/lib/python3.11/os.py"))
+
+    def test_frozen_module_without_source(self, mocker: MockerFixture):
+        spec = ModuleSpec("_frozen_importlib", None, origin="frozen")
+        mocker.patch("byparse.path_resolvers.imports.find_spec", return_value=spec)
+        check.equal(
+            resolve_installed_path("_frozen_importlib"),
+            Path("Lib/site-packages/built-in/_frozen_importlib"),
+        )
+
+    def test_standard_module_source(self):
+        # Frozen since Python 3.11, found by their source path like before
+        check.equal(resolve_installed_path("os"), Path(os.__file__))
+        check.equal(resolve_installed_path("posixpath"), Path(posixpath.__file__))
@@ -0,0 +1,187 @@
+import http.client
+import json
+import shutil
+import threading
+import time
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+import pytest_check as check
+
+from byparse.graphs.hierarchy import HIERARCHY_EDGES
+from byparse import server
+from byparse.server import GraphServer, ProjectCache
+
+
+class TestGraphServer:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path: Path):
+        self.root = tmp_path / "toy_project"
+        shutil.copytree(Path(__file__).parent / "toy_project", self.root)
+        self.projects = ProjectCache()
+        self.state = self.projects.get(self.root)
+        self.server = GraphServer(("127.0.0.1", 0), self.projects)
+        thread = threading.Thread(
+            target=self.server.serve_forever, args=(0.05,), daemon=True
+        )
+        thread.start()
+        yield
+        self.server.shutdown()
+        self.server.server_close()
+
+    def get(self, route: str) -> dict:
+        port = self.server.server_address[1]
+        with urlopen(f"http://127.0.0.1:{port}{route}") as response:
+            return json.loads(response.read())
+
+    def test_query(self):
+        answer = self.get("/query?node=package/module1.py>m11&relation=callers")
+        check.equal(answer, {"nodes": {"package/module1.py>m1": 1}})
+
+    def test_impact(self):
+        answer = self.get("/impact?changed=package/module1.py")
+        check.equal(answer, {"tests": []})
+
+    def test_export(self):
+        answer = self.get("/export")
+        check.equal(len(answer["nodes"]), self.state.graph.number_of_nodes())
+        check.equal(
+            len(answer["edges"]),
+            sum(
+                edge_type not in HIERARCHY_EDGES
+                for _, _, edge_type in self.state.graph.edges(data="type")
+            ),
+        )
+
+    def test_errors(self):
+        for route, status in (
+            ("/query?node=package/unknown.py>f", 400),
+            ("/unknown", 404),
+        ):
+            with pytest.raises(HTTPError) as error:
+                self.get(route)
+            check.equal(error.value.code, status)
+
+    def test_root_outside_served_roots(self, tmp_path: Path):
+        other_root = tmp_path / "other"
+        other_root.mkdir()
+        projects = ProjectCache(roots=[self.root])
+        check.equal(projects.get(self.root / "package").root, self.root / "package")
+        with pytest.raises(ValueError):
+            projects.get(other_root)
+        with pytest.raises(ValueError):
+            projects.get(self.root / "..")
+
+    def test_host(self):
+        port = self.server.server_address[1]
+        for host, status in (("evil.example", 403), (f"localhost:{port}", 200)):
+            connection = http.client.HTTPConnection("127.0.0.1", port)
+            connection.request("GET", "/status", headers={"Host": host})
+            check.equal(connection.getresponse().status, status)
+            connection.close()
+
+    def test_internal_error(self, monkeypatch: pytest.MonkeyPatch):
+        def failing_route(projects, params):
+            raise PermissionError("denied")
+
+        monkeypatch.setitem(server.ROUTES, "/status", failing_route)
+        with pytest.raises(HTTPError) as error:
+            self.get("/status")
+        check.equal(error.value.code, 500)
+        check.equal(
+            json.loads(error.value.read()), {"error": "PermissionError: denied"}
+        )
+
+    def test_refresh(self):
+        new_module = self.root / "package" / "module3.py"
+        new_module.write_text(
+            "from package.module1 import m11\n\n\ndef m3():\n    return m11(None)\n"
+        )
+        answer = self.get("/refresh")
+        check.equal(answer["changed"], {str(self.state.root): ["package/module3.py"]})
+        check.equal(self.state.version, 1)
+        callers = self.get("/query?node=package/module1.py>m11&relation=callers")
+        check.is_in("package/module3.py>m3", callers["nodes"])
+        check.equal(self.get("/refresh")["changed"], {str(self.state.root): []})
+
+    def test_concurrent_refresh(self, monkeypatch: pytest.MonkeyPatch):
+        (self.root / "package" / "module3.py").write_text("def m3():\n    pass\n")
+        updates = []
+        update_project_graph = self.state.project.update_project_graph
+
+        def slow_update(graph, changed):
+            updates.append(changed)
+            time.sleep(0.1)
+            return update_project_graph(graph, changed)
+
+        monkeypatch.setattr(self.state.project, "update_project_graph", slow_update)
+        threads = [threading.Thread(target=self.state.refresh) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+        check.equal(len(updates), 1)
+        check.equal(self.state.version, 1)
+
+    def test_eviction(self, tmp_path: Path):
+        other_root = tmp_path / "other"
+        (other_root / "pkg").mkdir(parents=True)
+        (other_root / "pkg" / "mod.py").write_text("def f():\n    return 1\n")
+        self.projects.max_elements = self.state.n_elements
+        other = self.projects.get(other_root)
+        check.equal(list(self.projects.states.values()), [other])
+        status = self.get("/status")
+        check.equal(
+            [project["root"] for project in status["projects"]], [str(other.root)]
+        )
+
+
+class TestProjectCache:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        self.slow_root = tmp_path / "slow"
+        self.fast_root = tmp_path / "fast"
+        for root in (self.slow_root, self.fast_root):
+            root.mkdir()
+            (root / "mod.py").write_text("def f():\n    return 1\n")
+        self.crawl_started = threading.Event()
+        self.finish_crawl = threading.Event()
+        self.crawls = []
+
+        project_state = server.ProjectState
+
+        def slow_project_state(root: Path, exclude=None):
+            self.crawls.append(root)
+            if root == self.slow_root.resolve():
+                self.crawl_started.set()
+                self.finish_crawl.wait(10)
+            return project_state(root, exclude=exclude)
+
+        monkeypatch.setattr(server, "ProjectState", slow_project_state)
+        self.projects = ProjectCache()
+
+    def test_crawl_outside_lock(self):
+        results = []
+
+        def get_slow():
+            results.append(self.projects.get(self.slow_root))
+
+        threads = [threading.Thread(target=get_slow) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        check.is_true(self.crawl_started.wait(10))
+
+        # Other projects and the status are served during the crawl
+        fast = self.projects.get(self.fast_root)
+        status = server.status_route(self.projects, {})
+        check.equal(status["projects"], [fast.status()])
+
+        self.finish_crawl.set()
+        for thread in threads:
+            thread.join(10)
+        check.equal(len(results), 2)
+        check.is_(results[0], results[1])
+        check.equal(self.crawls.count(self.slow_root.resolve()), 1)
+        check.equal(list(self.projects.states), [fast.root, results[0].root])
@@ -0,0 +1,56 @@
+import json
+from pathlib import Path
+
+import pytest
+import pytest_check as check
+
+from byparse.abc import EdgeType, NodeType
+from byparse.project_crawl import ProjectCrawler
+from byparse.exporters.sharded import write_sharded_cytoscape
+
+HIERARCHY_EDGES = (EdgeType.CONTEXT.name, EdgeType.PATH.name)
+
+
+class TestShardedExport:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path: Path):
+        toy_project_path = Path(__file__).parent / "toy_project"
+        self.graph = ProjectCrawler(toy_project_path).build_project_graph()
+        self.output_dir = tmp_path / "sharded"
+        write_sharded_cytoscape(self.graph, self.output_dir)
+
+    def load(self, shard_path: str) -> dict:
+        with open(self.output_dir / shard_path, "r", encoding="utf-8") as file:
+            return json.load(file)
+
+    def test_overview(self):
+        overview = self.load("overview.json")
+        types = {node["data"]["type"] for node in overview["nodes"]}
+        check.is_true(types <= {NodeType.FOLDER.name, NodeType.FILE.name})
+        for node in overview["nodes"]:
+            if node["data"]["type"] == NodeType.FOLDER.name:
+                check.is_true((self.output_dir / node["data"]["shard"]).exists())
+                check.greater(node["data"]["count"], 0)
+
+    def test_shards_cover_graph(self):
+        node_ids, edges = [], set()
+        shard_paths = ["overview.json"]
+        while shard_paths:
+            shard_path = shard_paths.pop()
+            shard = self.load(shard_path)
+            cross = self.load(shard_path[: -len(".json")] + ".cross.json")
+            for node in shard["nodes"]:
+                node_ids.append(node["data"]["id"])
+                if "shard" in node["data"]:
+                    shard_paths.append(node["data"]["shard"])
+            for edge in shard["edges"] + cross["edges"]:
+                edges.add((edge["data"]["source"], edge["data"]["target"]))
+
+        check.equal(len(node_ids), len(set(node_ids)))
+        check.equal(set(node_ids), set(self.graph.nodes))
+        expected_edges = {
+            (source, target)
+            for source, target, edge_type in self.graph.edges(data="type")
+            if edge_type not in HIERARCHY_EDGES
+        }
+        check.equal(edges, expected_edges)
@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import pytest
+import pytest_check as check
+
+from byparse.project_crawl import ProjectCrawler
+from byparse.stores.snapshot import GraphSnapshot, SnapshotError, write_snapshot
+
+
+class TestGraphSnapshot:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path: Path):
+        toy_project_path = Path(__file__).parent / "toy_project"
+        self.graph = ProjectCrawler(toy_project_path).build_project_graph()
+        self.path = tmp_path / "graph.bpg"
+        write_snapshot(self.graph, self.path)
+
+    def test_round_trip(self):
+        with GraphSnapshot(self.path) as snapshot:
+            check.equal(snapshot.n_nodes, self.graph.number_of_nodes())
+            check.equal(snapshot.n_edges, self.graph.number_of_edges())
+            graph = snapshot.to_networkx()
+
+        check.equal(
+            sorted(graph.nodes(data=True)),
+            sorted(
+                (
+                    node,
+                    {
+                        key: attrs[key]
+                        for key in ("label", "type", "lines")
+                        if key in attrs
+                    },
+                )
+                for node, attrs in self.graph.nodes(data=True)
+            ),
+        )
+        check.equal(
+            sorted(graph.edges(data="type")), sorted(self.graph.edges(data="type"))
+        )
+
+    def test_find_node(self):
+        with GraphSnapshot(self.path) as snapshot:
+            for node in self.graph.nodes:
+                index = snapshot.find_node(node)
+                check.is_not_none(index)
+                if index is not None:
+                    check.equal(snapshot.node_id(index), node)
+            check.is_none(snapshot.find_node("not/a/node.py"))
+
+    def test_adjacency(self):
+        with GraphSnapshot(self.path) as snapshot:
+            for node in self.graph.nodes:
+                index = snapshot.find_node(node)
+                successors = [
+                    snapshot.node_id(snapshot.edge_targets[edge])
+                    for edge in snapshot.out_edges(index)
+                ]
+                predecessors = [
+                    snapshot.node_id(snapshot.edge_sources[edge])
+                    for edge in snapshot.in_edges(index)
+                ]
+                check.equal(
+                    sorted(successors),
+                    sorted(v for _, v in self.graph.out_edges(node)),
+                )
+                check.equal(
+                    sorted(predecessors),
+                    sorted(u for u, _ in self.graph.in_edges(node)),
+                )
+
+    def test_not_a_snapshot(self, tmp_path: Path):
+        path = tmp_path / "graph.json"
+        path.write_text('{"nodes": [], "edges": []}' + " " * 200)
+        with pytest.raises(SnapshotError):
+            GraphSnapshot(path)
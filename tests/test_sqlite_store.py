@@ -0,0 +1,71 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+import pytest_check as check
+
+from byparse.project_crawl import ProjectCrawler
+from byparse.stores.loading import open_graph
+from byparse.stores.sqlite_store import SqliteGraphStore
+
+
+class TestSqliteGraphStore:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path: Path):
+        toy_project_path = Path(__file__).parent / "toy_project"
+        self.project = ProjectCrawler(toy_project_path)
+        self.graph = self.project.build_project_graph()
+        self.path = tmp_path / "graph.db"
+        with SqliteGraphStore(self.path, batch_size=7) as store:
+            self.project.build_project_graph(store)
+
+    def test_same_as_networkx(self):
+        with SqliteGraphStore(self.path) as store:
+            graph = store.to_networkx()
+
+        check.equal(sorted(graph.nodes(data=True)), sorted(self.graph.nodes(data=True)))
+        check.equal(
+            sorted(graph.edges(data="type")), sorted(self.graph.edges(data="type"))
+        )
+
+    def test_callers_and_callees(self):
+        with SqliteGraphStore(self.path) as store:
+            for node in self.graph.nodes:
+                check.equal(
+                    sorted(store.callers(node)),
+                    sorted(
+                        v
+                        for _, v, edge_type in self.graph.out_edges(node, data="type")
+                        if edge_type == "CALL"
+                    ),
+                )
+                check.equal(
+                    sorted(store.callees(node)),
+                    sorted(
+                        u
+                        for u, _, edge_type in self.graph.in_edges(node, data="type")
+                        if edge_type == "CALL"
+                    ),
+                )
+
+    def test_rewrite(self):
+        with SqliteGraphStore(self.path, mode="w") as store:
+            self.project.build_project_graph(store)
+        with SqliteGraphStore(self.path, mode="r") as store:
+            check.equal(store.number_of_nodes(), self.graph.number_of_nodes())
+            check.equal(store.number_of_edges(), self.graph.number_of_edges())
+
+    def test_read_only(self):
+        content = self.path.read_bytes()
+        files = sorted(self.path.parent.iterdir())
+        with open_graph(self.path) as store:
+            check.is_true(store.read_only)
+            check.equal(store.number_of_edges(), self.graph.number_of_edges())
+            check.equal(len(store.callers("package/module1.py>m11")), 1)
+        check.equal(self.path.read_bytes(), content)
+        check.equal(sorted(self.path.parent.iterdir()), files)
+
+        missing = self.path.parent / "missing.db"
+        with pytest.raises(sqlite3.OperationalError):
+            SqliteGraphStore(missing, mode="r")
+        check.is_false(missing.exists())
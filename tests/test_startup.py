@@ -0,0 +1,66 @@
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+import pytest_check as check
+
+from byparse.analysis.adjacency import AdjacencyIndex
+from byparse.analysis.impact import ImpactIndex
+from byparse.project_crawl import ProjectCrawler
+from byparse.stores.loading import NetworkxGraph
+
+HEAVY_MODULES = ("networkx", "numpy", "colorama")
+
+# Generous bound, as to catch heavy imports coming back, not machine noise
+MAX_CLI_IMPORT_US = 150_000
+
+
+def import_times(args: List[str], cwd: Path) -> Dict[str, int]:
+    """Cumulative import time in microseconds of each module imported by python."""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+class TestStartup:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path: Path):
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "core.py").write_text("def run():\n    return 0\n")
+        (tmp_path / "tests").mkdir()
+        (tmp_path / "tests" / "test_core.py").write_text(
+            "from pkg.core import run\n\n\ndef test_run():\n    result = run()\n"
+        )
+        graph = ProjectCrawler(str(tmp_path)).build_project_graph()
+        adjacency = AdjacencyIndex.from_graph(NetworkxGraph(graph))
+        self.index_path = tmp_path / "impact.json.gz"
+        ImpactIndex.build(adjacency).save(self.index_path)
+        self.root = tmp_path
+
+    def test_help(self):
+        times = import_times(["-m", "byparse", "--help"], self.root)
+        for module in HEAVY_MODULES:
+            check.is_not_in(module, times)
+
+    def test_cli_import_time(self):
+        times = import_times(["-c", "import byparse.__main__"], self.root)
+        check.less(times["byparse.__main__"], MAX_CLI_IMPORT_US)
+
+    def test_impact_from_index(self):
+        args = ["impact", "-c", "pkg/core.py", "--index", str(self.index_path)]
+        times = import_times(["-m", "byparse", *args], self.root)
+        for module in HEAVY_MODULES:
+            check.is_not_in(module, times)